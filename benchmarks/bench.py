@@ -83,13 +83,36 @@ def _peak_rss_mb() -> Optional[float]:
         return None
 
 
-def _time_build(path: str, repeats: int) -> Dict[str, Any]:
+def _build_peak_rss_mb(path: str, low_memory: bool = False) -> Optional[float]:
+    """Peak RSS of one fresh ``build_graph(path)``, measured in a child process.
+
+    ``ru_maxrss`` only ever grows, so each mode gets its own interpreter.
+    """
+    code = (
+        "import sys\n"
+        "from benchmarks.bench import _peak_rss_mb\n"
+        "from pyvisualizer.api import build_graph\n"
+        "build_graph(sys.argv[1], low_memory=sys.argv[2] == '1')\n"
+        "print(_peak_rss_mb())\n"
+    )
+    try:
+        out = subprocess.check_output(
+            [sys.executable, "-c", code, path, "1" if low_memory else "0"],
+            cwd=REPO_ROOT,
+            stderr=subprocess.DEVNULL,
+        )
+        return float(out.decode().split()[-1])
+    except Exception:
+        return None
+
+
+def _time_build(path: str, repeats: int, jobs: Optional[int] = None) -> Dict[str, Any]:
     """Build the graph ``repeats`` times; report the fastest wall time."""
     best = float("inf")
     result = None
     for _ in range(repeats):
         t = time.perf_counter()
-        result = build_graph(path)
+        result = build_graph(path, jobs=jobs)
         dt = time.perf_counter() - t
         best = min(best, dt)
     assert result is not None
@@ -111,24 +134,45 @@ def _confidence_stats(result: Any) -> Dict[str, Any]:
 
 
 def _determinism_proof(path: str) -> Dict[str, Any]:
-    """Build + serialize twice; prove the canonical JSON is byte-identical."""
-    hashes: List[str] = []
-    for _ in range(2):
-        r = build_graph(path)
+    """Build + serialize twice; prove the canonical JSON is byte-identical.
+
+    Also builds through a cold and then a warm analysis cache: a cached run
+    must produce exactly the bytes an uncached one does.
+    """
+
+    def _hash(**kwargs: Any) -> str:
+        r = build_graph(path, **kwargs)
         payload = graph_to_json(
             r.graph,
             project_name=r.project_name,
             project_root=r.project_root,
             tool_version="",  # pin so the hash reflects the graph, not the version
         )
-        hashes.append(hashlib.sha256(payload.encode("utf-8")).hexdigest())
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    hashes = [_hash(), _hash()]
+    with tempfile.TemporaryDirectory() as td:
+        cache_hashes = [_hash(cache_dir=td), _hash(cache_dir=td)]
     return {
         "sha256_run1": hashes[0],
         "sha256_run2": hashes[1],
-        "byte_identical": hashes[0] == hashes[1],
+        "cached_identical": cache_hashes == hashes,
+        "byte_identical": hashes[0] == hashes[1] and cache_hashes == hashes,
     }
 
 
+def _warm_cache_seconds(path: str, repeats: int) -> float:
+    """Fastest ``build_graph`` time when every file is already cached."""
+    with tempfile.TemporaryDirectory() as td:
+        build_graph(path, cache_dir=td)
+        best = float("inf")
+        for _ in range(repeats):
+            t = time.perf_counter()
+            build_graph(path, cache_dir=td)
+            best = min(best, time.perf_counter() - t)
+    return best
+
+
 def _html_network_proof(path: str) -> Dict[str, Any]:
     """Generate the HTML viewer and count real external resource references."""
     r = build_graph(path)
@@ -174,8 +218,8 @@ def _context_stats(result: Any) -> Dict[str, Any]:
     }
 
 
-def _bench_target(name: str, path: str, repeats: int) -> Dict[str, Any]:
-    timing = _time_build(path, repeats)
+def _bench_target(name: str, path: str, repeats: int, jobs: Optional[int] = None) -> Dict[str, Any]:
+    timing = _time_build(path, repeats, jobs)
     result = timing["result"]
     seconds = timing["seconds"]
     nodes = result.num_nodes
@@ -190,6 +234,9 @@ def _bench_target(name: str, path: str, repeats: int) -> Dict[str, Any]:
         "seconds": round(seconds, 4),
         "ms": round(seconds * 1000, 1),
         "functions_per_sec": round(nodes / seconds) if seconds > 0 else None,
+        "warm_cache_ms": round(_warm_cache_seconds(path, repeats) * 1000, 1),
+        "peak_rss_mb": _build_peak_rss_mb(path),
+        "low_memory_peak_rss_mb": _build_peak_rss_mb(path, low_memory=True),
         "lines_per_sec": round(kloc / seconds) if seconds > 0 and kloc else None,
         "confidence": _confidence_stats(result),
         "context_pack": _context_stats(result),
@@ -218,18 +265,25 @@ def _count_lines(path: str) -> int:
     return total
 
 
-def run(target_lines: int = 100_000, repeats: int = 3, seed: int = 1998) -> Dict[str, Any]:
+def run(
+    target_lines: int = 100_000,
+    repeats: int = 3,
+    seed: int = 1998,
+    jobs: Optional[int] = None,
+) -> Dict[str, Any]:
     targets: List[Dict[str, Any]] = []
 
     # 1) The tool on its own source — the "dogfood" number.
     self_src = os.path.join(REPO_ROOT, "pyvisualizer")
-    targets.append(_bench_target("py-code-visualizer (self)", self_src, repeats))
+    targets.append(_bench_target("py-code-visualizer (self)", self_src, repeats, jobs))
 
     # 2) The deterministic synthetic monolith.
     with tempfile.TemporaryDirectory() as td:
         proj = os.path.join(td, "genproj_bench")
         gen = generate(proj, seed=seed, target_lines=target_lines)
-        targets.append(_bench_target(f"synthetic monolith (~{target_lines:,} LOC)", proj, repeats))
+        targets.append(
+            _bench_target(f"synthetic monolith (~{target_lines:,} LOC)", proj, repeats, jobs)
+        )
         synthetic_meta = {"seed": gen["seed"], "modules": gen["modules"], "layers": gen["layers"]}
 
     report = {
@@ -239,6 +293,8 @@ def run(target_lines: int = 100_000, repeats: int = 3, seed: int = 1998) -> Dict
         "tool_version": _tool_version(),
         "measured_at_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         "hardware": _hardware(),
+        "jobs": jobs,
+        "cpu_count": os.cpu_count(),
         "peak_rss_mb": _peak_rss_mb(),
         "synthetic": synthetic_meta,
         "targets": targets,
@@ -251,6 +307,12 @@ def main() -> int:
     ap.add_argument("--target-lines", type=int, default=100_000)
     ap.add_argument("--repeats", type=int, default=3)
     ap.add_argument("--seed", type=int, default=1998)
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Time builds with N worker processes (0 = one per CPU; default: in-process).",
+    )
     ap.add_argument(
         "--out",
         default=os.path.join(REPO_ROOT, "docs", "benchmarks.json"),
@@ -259,7 +321,9 @@ def main() -> int:
     ap.add_argument("--print", action="store_true", help="Also print the report to stdout.")
     args = ap.parse_args()
 
-    report = run(target_lines=args.target_lines, repeats=args.repeats, seed=args.seed)
+    report = run(
+        target_lines=args.target_lines, repeats=args.repeats, seed=args.seed, jobs=args.jobs
+    )
 
     # Fail loudly if any core invariant did not hold — a benchmark that quietly
     # records a determinism break would be worse than useless.
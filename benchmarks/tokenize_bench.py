@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for the lexical tokenizer behind ``search_code`` and ``--task``.
+
+Tokenizing every function's source is most of what ``build_bm25`` costs. This
+times :func:`pyvisualizer.retrieval.tokenize` against the straightforward
+per-identifier regex implementation it replaced, over the same deterministic
+synthetic project :mod:`benchmarks.bench` uses, and checks that both produce
+exactly the same tokens -- a faster tokenizer that changed the index would be
+a regression, not an optimization. It also times one full ``build_bm25``.
+
+Run with ``python -m benchmarks.tokenize_bench`` (``--project`` to point it at
+a real tree instead).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.genproject import generate
+from pyvisualizer.api import build_graph
+from pyvisualizer.retrieval import _token_words, build_bm25, tokenize
+
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _reference_tokenize(text: str) -> List[str]:
+    """The original tokenizer: split and lowercase every identifier afresh."""
+    out: List[str] = []
+    for tok in _TOKEN_RE.findall(text):
+        out.append(tok.lower())
+        words: List[str] = []
+        for part in re.split(r"_+", tok):
+            words.extend(re.findall(r"[A-Z]+(?![a-z])|[A-Z][a-z]*|[a-z]+|\d+", part) or [part])
+        words = [w.lower() for w in words if w]
+        if len(words) > 1:
+            out.extend(words)
+    return out
+
+
+def _read_sources(path: str) -> List[str]:
+    texts: List[str] = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for fn in sorted(files):
+            if fn.endswith(".py"):
+                with open(os.path.join(root, fn), "r", encoding="utf-8", errors="ignore") as f:
+                    texts.append(f.read())
+    return texts
+
+
+def _best_of(repeats: int, fn: Callable[[], Any], before: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        before()
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def _measure(path: str, repeats: int) -> Dict[str, Any]:
+    texts = _read_sources(path)
+    reference = [_reference_tokenize(t) for t in texts]
+    if [tokenize(t) for t in texts] != reference:
+        raise SystemExit("tokenize() no longer matches the reference tokenizer")
+
+    def nothing() -> None:
+        pass
+
+    ref_s = _best_of(repeats, lambda: [_reference_tokenize(t) for t in texts], nothing)
+    cold_s = _best_of(repeats, lambda: [tokenize(t) for t in texts], _token_words.cache_clear)
+    warm_s = _best_of(repeats, lambda: [tokenize(t) for t in texts], nothing)
+
+    G = build_graph(path).graph
+    bm25_s = _best_of(repeats, lambda: build_bm25(G), _token_words.cache_clear)
+    cache = _token_words.cache_info()
+    return {
+        "files": len(texts),
+        "tokens": sum(map(len, reference)),
+        "reference_ms": round(ref_s * 1000, 1),
+        "tokenize_cold_ms": round(cold_s * 1000, 1),
+        "tokenize_warm_ms": round(warm_s * 1000, 1),
+        "speedup_cold": round(ref_s / cold_s, 2) if cold_s else None,
+        "build_bm25_ms": round(bm25_s * 1000, 1),
+        "functions": G.number_of_nodes(),
+        "split_cache": {"size": cache.currsize, "max": cache.maxsize},
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Time the BM25 tokenizer.")
+    ap.add_argument("--project", help="Tokenize this tree instead of a synthetic one")
+    ap.add_argument("--target-lines", type=int, default=50_000)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=1998)
+    args = ap.parse_args()
+
+    if args.project:
+        report = _measure(os.path.abspath(args.project), args.repeats)
+    else:
+        with tempfile.TemporaryDirectory() as td:
+            proj = os.path.join(td, "genproj_tokenize")
+            generate(proj, seed=args.seed, target_lines=args.target_lines)
+            report = _measure(proj, args.repeats)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
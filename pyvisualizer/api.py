@@ -11,16 +11,23 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 import networkx as nx
 
+from pyvisualizer.core.analyzer import ModuleAnalyzer
+from pyvisualizer.core.csr import CSRGraph, GraphLike
 from pyvisualizer.core.graph import build_call_graph
+from pyvisualizer.core.graph_analysis import GraphAnalysis, graph_analysis, invalidate
+from pyvisualizer.core.incremental import GraphState
 from pyvisualizer.core.model import CONFIDENCE_AMBIGUOUS
 from pyvisualizer.core.resolver import filter_by_depth, filter_by_modules
+from pyvisualizer.utils.analysis_cache import AnalysisCache
 from pyvisualizer.utils.file_discovery import (
-    analyze_project,
+    analyze_project_modules,
     find_project_python_files,
+    get_module_name,
+    load_module,
 )
 
 logger = logging.getLogger("pyvisualizer.api")
@@ -30,10 +37,18 @@ logger = logging.getLogger("pyvisualizer.api")
 class GraphResult:
     """The analyzed project graph plus the metadata downstream tools need."""
 
-    graph: nx.DiGraph
+    graph: GraphLike  # nx.DiGraph, or CSRGraph from build_graph(frozen=True)
     project_name: str
     project_root: str
     files: List[str] = field(default_factory=list)
+    #: Set by ``build_graph(incremental=True)``: what a later build needs to
+    #: update this result in place instead of starting over.
+    state: Optional["BuildState"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def analysis(self) -> GraphAnalysis:
+        """Memoized SCCs, cycles, degrees and entry points of :attr:`graph`."""
+        return graph_analysis(self.graph)
 
     @property
     def num_nodes(self) -> int:
@@ -44,6 +59,16 @@ class GraphResult:
         return int(self.graph.number_of_edges())
 
 
+@dataclass
+class BuildState:
+    """The unfiltered graph and per-module analysis behind an incremental result."""
+
+    graph: GraphState
+    project_root: str
+    module_names: Dict[str, str]  # every discovered file -> its module name
+    cache_dir: Optional[str] = None
+
+
 def build_graph(
     path: str,
     *,
@@ -54,6 +79,13 @@ def build_graph(
     max_nodes: Optional[int] = None,
     strict: bool = False,
     project_name: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
+    low_memory: bool = False,
+    incremental: bool = False,
+    previous: Optional[GraphResult] = None,
+    changed: Optional[Iterable[str]] = None,
+    frozen: bool = False,
 ) -> GraphResult:
     """Analyze ``path`` and return a filtered, deterministic call graph.
 
@@ -65,6 +97,29 @@ def build_graph(
         max_nodes: Trim to at most this many nodes (least-connected first).
         strict: Drop ``ambiguous`` edges entirely (no guesses at all).
         project_name: Override the inferred project name.
+        cache_dir: Reuse per-file analysis stored in this directory (created
+            on first use); only files whose content changed are re-parsed.
+        jobs: Analyze files in this many worker processes (``0``: one per
+            CPU). Output is identical to the default in-process analysis.
+        low_memory: Release each file's syntax tree as soon as it has been
+            analyzed rather than keeping every AST alive until the graph is
+            built. Slightly slower (no parse cache); identical output.
+        incremental: Keep the per-module analysis on the result (as
+            ``result.state``) so a later call can pass it as ``previous``.
+        previous / changed: Update ``previous`` -- an incremental result for
+            the same project -- instead of analyzing everything again.
+            ``changed`` lists the files modified, added or deleted since it
+            was built (files added or deleted are also found by rescanning);
+            only those are re-analyzed, only the call sites they could affect
+            are re-resolved, and the graph is patched in place, so
+            ``previous`` must not be used afterwards. The result is
+            identical to a fresh build; when an update cannot guarantee that
+            (e.g. a package ``__init__.py`` came or went), it falls back to
+            one. Implies ``incremental``.
+        frozen: Return the graph as a read-only :class:`CSRGraph` -- a
+            fraction of the memory, same nodes, edges and order -- instead of
+            a :class:`networkx.DiGraph`; ``result.graph.to_networkx()`` gives
+            the networkx view back when something needs it.
     """
     project_path = os.path.abspath(path)
     if not os.path.exists(project_path):
@@ -77,30 +132,106 @@ def build_graph(
 
     project_root = project_path if os.path.isdir(project_path) else os.path.dirname(project_path)
 
-    analyzers, calls = analyze_project(py_files, project_root)
-    G = build_call_graph(analyzers, calls)
-    logger.info(
-        "Built graph with %d functions and %d calls", G.number_of_nodes(), G.number_of_edges()
+    filtered = modules or exclude or (entry and depth) or strict or max_nodes is not None
+    state: Optional[BuildState] = None
+    if previous is not None and previous.state is not None and changed is not None:
+        state = _update_state(previous.state, project_root, py_files, changed, cache_dir)
+        if state is None:
+            logger.info("Incremental update not possible; rebuilding")
+    if state is None:
+        cache = AnalysisCache(cache_dir) if cache_dir else None
+        analysis = analyze_project_modules(
+            py_files, project_root, cache=cache, jobs=jobs, low_memory=low_memory
+        )
+        retain = incremental or previous is not None
+        G = build_call_graph(
+            analysis.analyzers,
+            [call for calls in analysis.calls.values() for call in calls],
+            frozen=frozen and not retain and not filtered,
+        )
+        if retain:
+            for analyzer in analysis.analyzers.values():
+                analyzer.release_ast()
+            graph_state = GraphState(
+                G, analysis.analyzers, analysis.symbols, analysis.calls, analysis.symbol_index
+            )
+            state = BuildState(graph_state, project_root, analysis.module_names, cache_dir)
+        logger.info(
+            "Built graph with %d functions and %d calls", G.number_of_nodes(), G.number_of_edges()
+        )
+    else:
+        G = state.graph.graph
+
+    if filtered:
+        # Filtered builds are never frozen before the filters have run.
+        assert isinstance(G, nx.DiGraph)
+        if state is not None:
+            G = G.copy()  # the filters below must not touch the retained graph
+        if modules:
+            G = filter_by_modules(G, modules)
+        if exclude:
+            to_remove = [
+                n
+                for n in G.nodes()
+                if any(G.nodes[n].get("module", "").startswith(x) for x in exclude)
+            ]
+            G.remove_nodes_from(to_remove)
+        if entry and depth:
+            G = filter_by_depth(G, entry, depth)
+        if strict:
+            amb = [
+                (s, t)
+                for s, t, d in G.edges(data=True)
+                if d.get("confidence") == CONFIDENCE_AMBIGUOUS
+            ]
+            G.remove_edges_from(amb)
+        if max_nodes is not None and G.number_of_nodes() > max_nodes:
+            # Deterministic trim: drop least-connected nodes, ties broken by name.
+            ranked = sorted(G.degree(), key=lambda kv: (kv[1], kv[0]))
+            drop = [n for n, _ in ranked[: G.number_of_nodes() - max_nodes]]
+            G.remove_nodes_from(drop)
+        invalidate(G)  # the filters above edit the graph in place
+    if frozen and not isinstance(G, CSRGraph):
+        G = CSRGraph.from_networkx(G)
+
+    return GraphResult(
+        graph=G, project_name=name, project_root=project_root, files=py_files, state=state
     )
 
-    if modules:
-        G = filter_by_modules(G, modules)
-    if exclude:
-        to_remove = [
-            n for n in G.nodes() if any(G.nodes[n].get("module", "").startswith(x) for x in exclude)
-        ]
-        G.remove_nodes_from(to_remove)
-    if entry and depth:
-        G = filter_by_depth(G, entry, depth)
-    if strict:
-        amb = [
-            (s, t) for s, t, d in G.edges(data=True) if d.get("confidence") == CONFIDENCE_AMBIGUOUS
-        ]
-        G.remove_edges_from(amb)
-    if max_nodes is not None and G.number_of_nodes() > max_nodes:
-        # Deterministic trim: drop least-connected nodes, ties broken by name.
-        ranked = sorted(G.degree(), key=lambda kv: (kv[1], kv[0]))
-        drop = [n for n, _ in ranked[: G.number_of_nodes() - max_nodes]]
-        G.remove_nodes_from(drop)
-
-    return GraphResult(graph=G, project_name=name, project_root=project_root, files=py_files)
+
+def _update_state(
+    state: BuildState,
+    project_root: str,
+    py_files: List[str],
+    changed: Iterable[str],
+    cache_dir: Optional[str],
+) -> Optional[BuildState]:
+    """Patch ``state`` for the files that changed; ``None`` if a rebuild is needed."""
+    if state.project_root != project_root:
+        return None
+    current = set(py_files)
+    added = current.difference(state.module_names)
+    deleted = set(state.module_names).difference(current)
+    if any(os.path.basename(p) == "__init__.py" for p in added | deleted):
+        return None  # package boundaries moved: module names may all change
+
+    module_names = {p: m for p, m in state.module_names.items() if p in current}
+    for file_path in sorted(added):
+        module_names[file_path] = get_module_name(file_path, project_root)
+    if len(set(module_names.values())) != len(module_names):
+        return None  # two files claim one module name
+
+    updates: Dict[str, Optional[ModuleAnalyzer]] = {}
+    for file_path in deleted:
+        updates[state.module_names[file_path]] = None
+    cache = AnalysisCache(cache_dir) if cache_dir else None
+    stale = added | (current & {os.path.abspath(p) for p in changed})
+    for file_path in sorted(stale):
+        module_name = module_names[file_path]
+        updates[module_name] = load_module(
+            file_path, module_name, project_root, cache, low_memory=True
+        )
+
+    if not state.graph.update(updates):
+        return None
+    return BuildState(state.graph, project_root, module_names, cache_dir)
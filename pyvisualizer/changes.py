@@ -22,6 +22,7 @@ from typing import Dict, List, Optional, Tuple
 
 import networkx as nx
 
+from pyvisualizer.core.graph_analysis import graph_analysis
 from pyvisualizer.overlays import _git, _toplevel
 
 logger = logging.getLogger("pyvisualizer.changes")
@@ -128,21 +129,21 @@ def map_lines_to_functions(
         return []
     top = _toplevel(project_root) or os.path.abspath(project_root)
     hits: List[str] = []
-    for node in G.nodes():
-        data = G.nodes[node]
-        path = data.get("path", "")
+    # One path resolution per file rather than per function.
+    for path, nodes in graph_analysis(G).node_index.by_path.items():
         if not path:
             continue
-        rel = _rel_to_toplevel(path, top)
-        ranges = changed.get(rel)
+        ranges = changed.get(_rel_to_toplevel(path, top))
         if not ranges:
             continue
-        start = int(data.get("lineno", 0) or 0)
-        end = int(data.get("end_lineno", start) or start)
-        if end < start:
-            end = start
-        if any(not (end < rs or start > re_) for rs, re_ in ranges):
-            hits.append(node)
+        for node in nodes:
+            data = G.nodes[node]
+            start = int(data.get("lineno", 0) or 0)
+            end = int(data.get("end_lineno", start) or start)
+            if end < start:
+                end = start
+            if any(not (end < rs or start > re_) for rs, re_ in ranges):
+                hits.append(node)
     return sorted(hits)
 
 
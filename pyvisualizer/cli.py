@@ -80,6 +80,22 @@ def _build_parser() -> argparse.ArgumentParser:
             "--strict", action="store_true", help="Drop ambiguous edges (no guesses at all)"
         )
         p.add_argument("--project-name", "-p", help="Project name for titles")
+        p.add_argument(
+            "--cache-dir",
+            help="Reuse per-file analysis (and context's search index) from this directory "
+            "(e.g. .pyvisualizer-cache)",
+        )
+        p.add_argument(
+            "--jobs",
+            "-j",
+            type=int,
+            help="Analyze files in N worker processes (0 = one per CPU)",
+        )
+        p.add_argument(
+            "--low-memory",
+            action="store_true",
+            help="Release each file's syntax tree once analyzed (lower peak memory)",
+        )
         p.add_argument("--verbose", "-v", action="store_true")
 
     # visualize -----------------------------------------------------------
@@ -231,6 +247,13 @@ def _build_parser() -> argparse.ArgumentParser:
     pctx.add_argument(
         "--budget-tokens", type=int, default=4000, help="Approx token budget for the pack"
     )
+    pctx.add_argument(
+        "--ppr-epsilon",
+        dest="ppr_epsilon",
+        type=float,
+        help="Rank by local push PageRank to this residual (e.g. 1e-5) instead of the "
+        "exact whole-graph iteration; faster on very large projects",
+    )
     pctx.add_argument("--output", "-o", help="Markdown output file (default: stdout)")
     pctx.add_argument("--json", dest="json_out", help="Also write the machine-readable pack JSON")
     _common(pctx)
@@ -296,6 +319,9 @@ def _build(args: argparse.Namespace, *, full: bool = False) -> "GraphResult":
         max_nodes=max_nodes,
         strict=getattr(args, "strict", False),
         project_name=getattr(args, "project_name", None),
+        cache_dir=getattr(args, "cache_dir", None),
+        jobs=getattr(args, "jobs", None),
+        low_memory=getattr(args, "low_memory", False),
     )
 
 
@@ -573,12 +599,16 @@ def cmd_diff(args: argparse.Namespace) -> int:
 
 
 def _diff_text(result: "DiffResult") -> str:
+    capped = " (capped)" if result.cycles_truncated else ""
+    rank_b = result.base_stats.get("cycle_rank", 0)
+    rank_h = result.head_stats.get("cycle_rank", 0)
     lines = [
         f"Added functions:   {len(result.added_functions)}",
         f"Removed functions: {len(result.removed_functions)}",
         f"Added calls:       {len(result.added_edges)}",
         f"Removed calls:     {len(result.removed_edges)}",
-        f"New cycles:        {len(result.new_cycles)}",
+        f"New cycles:        {len(result.new_cycles)}{capped}",
+        f"Cycle rank:        {rank_b} -> {rank_h}",
     ]
     for c in result.new_cycles:
         lines.append("  cycle: " + " -> ".join(n.split(".")[-1] for n in c))
@@ -715,6 +745,8 @@ def cmd_context(args: argparse.Namespace) -> int:
         task=getattr(args, "task", None),
         strategy=getattr(args, "strategy", None),
         include_bodies=not getattr(args, "no_bodies", False),
+        ppr_epsilon=getattr(args, "ppr_epsilon", None),
+        cache_dir=getattr(args, "cache_dir", None),
     )
     markdown = render_pack_markdown(pack)
     if args.output:
@@ -21,7 +21,7 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import networkx as nx
 
@@ -32,8 +32,9 @@ from pyvisualizer.changes import (
     repo_web_url,
     web_link,
 )
+from pyvisualizer.core import pagerank
+from pyvisualizer.core.graph_analysis import graph_analysis
 from pyvisualizer.gates import find_cycles
-from pyvisualizer.impact import resolve_target
 from pyvisualizer.overlays import _toplevel
 from pyvisualizer.retrieval import (
     BM25Index,
@@ -93,27 +94,27 @@ def _resolve_focus(
             G, changed_lines_from_git(project_root, from_git or None), project_root
         )
         nodes.update(changed)
+    index = graph_analysis(G).node_index
     for token in focus or []:
-        node = resolve_target(G, token)
+        node = index.resolve(token)
         if node is not None:
             nodes.add(node)
             continue
         # Treat as a file path fragment: match nodes whose file ends with it.
-        frag = token.replace(os.sep, "/")
-        for n in G.nodes():
-            path = G.nodes[n].get("path", "").replace(os.sep, "/")
-            if path.endswith(frag):
-                nodes.add(n)
+        nodes |= index.path_matches(token)
     return sorted(nodes)
 
 
-def _node_line(G: nx.DiGraph, node: str, top: str, repo_url: str) -> str:
+def _node_line(
+    G: nx.DiGraph, node: str, top: str, repo_url: str, rel: Optional[str] = None
+) -> str:
     data = G.nodes[node]
     args = data.get("args", []) or []
     sig = f"{node}({', '.join(args)})"
     path = data.get("path", "")
     lineno = int(data.get("lineno", 0) or 0)
-    rel = _rel(path, top)
+    if rel is None:
+        rel = _rel(path, top)
     prov = f"{rel}:{lineno}" if rel else str(lineno)
     kind = data.get("kind", "")
     suffix = f" _{kind}_" if kind else ""
@@ -136,6 +137,75 @@ def _est_tokens(text: str) -> int:
     return max(1, len(text) // _CHARS_PER_TOKEN)
 
 
+class _SignatureLines:
+    """Each node's rendered pack line and its token cost, computed once per pack.
+
+    Rendering resolves the node's file against the repository top-level
+    (two ``realpath`` calls); the fill costs every candidate, the body budget
+    and a possible refill cost many of them again, and the pack renders the
+    selection at the end. Paths are resolved once per file, lines once per
+    node.
+    """
+
+    def __init__(self, G: nx.DiGraph, top: str, repo_url: str) -> None:
+        self.G = G
+        self.top = top
+        self.repo_url = repo_url
+        self._rels: Dict[str, str] = {}
+        self._lines: Dict[str, str] = {}
+        self._costs: Dict[str, int] = {}
+
+    def rel(self, path: str) -> str:
+        rel = self._rels.get(path)
+        if rel is None:
+            rel = self._rels[path] = _rel(path, self.top)
+        return rel
+
+    def line(self, node: str) -> str:
+        line = self._lines.get(node)
+        if line is None:
+            rel = self.rel(self.G.nodes[node].get("path", ""))
+            line = self._lines[node] = _node_line(self.G, node, self.top, self.repo_url, rel)
+        return line
+
+    def cost(self, node: str) -> int:
+        cost = self._costs.get(node)
+        if cost is None:
+            cost = self._costs[node] = _est_tokens(self.line(node))
+        return cost
+
+
+class _Fill:
+    """A greedy selection and its running token cost.
+
+    Each new call edge to an already-selected node adds ~_TOKENS_PER_EDGE to
+    the pack's Verified calls section, so a candidate's cost depends on the
+    selection so far. Rather than intersecting every candidate's neighbours
+    with the selection, each pick bumps a counter on its own neighbours:
+    costing a candidate is then O(1), and the work is proportional to the
+    degree of what is picked, not of what is examined.
+    """
+
+    def __init__(self, G: nx.DiGraph, lines: _SignatureLines) -> None:
+        self.G = G
+        self.lines = lines
+        self.selected: List[str] = []
+        self.chosen: set = set()
+        self.tokens = 0
+        self._linked: Dict[str, int] = {}
+
+    def cost(self, node: str) -> int:
+        return self.lines.cost(node) + _TOKENS_PER_EDGE * self._linked.get(node, 0)
+
+    def add(self, node: str, cost: int) -> None:
+        self.selected.append(node)
+        self.chosen.add(node)
+        self.tokens += cost
+        linked = self._linked
+        for m in set(self.G.pred[node]) | set(self.G.succ[node]):
+            linked[m] = linked.get(m, 0) + 1
+
+
 def personalized_pagerank(
     G: nx.DiGraph,
     focus: List[str],
@@ -144,6 +214,7 @@ def personalized_pagerank(
     max_iter: int = 100,
     tol: float = 1.0e-10,
     bidirectional: bool = True,
+    epsilon: Optional[float] = None,
 ) -> Dict[str, float]:
     """Personalized PageRank, computed here rather than via ``nx.pagerank``.
 
@@ -155,53 +226,35 @@ def personalized_pagerank(
     whatever sorted first. Worse, the output then depended on whether NumPy happened
     to be installed, breaking the determinism invariant.
 
-    This is a plain power iteration over the same random-surfer model, using only
-    the stdlib: deterministic, dependency-free, and identical on every machine.
-    Dangling nodes (no out-edges) redistribute their mass to the focus set, which is
-    what "personalized" means — the surfer always teleports back to the task.
+    This is a plain power iteration over the same random-surfer model (see
+    :mod:`pyvisualizer.core.pagerank`): deterministic, dependency-free, and
+    identical on every machine. NumPy, when installed, only makes it faster --
+    both backends produce the same floats. Dangling nodes (no out-edges)
+    redistribute their mass to the focus set, which is what "personalized"
+    means — the surfer always teleports back to the task.
 
     ``bidirectional`` walks call edges both ways. Relevance in a codebase is not
     one-directional: the callers of the function you are changing (its blast radius)
     matter as much as what it calls. A purely directed walk reaches only descendants,
     scoring every caller zero.
+
+    With ``epsilon``, scores are approximated by local forward push
+    (:func:`pyvisualizer.core.pagerank.push_pagerank`) to that residual
+    threshold: only the focus neighbourhood is visited, so the cost stays
+    flat as the project grows, and only nodes with a positive score are
+    returned.
     """
-    nodes = sorted(G.nodes())
-    if not nodes:
-        return {}
-    teleport = [n for n in focus if n in G]
-    if not teleport:
-        return {n: 0.0 for n in nodes}
-
-    weight = 1.0 / len(teleport)
-    personalization = {n: 0.0 for n in nodes}
-    for n in teleport:
-        personalization[n] = weight
-
-    if bidirectional:
-        succ = {n: sorted(set(G.successors(n)) | set(G.predecessors(n))) for n in nodes}
-    else:
-        succ = {n: sorted(G.successors(n)) for n in nodes}
-    dangling = [n for n in nodes if not succ[n]]
-    rank = dict(personalization)
-
-    for _ in range(max_iter):
-        nxt = {n: 0.0 for n in nodes}
-        # Mass stranded on dangling nodes teleports back to the focus set.
-        leaked = alpha * sum(rank[n] for n in dangling)
-        for n in nodes:
-            out = succ[n]
-            if not out:
-                continue
-            share = alpha * rank[n] / len(out)
-            for m in out:
-                nxt[m] += share
-        for n in nodes:
-            nxt[n] += (1.0 - alpha + leaked) * personalization[n]
-        delta = sum(abs(nxt[n] - rank[n]) for n in nodes)
-        rank = nxt
-        if delta < tol:
-            break
-    return rank
+    if epsilon is not None:
+        return pagerank.push_pagerank(
+            G, focus, alpha=alpha, epsilon=epsilon, bidirectional=bidirectional
+        )
+    return pagerank.personalized_pagerank(
+        graph_analysis(G).pagerank_graph(bidirectional),
+        focus,
+        alpha=alpha,
+        max_iter=max_iter,
+        tol=tol,
+    )
 
 
 def _rank_candidates(
@@ -231,8 +284,8 @@ def _rank_candidates(
 
     rest = [
         n
-        for n in G.nodes()
-        if n not in focus_set and n not in neighbours and pr.get(n, 0.0) > 0.0
+        for n, score in pr.items()
+        if score > 0.0 and n not in focus_set and n not in neighbours
     ]
 
     ordered: List[Tuple[str, bool]] = []
@@ -247,8 +300,7 @@ def _select_nodes(
     G: nx.DiGraph,
     focus: List[str],
     budget_tokens: int,
-    top: str,
-    repo_url: str,
+    lines: _SignatureLines,
     exempt: Optional[List[str]] = None,
     pr: Optional[Dict[str, float]] = None,
 ) -> List[str]:
@@ -271,35 +323,24 @@ def _select_nodes(
         pr = personalized_pagerank(G, focus_list) if focus_list else {}
     exempt_list = focus_list if exempt is None else sorted(set(exempt))
 
-    selected: List[str] = []
-    selected_set: set = set()
-    tokens = 0
+    fill = _Fill(G, lines)
     for n, is_exempt in _rank_candidates(G, focus_list, exempt_list, pr):
-        sig_c = _est_tokens(_node_line(G, n, top, repo_url))
-        # Each new edge to an already-selected node adds ~_TOKENS_PER_EDGE to the
-        # pack's Verified calls section — count it now so the budget is honest.
-        edge_c = _TOKENS_PER_EDGE * len(
-            (set(G.predecessors(n)) | set(G.successors(n))) & selected_set
-        )
-        c = sig_c + edge_c
-        if not is_exempt and tokens + c > budget_tokens:
+        c = fill.cost(n)
+        if not is_exempt and fill.tokens + c > budget_tokens:
             # Skip this one and keep going: a single unusually long signature
             # must not halt the fill while cheaper, equally relevant functions
             # are still waiting. (Stopping here left 77% of packs under 75%
             # of their budget.)
             continue
-        selected.append(n)
-        selected_set.add(n)
-        tokens += c
-    return selected
+        fill.add(n, c)
+    return fill.selected
 
 
 def _select_text(
     G: nx.DiGraph,
     ranked: List[Tuple[str, float]],
     budget_tokens: int,
-    top: str,
-    repo_url: str,
+    lines: _SignatureLines,
     exempt: List[str],
 ) -> List[str]:
     """Greedy fill straight down the lexical ranking — no graph expansion.
@@ -308,31 +349,17 @@ def _select_text(
     everything else is budget-checked with the same skip-and-continue rule.
     Returns the selection in ranking order.
     """
-    selected: List[str] = []
-    chosen: set = set()
-    tokens = 0
+    fill = _Fill(G, lines)
     for n in sorted(set(e for e in exempt if e in G)):
-        sig_c = _est_tokens(_node_line(G, n, top, repo_url))
-        edge_c = _TOKENS_PER_EDGE * len(
-            (set(G.predecessors(n)) | set(G.successors(n))) & chosen
-        )
-        selected.append(n)
-        chosen.add(n)
-        tokens += sig_c + edge_c
+        fill.add(n, fill.cost(n))
     for node, _score in ranked:
-        if node in chosen:
+        if node in fill.chosen:
             continue
-        sig_c = _est_tokens(_node_line(G, node, top, repo_url))
-        edge_c = _TOKENS_PER_EDGE * len(
-            (set(G.predecessors(node)) | set(G.successors(node))) & chosen
-        )
-        c = sig_c + edge_c
-        if tokens + c > budget_tokens:
+        c = fill.cost(node)
+        if fill.tokens + c > budget_tokens:
             continue
-        chosen.add(node)
-        selected.append(node)
-        tokens += c
-    return selected
+        fill.add(node, c)
+    return fill.selected
 
 
 def _upgrade_bodies(
@@ -392,6 +419,9 @@ def build_context_pack(
     task: Optional[str] = None,
     strategy: Optional[str] = None,
     include_bodies: bool = True,
+    ppr_epsilon: Optional[float] = None,
+    ranker: Optional[Callable[[List[str]], Dict[str, float]]] = None,
+    cache_dir: Optional[str] = None,
 ) -> ContextPack:
     """Build the deterministic, budget-bounded context pack model.
 
@@ -403,11 +433,22 @@ def build_context_pack(
       task; with a task, seeds come from symbol names in the text alone).
     - ``text``   — lexical (BM25) ranking only, no graph expansion.
     - ``hybrid`` — lexical seeds, graph expansion (the default with a task).
+
+    ``ppr_epsilon`` ranks the graph expansion by local push PageRank to that
+    residual threshold instead of the exact iteration (see
+    :func:`personalized_pagerank`), for packs whose latency must not grow
+    with the project. ``ranker`` replaces that ranking altogether: it maps the
+    teleport set to scores, e.g. through a long-lived session's cache (see
+    :class:`pyvisualizer.core.pagerank.PageRankCache`).
+
+    ``cache_dir`` keeps the task's search index on disk between runs (see
+    :func:`pyvisualizer.retrieval.build_bm25`).
     """
     G = result.graph
     root = result.project_root
     top = _toplevel(root) or os.path.abspath(root)
     repo_url = repo_web_url(root)
+    lines = _SignatureLines(G, top, repo_url)
 
     if strategy is None:
         strategy = "hybrid" if task else "graph"
@@ -429,7 +470,7 @@ def build_context_pack(
             for node in derive_seeds(task, G):
                 seeds_info.append({"node": node, "score": 0.0, "source": "symbol"})
         else:
-            bm25 = build_bm25(G)
+            bm25 = build_bm25(G, cache_dir=cache_dir)
             for node, score, source in rank_seeds(task, G, bm25, k=_SEED_COUNT):
                 seeds_info.append({"node": node, "score": score, "source": source})
 
@@ -439,7 +480,7 @@ def build_context_pack(
     if strategy == "text":
         assert bm25 is not None
         ranked_text = bm25.rank(tokenize(task or ""))
-        selection = _select_text(G, ranked_text, budget_tokens, top, repo_url, exempt)
+        selection = _select_text(G, ranked_text, budget_tokens, lines, exempt)
         focus_out = sorted(set(exempt) | {s["node"] for s in seeds_info})
     else:
         teleport = sorted(set(focus_nodes) | {s["node"] for s in seeds_info})
@@ -447,11 +488,9 @@ def build_context_pack(
             # No focus and no usable seeds → center on entry points (the app's
             # front doors). For a task this is a fallback and is labeled as one;
             # without a task it is the normal project-overview pack.
-            from pyvisualizer.metrics import _is_entry_point
-
-            teleport = sorted(
-                n for n in G.nodes() if _is_entry_point(n, G.nodes[n]) and G.out_degree(n) > 0
-            )
+            analysis = graph_analysis(G)
+            out_degree = analysis.out_degree
+            teleport = sorted(n for n in analysis.entry_points if out_degree[n] > 0)
             # Still nothing (e.g. tiny lib) → every node is fair game.
             if not teleport:
                 teleport = sorted(G.nodes())
@@ -459,8 +498,13 @@ def build_context_pack(
                 fallback_used = True
             else:
                 exempt = list(teleport)
-        pr = personalized_pagerank(G, teleport) if teleport else {}
-        selection = _select_nodes(G, teleport, budget_tokens, top, repo_url, exempt=exempt, pr=pr)
+        if not teleport:
+            pr = {}
+        elif ranker is not None:
+            pr = ranker(teleport)
+        else:
+            pr = personalized_pagerank(G, teleport, epsilon=ppr_epsilon)
+        selection = _select_nodes(G, teleport, budget_tokens, lines, exempt=exempt, pr=pr)
         focus_out = teleport
     # A non-empty graph must never produce an empty pack: under an impossible
     # budget with nothing exempt, keep the single best candidate anyway.
@@ -478,10 +522,10 @@ def build_context_pack(
         focus_out_set = set(focus_out)
         focus_sigs = [n for n in selection if n in focus_out_set]
         focus_sigs_set = set(focus_sigs)
-        spent = sum(_est_tokens(_node_line(G, n, top, repo_url)) for n in focus_sigs)
+        spent = sum(lines.cost(n) for n in focus_sigs)
         # Include edges between focus/seed nodes so the body budget isn't over-estimated.
         spent += _TOKENS_PER_EDGE * sum(
-            1 for s, t in G.edges() if s in focus_sigs_set and t in focus_sigs_set
+            1 for s in focus_sigs for t in G.successors(s) if t in focus_sigs_set
         )
         bodies = _upgrade_bodies(G, focus_sigs, budget_tokens, spent)
         if bodies:
@@ -491,12 +535,10 @@ def build_context_pack(
             # (signature + body) was already validated against the budget above.
             refill_exempt = sorted(set(exempt) | set(bodies))
             if strategy == "text":
-                selection = _select_text(
-                    G, ranked_text, refill_budget, top, repo_url, refill_exempt
-                )
+                selection = _select_text(G, ranked_text, refill_budget, lines, refill_exempt)
             else:
                 selection = _select_nodes(
-                    G, focus_out, refill_budget, top, repo_url, exempt=refill_exempt, pr=pr
+                    G, focus_out, refill_budget, lines, exempt=refill_exempt, pr=pr
                 )
 
     included = sorted(selection)
@@ -504,27 +546,27 @@ def build_context_pack(
     focus_nodes = focus_out
 
     edges: List[Dict[str, Any]] = []
-    for s, t, d in sorted(G.edges(data=True), key=lambda e: (e[0], e[1])):
-        if s in included_set and t in included_set:
+    for s in included:
+        for t in sorted(G.successors(s)):
+            if t not in included_set:
+                continue
+            d = G.succ[s][t]
             edges.append(
                 {
                     "caller": s,
                     "callee": t,
                     "confidence": d.get("confidence", "resolved"),
                     "provenance": d.get("provenance")
-                    or f"{_rel(d.get('file', ''), top)}:{d.get('lineno', 0)}",
+                    or f"{lines.rel(d.get('file', ''))}:{d.get('lineno', 0)}",
                 }
             )
 
     cycles: List[List[str]] = []
     for c in find_cycles(G):
         if included_set & set(c):
-            # Rotate to the lexicographically smallest node so the rendered
-            # chain is identical run-to-run (simple_cycles' start node isn't).
-            i = c.index(min(c))
-            cycles.append(list(c[i:]) + list(c[:i]))
+            cycles.append(list(c))  # starts at its smallest node
     cycles.sort()
-    rendered_nodes = [_node_line(G, n, top, repo_url) for n in included]
+    rendered_nodes = [lines.line(n) for n in included]
 
     pack = ContextPack(
         project_name=result.project_name,
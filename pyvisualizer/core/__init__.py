@@ -1,15 +1,45 @@
 """Core analysis modules for PyVisualizer."""
 
-from pyvisualizer.core.analyzer import ImportCollector, ImportInfo, ModuleAnalyzer
-from pyvisualizer.core.graph import FunctionCallVisitor, build_call_graph
+from pyvisualizer.core.analyzer import (
+    CallSite,
+    ClassInfo,
+    FunctionInfo,
+    ImportCollector,
+    ImportInfo,
+    ModuleAnalyzer,
+)
+from pyvisualizer.core.csr import CSRGraph
+from pyvisualizer.core.cycles import cycle_rank, cyclic_components, find_simple_cycles
+from pyvisualizer.core.graph import CallResolver, FunctionCallVisitor, build_call_graph
+from pyvisualizer.core.graph_analysis import GraphAnalysis, graph_analysis
+from pyvisualizer.core.incremental import GraphState
+from pyvisualizer.core.reachability import ReachabilityIndex
 from pyvisualizer.core.resolver import filter_by_depth, filter_by_modules
+from pyvisualizer.core.symbols import SymbolIndex, SymbolTable
+from pyvisualizer.core.walker import ModuleWalker, analyze_module
 
 __all__ = [
     "ImportInfo",
+    "FunctionInfo",
+    "ClassInfo",
     "ImportCollector",
     "ModuleAnalyzer",
     "FunctionCallVisitor",
+    "ModuleWalker",
+    "analyze_module",
+    "CallSite",
+    "CallResolver",
+    "SymbolIndex",
+    "SymbolTable",
     "build_call_graph",
+    "cyclic_components",
+    "cycle_rank",
+    "find_simple_cycles",
+    "GraphState",
+    "CSRGraph",
+    "GraphAnalysis",
+    "graph_analysis",
+    "ReachabilityIndex",
     "filter_by_modules",
     "filter_by_depth",
 ]
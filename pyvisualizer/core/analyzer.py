@@ -7,7 +7,8 @@ using Python's Abstract Syntax Trees (AST).
 
 import ast
 import logging
-from typing import Any, Dict, List, NamedTuple, Optional, Set
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 
 logger = logging.getLogger("pyvisualizer.analyzer")
 
@@ -21,6 +22,62 @@ class ImportInfo(NamedTuple):
     is_star: bool = False
 
 
+class CallSite(NamedTuple):
+    """One call expression, captured with module-local context only.
+
+    Everything needed to resolve the call later -- without the AST, against
+    the project-wide definition table -- is recorded as plain strings, so call
+    sites can be cached on disk and re-resolved when other modules change.
+    """
+
+    caller: str
+    lineno: int
+    kind: str  # 'name' | 'super' | 'attr' | 'chain' | 'result'
+    name: str  # called name, method name, or last dotted component
+    obj: Optional[str] = None  # receiver name ('attr') or dotted path ('chain')
+    cls: Optional[str] = None  # class enclosing the caller, if any
+    typed: Optional[str] = None  # receiver's known class (typed variable)
+    ctx: Optional[str] = None  # receiver's context-manager class
+
+
+class FunctionInfo(NamedTuple):
+    """One function, method or nested closure, as recorded by the analyzer."""
+
+    name: str
+    module: str
+    cls: Optional[str]  # owning class, for methods only
+    qualified: str
+    lineno: int
+    end_lineno: Optional[int]
+    is_async: bool
+    is_property: bool
+    is_static: bool
+    is_classmethod: bool
+    is_method: bool
+    is_nested: bool
+    decorators: List[Dict[str, Any]]
+    decorator_names: List[str]
+    return_annotation: Optional[Dict[str, Any]]
+    arg_types: Dict[str, Dict[str, Any]]
+    args: List[str]
+
+    @property
+    def full_name(self) -> str:
+        return self.qualified
+
+
+class ClassInfo(NamedTuple):
+    """One class definition, with the methods defined directly on it."""
+
+    name: str
+    module: str
+    qualified: str
+    bases: List[str]  # base-class expressions as written (dotted)
+    methods: Dict[str, FunctionInfo]  # method name -> its entry in ``functions``
+    lineno: int
+    decorators: List[Dict[str, Any]]
+
+
 class ImportCollector(ast.NodeVisitor):
     """AST visitor to collect all imports before function analysis."""
 
@@ -41,6 +98,16 @@ class ImportCollector(ast.NodeVisitor):
 
     def visit_Import(self, node: ast.Import) -> None:
         """Process import statements."""
+        self.record_import(node)
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        """Process from-import statements."""
+        self.record_import_from(node)
+        self.generic_visit(node)
+
+    def record_import(self, node: ast.Import) -> None:
+        """Record one ``import`` statement (without visiting its children)."""
         for name in node.names:
             module_name = name.name
             alias = name.asname or module_name
@@ -59,10 +126,8 @@ class ImportCollector(ast.NodeVisitor):
                 partial_module = ".".join(parts[:i])
                 self.all_modules.add(partial_module)
 
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        """Process from-import statements."""
+    def record_import_from(self, node: ast.ImportFrom) -> None:
+        """Record one ``from ... import`` statement (without visiting its children)."""
         if node.module is not None or node.level > 0:
             # Handle relative imports by resolving the relative path
             if node.level > 0:
@@ -90,8 +155,6 @@ class ImportCollector(ast.NodeVisitor):
                     self.import_from_map[module_name].add(imported_name)
                     self.imports.append(ImportInfo(module_name, imported_name, alias))
 
-        self.generic_visit(node)
-
     def _resolve_relative_import(self, module_name: Optional[str], level: int) -> str:
         """Resolve a relative import to an absolute module path."""
         if level == 0:
@@ -121,18 +184,19 @@ class ImportCollector(ast.NodeVisitor):
 class ModuleAnalyzer:
     """Manages analysis of an entire module including imports and function definitions."""
 
-    def __init__(self, module_name: str, file_path: str, tree: ast.AST, project_root: str):
-        self.module_name = module_name
+    def __init__(
+        self, module_name: str, file_path: str, tree: Optional[ast.AST], project_root: str
+    ):
+        self.module_name = sys.intern(module_name)
         self.file_path = file_path
-        self.tree = tree
+        self.tree: Optional[ast.AST] = tree
         self.project_root = project_root
         self.imports = ImportCollector(module_name, project_root)
-        self.imports.visit(tree)
 
         # Maps class names to their definitions with inheritance info
-        self.classes: Dict[str, Dict[str, Any]] = {}
+        self.classes: Dict[str, ClassInfo] = {}
         # Maps function/method names to their definitions
-        self.functions: Dict[str, Dict[str, Any]] = {}
+        self.functions: Dict[str, FunctionInfo] = {}
         # Maps class variables and function variables to what they reference
         self.variable_map: Dict[str, str] = {}
         # Track all method calls
@@ -141,9 +205,73 @@ class ModuleAnalyzer:
         self.decorators: Dict[str, List[Dict[str, Any]]] = {}
         # Track type annotations
         self.type_annotations: Dict[str, Dict[str, Any]] = {}
+        # Unresolved call sites, filled in by the call-graph pass
+        self.call_sites: List[CallSite] = []
+
+        # Process imports, then class and function definitions. Without a tree
+        # the analyzer starts empty, to be filled by a single-pass walker or
+        # from a cached summary.
+        if tree is not None:
+            self.imports.visit(tree)
+            self._collect_definitions()
+
+    def release_ast(self) -> None:
+        """Drop the module's syntax tree, keeping only the compact records.
+
+        Names, line spans, arguments, decorators and call sites all live in
+        :class:`FunctionInfo`/:class:`ClassInfo`/:class:`CallSite` records,
+        which never reference AST nodes.
+        """
+        self.tree = None
 
-        # Process class and function definitions
-        self._collect_definitions()
+    def to_summary(self) -> Dict[str, Any]:
+        """Return the analysis as plain, AST-free data (for caching).
+
+        Only builtin containers and scalars are used so the summary survives a
+        ``marshal`` round-trip; :meth:`from_summary` rebuilds an equivalent
+        analyzer without re-parsing the file.
+        """
+        imports = self.imports
+        return {
+            "import_map": dict(imports.import_map),
+            "import_from_map": {m: sorted(n) for m, n in imports.import_from_map.items()},
+            "direct_imports": sorted(imports.direct_imports),
+            "all_modules": sorted(imports.all_modules),
+            "star_imports": sorted(imports.star_imports),
+            "imports": [tuple(i) for i in imports.imports],
+            "classes": [
+                info[:4] + ([m.qualified for m in info.methods.values()],) + info[5:]
+                for info in self.classes.values()
+            ],
+            "functions": [tuple(info) for info in self.functions.values()],
+            "call_sites": [tuple(site) for site in self.call_sites],
+        }
+
+    @classmethod
+    def from_summary(
+        cls, module_name: str, file_path: str, summary: Dict[str, Any], project_root: str
+    ) -> "ModuleAnalyzer":
+        """Rebuild an analyzer from :meth:`to_summary` output (no AST retained)."""
+        analyzer = cls(module_name, file_path, None, project_root)
+        imports = analyzer.imports
+        imports.import_map = dict(summary["import_map"])
+        imports.import_from_map = {m: set(n) for m, n in summary["import_from_map"].items()}
+        imports.direct_imports = set(summary["direct_imports"])
+        imports.all_modules = set(summary["all_modules"])
+        imports.star_imports = set(summary["star_imports"])
+        imports.imports = [ImportInfo(*i) for i in summary["imports"]]
+
+        functions = analyzer.functions
+        for fields in summary["functions"]:
+            info = FunctionInfo(*fields)
+            functions[info.qualified] = info
+        for name, module, qualified, bases, method_names, lineno, decorators in summary["classes"]:
+            methods = {functions[q].name: functions[q] for q in method_names}
+            analyzer.classes[qualified] = ClassInfo(
+                name, module, qualified, bases, methods, lineno, decorators
+            )
+        analyzer.call_sites = [CallSite(*site) for site in summary["call_sites"]]
+        return analyzer
 
     def _collect_definitions(self) -> None:
         """Collect all class and function definitions from the module.
@@ -152,6 +280,8 @@ class ModuleAnalyzer:
         nested classes, methods, and nested functions/closures all receive
         correct fully-qualified names and none are missed.
         """
+        if self.tree is None:
+            return
         collector = DefinitionCollector(self)
         collector.visit(self.tree)
 
@@ -321,10 +451,30 @@ class DefinitionCollector(ast.NodeVisitor):
         parent = self._parent
         if parent.kind == "function":
             # Follow Python's __qualname__ convention for closures.
-            return f"{parent.qualified}.<locals>.{name}"
-        return f"{parent.qualified}.{name}"
+            return sys.intern(f"{parent.qualified}.<locals>.{name}")
+        return sys.intern(f"{parent.qualified}.{name}")
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        qualified = self.record_class(node)
+        self.scope_stack.append(_Scope("class", qualified, qualified))
+        self.generic_visit(node)
+        self.scope_stack.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node, is_async=False)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node, is_async=True)
+
+    def _visit_function(self, node: Any, is_async: bool) -> None:
+        qualified, class_qualified = self.record_function(node, is_async)
+        # Recurse so nested classes/functions inside this body are collected.
+        self.scope_stack.append(_Scope("function", qualified, class_qualified))
+        self.generic_visit(node)
+        self.scope_stack.pop()
+
+    def record_class(self, node: ast.ClassDef) -> str:
+        """Record a class in the current scope; return its qualified name."""
         qualified = self._child_qualified(node.name)
 
         base_classes: List[str] = []
@@ -336,28 +486,24 @@ class DefinitionCollector(ast.NodeVisitor):
                 if parts:
                     base_classes.append(".".join(parts))
 
-        self.analyzer.classes[qualified] = {
-            "name": node.name,
-            "module": self.module_name,
-            "qualified": qualified,
-            "bases": base_classes,
-            "methods": {},
-            "node": node,
-            "lineno": node.lineno,
-            "decorators": [self.analyzer._process_decorator(d) for d in node.decorator_list],
-        }
-
-        self.scope_stack.append(_Scope("class", qualified, qualified))
-        self.generic_visit(node)
-        self.scope_stack.pop()
-
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        self._visit_function(node, is_async=False)
+        self.analyzer.classes[qualified] = ClassInfo(
+            name=node.name,
+            module=self.module_name,
+            qualified=qualified,
+            bases=base_classes,
+            methods={},
+            lineno=node.lineno,
+            decorators=[self.analyzer._process_decorator(d) for d in node.decorator_list],
+        )
+        return qualified
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        self._visit_function(node, is_async=True)
+    def record_function(self, node: Any, is_async: bool) -> Tuple[str, Optional[str]]:
+        """Record a function/method in the current scope.
 
-    def _visit_function(self, node: Any, is_async: bool) -> None:
+        Returns its qualified name and the qualified name of the nearest
+        enclosing class (``None`` outside classes), the two parts of the
+        scope its body opens.
+        """
         parent = self._parent
         qualified = self._child_qualified(node.name)
         is_method = parent.kind == "class"
@@ -374,46 +520,30 @@ class DefinitionCollector(ast.NodeVisitor):
 
         arg_types = self.analyzer._arg_types(node)
 
-        info = {
-            "name": node.name,
-            "module": self.module_name,
-            "class": class_qualified if is_method else None,
-            "full_name": qualified,
-            "qualified": qualified,
-            "lineno": node.lineno,
-            "end_lineno": getattr(node, "end_lineno", None),
-            "node": node,
-            "is_async": is_async,
-            "is_property": is_property,
-            "is_static": is_static,
-            "is_classmethod": is_classmethod,
-            "is_method": is_method,
-            "is_nested": is_nested,
-            "decorators": [self.analyzer._process_decorator(d) for d in node.decorator_list],
-            "decorator_names": decorator_names,
-            "return_annotation": (
+        info = FunctionInfo(
+            name=node.name,
+            module=self.module_name,
+            cls=class_qualified if is_method else None,
+            qualified=qualified,
+            lineno=node.lineno,
+            end_lineno=getattr(node, "end_lineno", None),
+            is_async=is_async,
+            is_property=is_property,
+            is_static=is_static,
+            is_classmethod=is_classmethod,
+            is_method=is_method,
+            is_nested=is_nested,
+            decorators=[self.analyzer._process_decorator(d) for d in node.decorator_list],
+            decorator_names=decorator_names,
+            return_annotation=(
                 self.analyzer._process_annotation(node.returns) if node.returns else None
             ),
-            "arg_types": arg_types,
-            "args": self.analyzer._arg_names(node),
-        }
+            arg_types=arg_types,
+            args=self.analyzer._arg_names(node),
+        )
         self.analyzer.functions[qualified] = info
 
         # Register direct methods on their owning class.
         if is_method and class_qualified in self.analyzer.classes:
-            self.analyzer.classes[class_qualified]["methods"][node.name] = {
-                "name": node.name,
-                "full_name": qualified,
-                "node": node,
-                "is_async": is_async,
-                "is_property": is_property,
-                "is_static": is_static,
-                "is_classmethod": is_classmethod,
-                "decorators": info["decorators"],
-                "return_annotation": info["return_annotation"],
-            }
-
-        # Recurse so nested classes/functions inside this body are collected.
-        self.scope_stack.append(_Scope("function", qualified, class_qualified))
-        self.generic_visit(node)
-        self.scope_stack.pop()
+            self.analyzer.classes[class_qualified].methods[node.name] = info
+        return qualified, class_qualified
@@ -0,0 +1,686 @@
+"""
+Frozen compressed-sparse-row call graph.
+
+:class:`networkx.DiGraph` keeps a dict per node, a dict per adjacency and a
+dict per edge; on a project with a couple of hundred thousand functions the
+representation alone runs to gigabytes and every traversal chases pointers
+through it. :class:`CSRGraph` stores the same graph as integer node ids,
+``array``-backed successor/predecessor offsets and columnar attributes with
+dictionary-encoded (interned) strings, and answers the read-only part of the
+``DiGraph`` API the analyses use -- ``nodes``, ``edges``, ``succ``/``pred``,
+``successors``/``predecessors``, degrees, ``subgraph`` -- in the same order
+networkx would. :func:`ancestors`, :func:`descendants`, :func:`reachable` and
+:func:`strongly_connected_components` run directly on the arrays and fall
+back to networkx for ordinary graphs, so ``impact``, ``metrics``, ``gates``
+and ``context`` accept either.
+
+The graph is immutable: attribute dicts come back as read-only mappings,
+and :meth:`CSRGraph.copy` / :meth:`CSRGraph.to_networkx` are the opt-in way
+back to a mutable :class:`networkx.DiGraph`.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import networkx as nx
+
+GraphLike = Union[nx.DiGraph, "CSRGraph"]
+
+_MISSING = object()  # attribute not set on this node/edge
+
+
+class _FrozenList(tuple):
+    """Storage for a list attribute; handed back as a fresh ``list``."""
+
+    __slots__ = ()
+
+
+_EMPTY_LIST = _FrozenList()
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if type(value) is list:
+        if not value:
+            return _EMPTY_LIST
+        return _FrozenList(sys.intern(v) if isinstance(v, str) else v for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    return list(value) if type(value) is _FrozenList else value
+
+
+class _Column:
+    """One attribute across every node (or edge), in the narrowest encoding.
+
+    ``int`` and ``bool`` columns are packed arrays, all-string columns are
+    codes into a table of distinct (interned) strings, a column that is only
+    ever ``True`` where set is a byte per row, and anything else is a list.
+    """
+
+    __slots__ = ("kind", "data", "table")
+
+    def __init__(self, values: Sequence[Any]) -> None:
+        types = {type(v) for v in values}
+        self.table: List[str] = []
+        if types == {int} and all(-(2**63) <= v < 2**63 for v in values):
+            self.kind = "int"
+            self.data: Any = array("q", values)
+        elif types == {bool}:
+            self.kind = "bool"
+            self.data = bytearray(values)
+        elif types == {str}:
+            self.kind = "str"
+            codes: Dict[str, int] = {}
+            self.data = array("l", (codes.setdefault(v, len(codes)) for v in values))
+            self.table = [sys.intern(v) for v in codes]
+        elif types <= {bool, object} and all(v is True or v is _MISSING for v in values):
+            self.kind = "flag"
+            self.data = bytearray(v is True for v in values)
+        else:
+            self.kind = "obj"
+            self.data = [_freeze(v) for v in values]
+
+    def __getitem__(self, i: int) -> Any:
+        kind = self.kind
+        if kind == "str":
+            return self.table[self.data[i]]
+        if kind == "bool":
+            return bool(self.data[i])
+        if kind == "flag":
+            return True if self.data[i] else _MISSING
+        if kind == "obj":
+            return _thaw(self.data[i])
+        return self.data[i]
+
+
+class _Table:
+    """Columns for every attribute key of the nodes (or edges), first-seen order."""
+
+    __slots__ = ("keys", "columns")
+
+    def __init__(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        keys: Dict[str, None] = {}
+        for row in rows:
+            for key in row:
+                keys.setdefault(key, None)
+        self.keys = {key: k for k, key in enumerate(keys)}
+        self.columns = [_Column([row.get(key, _MISSING) for row in rows]) for key in keys]
+
+
+class _Record(Mapping):
+    """One node's (or edge's) attributes, read from the columns on access."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: _Table, i: int) -> None:
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        k = self._table.keys.get(key)
+        value = _MISSING if k is None else self._table.columns[k][self._i]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        k = self._table.keys.get(key)
+        if k is None:
+            return default
+        value = self._table.columns[k][self._i]
+        return default if value is _MISSING else value
+
+    def __iter__(self) -> Iterator[str]:
+        i = self._i
+        for key, column in zip(self._table.keys, self._table.columns):
+            if column[i] is not _MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class CSRGraph:
+    """A read-only directed graph in compressed sparse row form.
+
+    Node ``i`` is ``names[i]``; its successors are
+    ``succ_targets[succ_offsets[i]:succ_offsets[i + 1]]`` and the position in
+    that array is the edge's id, which indexes the edge attribute columns.
+    Predecessors are stored the same way, with ``pred_edges`` mapping each
+    back to its edge id. Node, successor and predecessor order all match the
+    networkx graph this one was built from.
+    """
+
+    __slots__ = (
+        "names",
+        "index",
+        "succ_offsets",
+        "succ_targets",
+        "pred_offsets",
+        "pred_sources",
+        "pred_edges",
+        "_nodes",
+        "_edges",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        names: List[str],
+        node_attrs: Sequence[Mapping[str, Any]],
+        succ: Sequence[Sequence[int]],
+        pred: Sequence[Sequence[int]],
+        edge_attrs: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """Prefer :meth:`from_networkx` or :meth:`from_edges`.
+
+        ``succ[i]``/``pred[i]`` list node ``i``'s neighbour ids in order;
+        ``edge_attrs`` follows the concatenation of ``succ``.
+        """
+        self.names = [sys.intern(n) for n in names]
+        self.index = {n: i for i, n in enumerate(self.names)}
+        self.succ_offsets, self.succ_targets = _pack(succ)
+        self.pred_offsets, self.pred_sources = _pack(pred)
+
+        edge_ids: Dict[Tuple[int, int], int] = {}
+        for i, targets in enumerate(succ):
+            start = self.succ_offsets[i]
+            for k, j in enumerate(targets):
+                edge_ids[(i, j)] = start + k
+        self.pred_edges = array("l", (edge_ids[(s, j)] for j, ss in enumerate(pred) for s in ss))
+
+        self._nodes = _Table(node_attrs)
+        self._edges = _Table(edge_attrs)
+
+    # -- construction --------------------------------------------------------
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph) -> "CSRGraph":
+        """Freeze ``G``, keeping its node and adjacency order."""
+        names = list(G)
+        index = {n: i for i, n in enumerate(names)}
+        succ = [[index[m] for m in G.succ[n]] for n in names]
+        pred = [[index[m] for m in G.pred[n]] for n in names]
+        edge_attrs = [data for n in names for data in G.succ[n].values()]
+        return cls(names, [G.nodes[n] for n in names], succ, pred, edge_attrs)
+
+    @classmethod
+    def from_edges(
+        cls,
+        nodes: Iterable[Tuple[str, Mapping[str, Any]]],
+        edges: Iterable[Tuple[str, str, Mapping[str, Any]]],
+        *,
+        mark_cycles: bool = False,
+    ) -> "CSRGraph":
+        """The graph networkx would hold after adding ``nodes``, then ``edges``, in order.
+
+        With ``mark_cycles``, every edge on a cycle gets ``is_cycle=True``
+        (see :func:`pyvisualizer.core.graph._mark_cycles`).
+        """
+        node_list = list(nodes)
+        names = [n for n, _ in node_list]
+        index = {n: i for i, n in enumerate(names)}
+        succ: List[List[int]] = [[] for _ in names]
+        pred: List[List[int]] = [[] for _ in names]
+        data_by_edge: Dict[Tuple[int, int], Mapping[str, Any]] = {}
+        for u, v, data in edges:
+            i, j = index[u], index[v]
+            if (i, j) not in data_by_edge:
+                succ[i].append(j)
+                pred[j].append(i)
+            data_by_edge[(i, j)] = data
+        pairs = [(i, j) for i, targets in enumerate(succ) for j in targets]
+        edge_attrs = [data_by_edge[pair] for pair in pairs]
+        if mark_cycles:
+            component = _component_ids(succ)
+            edge_attrs = [
+                dict(data, is_cycle=True) if i == j or component[i] == component[j] else data
+                for (i, j), data in zip(pairs, edge_attrs)
+            ]
+        return cls(names, [attrs for _, attrs in node_list], succ, pred, edge_attrs)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """A mutable :class:`networkx.DiGraph` equal to this graph, order included."""
+        G = nx.DiGraph()
+        for i, n in enumerate(self.names):
+            G.add_node(n, **self._node(i))
+        # Adding edges in predecessor order reproduces the predecessor dicts;
+        # the successor dicts are then put back in their stored order.
+        for j, v in enumerate(self.names):
+            for k in range(self.pred_offsets[j], self.pred_offsets[j + 1]):
+                u = self.names[self.pred_sources[k]]
+                G.add_edge(u, v, **self._edge(self.pred_edges[k]))
+        for i, u in enumerate(self.names):
+            adjacency = G._succ[u]
+            ordered = [(v, adjacency[v]) for v in self._succ_names(i)]
+            adjacency.clear()
+            adjacency.update(ordered)
+        return G
+
+    def copy(self) -> nx.DiGraph:
+        """A mutable networkx copy (the frozen graph itself never changes)."""
+        return self.to_networkx()
+
+    def subgraph(self, nodes: Iterable[str]) -> nx.DiGraph:
+        """The subgraph induced by ``nodes``, as a new :class:`networkx.DiGraph`."""
+        keep = sorted({self.index[n] for n in nodes if n in self.index})
+        keep_set = set(keep)
+        H = nx.DiGraph()
+        for i in keep:
+            H.add_node(self.names[i], **self._node(i))
+        for i in keep:
+            for e in range(self.succ_offsets[i], self.succ_offsets[i + 1]):
+                j = self.succ_targets[e]
+                if j in keep_set:
+                    H.add_edge(self.names[i], self.names[j], **self._edge(e))
+        return H
+
+    # -- networkx-compatible reads ------------------------------------------
+
+    def _node(self, i: int) -> Mapping[str, Any]:
+        return _Record(self._nodes, i)
+
+    def _edge(self, e: int) -> Mapping[str, Any]:
+        return _Record(self._edges, e)
+
+    def _succ_ids(self, i: int) -> array:
+        return self.succ_targets[self.succ_offsets[i] : self.succ_offsets[i + 1]]
+
+    def _pred_ids(self, i: int) -> array:
+        return self.pred_sources[self.pred_offsets[i] : self.pred_offsets[i + 1]]
+
+    def _succ_names(self, i: int) -> List[str]:
+        names = self.names
+        return [names[j] for j in self._succ_ids(i)]
+
+    def _edge_id(self, u: str, v: str) -> Optional[int]:
+        i = self.index.get(u)
+        j = self.index.get(v)
+        if i is None or j is None:
+            return None
+        for e in range(self.succ_offsets[i], self.succ_offsets[i + 1]):
+            if self.succ_targets[e] == j:
+                return e
+        return None
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, node: str) -> "_Neighbors":
+        return self.succ[node]
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(nodes={self.number_of_nodes()}, edges={self.number_of_edges()})"
+
+    @property
+    def nodes(self) -> "_NodeView":
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> "_EdgeView":
+        return _EdgeView(self)
+
+    @property
+    def succ(self) -> "_AdjacencyView":
+        return _AdjacencyView(self, forward=True)
+
+    adj = succ
+
+    @property
+    def pred(self) -> "_AdjacencyView":
+        return _AdjacencyView(self, forward=False)
+
+    def successors(self, node: str) -> Iterator[str]:
+        return iter(self._succ_names(self._id(node)))
+
+    neighbors = successors
+
+    def predecessors(self, node: str) -> Iterator[str]:
+        names = self.names
+        return iter([names[j] for j in self._pred_ids(self._id(node))])
+
+    def _id(self, node: str) -> int:
+        try:
+            return self.index[node]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {node} is not in the digraph.") from None
+
+    def out_degree(self, node: Optional[str] = None) -> Any:
+        """``node``'s number of successors; every ``(node, degree)`` if omitted."""
+        offsets = self.succ_offsets
+        if node is not None:
+            i = self._id(node)
+            return offsets[i + 1] - offsets[i]
+        return [(n, offsets[i + 1] - offsets[i]) for i, n in enumerate(self.names)]
+
+    def in_degree(self, node: Optional[str] = None) -> Any:
+        """``node``'s number of predecessors; every ``(node, degree)`` if omitted."""
+        offsets = self.pred_offsets
+        if node is not None:
+            i = self._id(node)
+            return offsets[i + 1] - offsets[i]
+        return [(n, offsets[i + 1] - offsets[i]) for i, n in enumerate(self.names)]
+
+    def degree(self, node: Optional[str] = None) -> Any:
+        """In- plus out-degree, like :attr:`networkx.DiGraph.degree`."""
+        so, po = self.succ_offsets, self.pred_offsets
+        if node is not None:
+            i = self._id(node)
+            return so[i + 1] - so[i] + po[i + 1] - po[i]
+        return [(n, so[i + 1] - so[i] + po[i + 1] - po[i]) for i, n in enumerate(self.names)]
+
+    def number_of_nodes(self) -> int:
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        return len(self.succ_targets)
+
+    def has_node(self, node: object) -> bool:
+        return node in self.index
+
+    def has_edge(self, u: str, v: str) -> bool:
+        return self._edge_id(u, v) is not None
+
+    def is_directed(self) -> bool:
+        return True
+
+    def is_multigraph(self) -> bool:
+        return False
+
+
+class _NodeView:
+    """``G.nodes``: iterate, test, index (``G.nodes[n]``) or call with ``data``."""
+
+    __slots__ = ("_g",)
+
+    def __init__(self, g: CSRGraph) -> None:
+        self._g = g
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._g.names)
+
+    def __len__(self) -> int:
+        return len(self._g.names)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._g.index
+
+    def __getitem__(self, node: str) -> Mapping[str, Any]:
+        return self._g._node(self._g.index[node])
+
+    def __call__(self, data: Union[bool, str] = False, default: Any = None) -> Any:
+        g = self._g
+        if data is False:
+            return self
+        if data is True:
+            return ((n, g._node(i)) for i, n in enumerate(g.names))
+        return ((n, g._node(i).get(data, default)) for i, n in enumerate(g.names))
+
+
+class _EdgeView:
+    """``G.edges``: ``(u, v)`` pairs in successor order, ``G.edges[u, v]`` for data."""
+
+    __slots__ = ("_g",)
+
+    def __init__(self, g: CSRGraph) -> None:
+        self._g = g
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._pairs())
+
+    def __len__(self) -> int:
+        return self._g.number_of_edges()
+
+    def __contains__(self, edge: object) -> bool:
+        return isinstance(edge, tuple) and len(edge) == 2 and self._g.has_edge(*edge)
+
+    def __getitem__(self, edge: Tuple[str, str]) -> Mapping[str, Any]:
+        e = self._g._edge_id(*edge)
+        if e is None:
+            raise KeyError(edge)
+        return self._g._edge(e)
+
+    def _pairs(self) -> List[Tuple[str, str]]:
+        g = self._g
+        names, targets, offsets = g.names, g.succ_targets, g.succ_offsets
+        return [
+            (u, names[targets[e]])
+            for i, u in enumerate(names)
+            for e in range(offsets[i], offsets[i + 1])
+        ]
+
+    def __call__(self, data: Union[bool, str] = False, default: Any = None) -> Any:
+        g = self._g
+        if data is False:
+            return self
+        names, targets, offsets = g.names, g.succ_targets, g.succ_offsets
+        if data is True:
+            return (
+                (u, names[targets[e]], g._edge(e))
+                for i, u in enumerate(names)
+                for e in range(offsets[i], offsets[i + 1])
+            )
+        return (
+            (u, names[targets[e]], g._edge(e).get(data, default))
+            for i, u in enumerate(names)
+            for e in range(offsets[i], offsets[i + 1])
+        )
+
+
+class _AdjacencyView(Mapping):
+    """``G.succ`` / ``G.pred``: node -> its neighbours (with edge data)."""
+
+    __slots__ = ("_g", "_forward")
+
+    def __init__(self, g: CSRGraph, forward: bool) -> None:
+        self._g = g
+        self._forward = forward
+
+    def __getitem__(self, node: str) -> "_Neighbors":
+        return _Neighbors(self._g, self._g._id(node), self._forward)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._g.names)
+
+    def __len__(self) -> int:
+        return len(self._g.names)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._g.index
+
+
+class _Neighbors(Mapping):
+    """One node's successors or predecessors, mapped to the edge data."""
+
+    __slots__ = ("_g", "_ids", "_edges")
+
+    def __init__(self, g: CSRGraph, i: int, forward: bool) -> None:
+        self._g = g
+        if forward:
+            start, stop = g.succ_offsets[i], g.succ_offsets[i + 1]
+            self._ids = g.succ_targets[start:stop]
+            self._edges: Sequence[int] = range(start, stop)
+        else:
+            start, stop = g.pred_offsets[i], g.pred_offsets[i + 1]
+            self._ids = g.pred_sources[start:stop]
+            self._edges = g.pred_edges[start:stop]
+
+    def __getitem__(self, node: str) -> Mapping[str, Any]:
+        j = self._g.index.get(node)
+        for k, other in enumerate(self._ids):
+            if other == j:
+                return self._g._edge(self._edges[k])
+        raise KeyError(node)
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._g.names
+        return (names[j] for j in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, node: object) -> bool:
+        j = self._g.index.get(node)  # type: ignore[call-overload]
+        return j is not None and j in self._ids
+
+
+def _pack(lists: Sequence[Sequence[int]]) -> Tuple[array, array]:
+    offsets = array("q", [0])
+    flat = array("l")
+    for items in lists:
+        flat.extend(items)
+        offsets.append(len(flat))
+    return offsets, flat
+
+
+def _component_ids(succ: Sequence[Sequence[int]]) -> List[int]:
+    """Strongly connected component id per node (iterative Tarjan)."""
+    n = len(succ)
+    index = [-1] * n
+    low = [0] * n
+    component = [-1] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    counter = 0
+    next_component = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, k = work[-1]
+            if k == 0:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            targets = succ[v]
+            if k < len(targets):
+                work[-1] = (v, k + 1)
+                w = targets[k]
+                if index[w] == -1:
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = next_component
+                    if w == v:
+                        break
+                next_component += 1
+    return component
+
+
+def _csr_succ(G: CSRGraph) -> List[array]:
+    return [G._succ_ids(i) for i in range(len(G.names))]
+
+
+def strongly_connected_components(G: GraphLike) -> Iterator[Set[str]]:
+    """Strongly connected components of ``G``, either representation."""
+    if not isinstance(G, CSRGraph):
+        yield from nx.strongly_connected_components(G)
+        return
+    groups: Dict[int, Set[str]] = {}
+    for name, c in zip(G.names, _component_ids(_csr_succ(G))):
+        groups.setdefault(c, set()).add(name)
+    yield from groups.values()
+
+
+def condensation(G: GraphLike, scc: List[Set[str]]) -> nx.DiGraph:
+    """:func:`networkx.condensation` of ``G`` over the given components."""
+    if not isinstance(G, CSRGraph):
+        return nx.condensation(G, scc=scc)
+    mapping = {n: c for c, members in enumerate(scc) for n in members}
+    C = nx.DiGraph()
+    C.graph["mapping"] = mapping
+    C.add_nodes_from(range(len(scc)))
+    for c, members in enumerate(scc):
+        C.nodes[c]["members"] = set(members)
+    for i, u in enumerate(G.names):
+        cu = mapping[u]
+        for j in G._succ_ids(i):
+            cv = mapping[G.names[j]]
+            if cu != cv:
+                C.add_edge(cu, cv)
+    return C
+
+
+def _reach(G: CSRGraph, sources: Iterable[str], forward: bool) -> List[int]:
+    """Ids reachable from ``sources``, not counting the sources themselves."""
+    offsets = G.succ_offsets if forward else G.pred_offsets
+    targets = G.succ_targets if forward else G.pred_sources
+    seen = bytearray(len(G.names))
+    stack = [G._id(n) for n in sources]
+    for i in stack:
+        seen[i] = 1
+    found: List[int] = []
+    while stack:
+        i = stack.pop()
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if not seen[j]:
+                seen[j] = 1
+                found.append(j)
+                stack.append(j)
+    return found
+
+
+def reachable(G: GraphLike, sources: Iterable[str], *, forward: bool = True) -> Set[str]:
+    """Every node reachable from any of ``sources``, sources included, in one search.
+
+    ``forward=False`` walks call edges backwards (transitive callers).
+    """
+    if isinstance(G, CSRGraph):
+        names = G.names
+        seen = {names[j] for j in _reach(G, sources, forward)}
+        seen.update(sources)
+        return seen
+    adj = G._succ if forward else G._pred
+    seen = set(sources)
+    stack = list(seen)
+    while stack:
+        for m in adj[stack.pop()]:
+            if m not in seen:
+                seen.add(m)
+                stack.append(m)
+    return seen
+
+
+def descendants(G: GraphLike, node: str) -> Set[str]:
+    """Every node reachable from ``node`` (:func:`networkx.descendants`)."""
+    if isinstance(G, CSRGraph):
+        return {G.names[j] for j in _reach(G, (node,), forward=True)}
+    found: Set[str] = nx.descendants(G, node)
+    return found
+
+
+def ancestors(G: GraphLike, node: str) -> Set[str]:
+    """Every node that can reach ``node`` (:func:`networkx.ancestors`)."""
+    if isinstance(G, CSRGraph):
+        return {G.names[j] for j in _reach(G, (node,), forward=False)}
+    found: Set[str] = nx.ancestors(G, node)
+    return found
@@ -0,0 +1,178 @@
+"""
+Cycle detection that stays linear on dense graphs.
+
+Enumerating every elementary cycle is exponential in the worst case: a
+tightly knit cluster of a few dozen functions can have millions of them.
+Everything that only needs to know *whether* an edge or a node is on a cycle
+asks the strongly connected components instead (an edge lies on a cycle iff
+it is a self-loop or both of its ends share a component), and everything
+that needs a number uses :func:`cycle_rank`. Concrete cycles, for reports,
+come from :func:`find_simple_cycles`, which is bounded in both length and
+count and returns the same cycles in the same order on every run.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+import networkx as nx
+
+from pyvisualizer.core.csr import strongly_connected_components
+
+#: Longest cycle (in functions) :func:`find_simple_cycles` enumerates.
+DEFAULT_MAX_CYCLE_LENGTH = 10
+#: Most cycles :func:`find_simple_cycles` returns.
+DEFAULT_MAX_CYCLES = 200
+
+
+def cyclic_components(G: nx.DiGraph) -> List[List[str]]:
+    """Strongly connected components of two or more nodes, each sorted.
+
+    Components are ordered by their smallest node. Self-loops alone do not
+    make a component cyclic here: like every cycle report in the project,
+    only cycles between two or more functions count.
+    """
+    components = [sorted(c) for c in strongly_connected_components(G) if len(c) > 1]
+    components.sort(key=lambda c: c[0])
+    return components
+
+
+def cycle_rank(G: nx.DiGraph, components: Optional[List[List[str]]] = None) -> int:
+    """How many independent cycles ``G`` has, in linear time.
+
+    The circuit rank ``edges - nodes + 1`` of each cyclic component, summed
+    (self-loops excluded). A single loop counts once however long it is;
+    every edge that closes another loop through an already cyclic cluster
+    adds one. It never exceeds the number of elementary cycles and equals it
+    whenever no two cycles share an edge. ``components`` may pass in
+    :func:`cyclic_components` if it is already known.
+    """
+    if components is None:
+        components = cyclic_components(G)
+    rank = 0
+    for component in components:
+        members = set(component)
+        internal = sum(1 for n in component for m in G.succ[n] if m != n and m in members)
+        rank += internal - len(component) + 1
+    return rank
+
+
+def find_simple_cycles(
+    G: nx.DiGraph,
+    *,
+    max_length: Optional[int] = DEFAULT_MAX_CYCLE_LENGTH,
+    max_cycles: Optional[int] = DEFAULT_MAX_CYCLES,
+    components: Optional[List[List[str]]] = None,
+) -> List[List[str]]:
+    """Elementary cycles of two or more functions, bounded and deterministic.
+
+    Each cycle starts at its smallest node; the list is sorted by length,
+    then by node names. Cycles longer than ``max_length`` are skipped and
+    enumeration stops after ``max_cycles`` (``None`` lifts either bound), which
+    keeps reports cheap on clusters where full enumeration would never end.
+
+    Every cyclic component is still represented as long as ``max_cycles``
+    leaves room: one slot is held back for each component not yet visited,
+    and a component in which no cycle fits within ``max_length`` contributes
+    its shortest cycle through its smallest node. With ``max_cycles`` of at
+    least one, an empty result therefore means the graph is acyclic.
+    ``components`` may pass in :func:`cyclic_components` if already known.
+    """
+    if components is None:
+        components = cyclic_components(G)
+    cycles: List[List[str]] = []
+    for i, component in enumerate(components):
+        stop = None
+        if max_cycles is not None:
+            if len(cycles) >= max_cycles:
+                break
+            reserved = len(components) - i - 1
+            stop = len(cycles) + max(1, max_cycles - len(cycles) - reserved)
+        members = set(component)
+        succ = {n: sorted(m for m in G.succ[n] if m in members and m != n) for n in component}
+        found = len(cycles)
+        for start in component:
+            limit = None if stop is None else stop - len(cycles)
+            cycles.extend(_cycles_from(G, start, succ, members, max_length, limit))
+            if stop is not None and len(cycles) >= stop:
+                break
+        if len(cycles) == found:
+            cycles.append(_shortest_cycle(component[0], succ))
+    cycles.sort(key=lambda c: (len(c), c))
+    return cycles
+
+
+def _cycles_from(
+    G: nx.DiGraph,
+    start: str,
+    succ: Dict[str, List[str]],
+    members: Set[str],
+    max_length: Optional[int],
+    limit: Optional[int],
+) -> List[List[str]]:
+    """Cycles whose smallest node is ``start``, depth-first in sorted order."""
+    # Distance from each eligible node back to ``start``: a path is only
+    # extended if it can still close within ``max_length``.
+    depth = len(members) if max_length is None else max_length - 1
+    allowed = (n for n in members if n > start)
+    dist = _distances_to(G, start, set(allowed), depth)
+
+    cycles: List[List[str]] = []
+    path = [start]
+    on_path = {start}
+    stack = [iter(succ[start])]
+    while stack:
+        for callee in stack[-1]:
+            if callee == start:
+                if len(path) > 1:
+                    cycles.append(list(path))
+                    if limit is not None and len(cycles) >= limit:
+                        return cycles
+                continue
+            if callee in on_path:
+                continue
+            d = dist.get(callee)
+            if d is None or (max_length is not None and len(path) + d > max_length):
+                continue
+            path.append(callee)
+            on_path.add(callee)
+            stack.append(iter(succ[callee]))
+            break
+        else:
+            stack.pop()
+            on_path.discard(path.pop())
+    return cycles
+
+
+def _distances_to(G: nx.DiGraph, target: str, allowed: Set[str], depth: int) -> Dict[str, int]:
+    """Edges from each ``allowed`` node to ``target`` within ``depth`` (reverse BFS)."""
+    dist: Dict[str, int] = {}
+    queue = deque([(target, 0)])
+    while queue:
+        node, d = queue.popleft()
+        if d >= depth:
+            continue
+        for caller in G.pred[node]:
+            if caller in allowed and caller not in dist:
+                dist[caller] = d + 1
+                queue.append((caller, d + 1))
+    return dist
+
+
+def _shortest_cycle(start: str, succ: Dict[str, List[str]]) -> List[str]:
+    """A shortest cycle through ``start`` (breadth-first, deterministic)."""
+    parents: Dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for callee in succ[node]:
+            if callee == start:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            if callee not in parents:
+                parents[callee] = node
+                queue.append(callee)
+    return [start]  # pragma: no cover - start is on a cycle
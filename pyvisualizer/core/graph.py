@@ -14,16 +14,21 @@ Core principle — *Ground Truth, never guesswork*:
 
 import ast
 import logging
-from typing import Any, Dict, List, NamedTuple, Optional, Set
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
 
 import networkx as nx
 
-from pyvisualizer.core.analyzer import ModuleAnalyzer
+from pyvisualizer.core.analyzer import CallSite, FunctionInfo, ModuleAnalyzer
+from pyvisualizer.core.csr import CSRGraph
+from pyvisualizer.core.graph_analysis import graph_analysis, invalidate
 from pyvisualizer.core.model import (
     CONFIDENCE_AMBIGUOUS,
     CONFIDENCE_INHERITED,
+    CONFIDENCE_ORDER,
     CONFIDENCE_RESOLVED,
 )
+from pyvisualizer.core.symbols import ClassSymbol, ModuleSymbols, SymbolIndex, SymbolTable
 
 logger = logging.getLogger("pyvisualizer.graph")
 
@@ -42,8 +47,22 @@ class Resolution(NamedTuple):
     external: bool = False  # resolves outside the project -> emit no edge
 
 
+class ResolvedCall(NamedTuple):
+    """A call site that resolved to an in-project candidate."""
+
+    caller: str
+    lineno: int
+    res: Resolution
+
+
 class FunctionCallVisitor(ast.NodeVisitor):
-    """AST visitor to extract function calls with provenance and confidence."""
+    """AST visitor to extract function calls with provenance and confidence.
+
+    The walk itself only needs module-local context: every call expression is
+    recorded as a :class:`CallSite` in ``sites``. Resolution against the whole
+    project happens afterwards in :class:`CallResolver` (``calls``), so the
+    sites can be cached and re-resolved without the AST.
+    """
 
     def __init__(
         self,
@@ -62,20 +81,28 @@ class FunctionCallVisitor(ast.NodeVisitor):
         self.module_analyzer = module_analyzer
         self.all_modules = all_modules
         self.all_module_names = all_module_names
-        self.calls: List[Dict[str, Any]] = []
+        self.sites: List[CallSite] = []
         self.class_instances: Dict[str, str] = {}  # var name -> class name
         self.current_class_vars: Dict[str, str] = {}  # 'self.x' -> class name
         self.context_managers: Dict[str, str] = {}
 
-        self._class_cache: Dict[str, Optional[str]] = {}
+    @property
+    def calls(self) -> List[ResolvedCall]:
+        """The recorded sites resolved against ``all_modules`` (edges only)."""
+        resolver = CallResolver(
+            self.module_name,
+            SymbolIndex(SymbolTable.from_analyzers(self.all_modules)),
+            ModuleSymbols.from_analyzer(self.module_analyzer),
+        )
+        return resolver.resolve_sites(self.sites)
 
     # ------------------------------------------------------------------ scopes
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         previous_class = self.current_class
         if self.class_stack:
-            self.current_class = f"{self.class_stack[-1]}.{node.name}"
+            self.current_class = sys.intern(f"{self.class_stack[-1]}.{node.name}")
         else:
-            self.current_class = f"{self.module_name}.{node.name}"
+            self.current_class = sys.intern(f"{self.module_name}.{node.name}")
 
         self.class_stack.append(self.current_class)
         previous_vars = self.current_class_vars
@@ -97,9 +124,9 @@ class FunctionCallVisitor(ast.NodeVisitor):
         parent_func = self.current_function
 
         if self.class_stack:
-            self.current_function = f"{self.class_stack[-1]}.{node.name}"
+            self.current_function = sys.intern(f"{self.class_stack[-1]}.{node.name}")
         else:
-            self.current_function = f"{self.module_name}.{node.name}"
+            self.current_function = sys.intern(f"{self.module_name}.{node.name}")
 
         self.function_stack.append(self.current_function)
 
@@ -123,7 +150,7 @@ class FunctionCallVisitor(ast.NodeVisitor):
         info = self.module_analyzer.functions.get(self.current_function or "")
         if not info:
             return
-        for arg_name, ann in info.get("arg_types", {}).items():
+        for arg_name, ann in info.arg_types.items():
             cls = self._annotation_class(ann)
             if cls:
                 self.class_instances[arg_name] = cls
@@ -184,43 +211,19 @@ class FunctionCallVisitor(ast.NodeVisitor):
     # ----------------------------------------------------------------- calls
     def visit_Call(self, node: ast.Call) -> None:
         if self.current_function:
-            res = self._resolve_call(node)
-            if res.target and not res.external:
-                self.calls.append(
-                    {
-                        "caller": self.current_function,
-                        "lineno": node.lineno,
-                        "res": res,
-                    }
-                )
+            site = self._call_site(node)
+            if site is not None:
+                self.sites.append(site)
         # Recurse into the *entire* call expression: the callee expression
         # (so chained calls like get_client().fetch() capture the inner call),
         # arguments, keywords, comprehensions and lambdas.
         self.generic_visit(node)
 
-    def _resolve_call(self, node: ast.Call) -> Resolution:
+    def _call_site(self, node: ast.Call) -> Optional[CallSite]:
+        caller = self.current_function or ""
         # --- bare name: func_name() --------------------------------------
         if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-
-            if func_name in self.module_analyzer.imports.import_map:
-                imported_path = self.module_analyzer.imports.import_map[func_name]
-                if "." in imported_path:
-                    module_path, short = imported_path.rsplit(".", 1)
-                    found = self._lookup_module_function(module_path, short)
-                    if found:
-                        return Resolution(found, exact=True, via="import")
-                    # Import resolves outside the project: no edge.
-                    return Resolution(imported_path, via="import", external=True)
-                return Resolution(imported_path, via="import", external=True)
-
-            local_target = f"{self.module_name}.{func_name}"
-            if local_target in self.module_analyzer.functions:
-                return Resolution(local_target, exact=True, via="local")
-
-            # A locally instantiated class used as a callable? (rare) -> skip.
-            # Otherwise defer to a project-wide short-name lookup.
-            return Resolution(func_name, via="name")
+            return CallSite(caller, node.lineno, "name", node.func.id)
 
         # --- attribute call: obj.method() --------------------------------
         if isinstance(node.func, ast.Attribute):
@@ -229,78 +232,35 @@ class FunctionCallVisitor(ast.NodeVisitor):
 
             # super().method()
             if self._is_super_call(value) and self.current_class:
-                found = self._find_method_in_hierarchy(
-                    self.current_class, method_name, start_at_base=True
-                )
-                if found:
-                    return Resolution(found, exact=True, via="super", base=True)
-                return Resolution(None)
+                return CallSite(caller, node.lineno, "super", method_name, cls=self.current_class)
 
+            # self.method(), typed_var.method(), ClassName.method(), module.func()
             if isinstance(value, ast.Name):
                 obj_name = value.id
-
-                # self.method()
-                if obj_name == "self" and self.current_class:
-                    found = self._find_method_in_hierarchy(self.current_class, method_name)
-                    if found:
-                        base = not found.startswith(self.current_class + ".")
-                        return Resolution(found, exact=True, via="self", base=base)
-                    return Resolution(method_name, via="self-fallback")
-
-                # variable with a known class: obj.method()
-                if obj_name in self.class_instances:
-                    class_q = self._resolve_class_name(self.class_instances[obj_name])
-                    if class_q:
-                        found = self._find_method_in_hierarchy(class_q, method_name)
-                        if found:
-                            base = not found.startswith(class_q + ".")
-                            return Resolution(found, exact=True, via="typed-var", base=base)
-                    return Resolution(method_name, via="attr")
-
-                # ClassName.method()  (static/class methods, direct class ref)
-                class_q = self._resolve_class_name(obj_name)
-                if class_q:
-                    found = self._find_method_in_hierarchy(class_q, method_name)
-                    if found:
-                        base = not found.startswith(class_q + ".")
-                        return Resolution(found, exact=True, via="class", base=base)
-
-                # module.function()
-                if obj_name in self.module_analyzer.imports.import_map:
-                    module_path = self.module_analyzer.imports.import_map[obj_name]
-                    found = self._lookup_module_function(module_path, method_name)
-                    if found:
-                        return Resolution(found, exact=True, via="import")
-                    return Resolution(f"{module_path}.{method_name}", via="import", external=True)
-
-                if obj_name in self.context_managers:
-                    class_q = self._resolve_class_name(self.context_managers[obj_name])
-                    if class_q:
-                        found = self._find_method_in_hierarchy(class_q, method_name)
-                        if found:
-                            return Resolution(found, exact=True, via="context")
-                    return Resolution(method_name, via="attr")
-
-                # Unknown object type: eligible for a *unique-only* fallback.
-                return Resolution(method_name, via="attr")
+                return CallSite(
+                    caller,
+                    node.lineno,
+                    "attr",
+                    method_name,
+                    obj=obj_name,
+                    cls=self.current_class,
+                    typed=self.class_instances.get(obj_name),
+                    ctx=self.context_managers.get(obj_name),
+                )
 
             # nested attribute: pkg.mod.function()
             if isinstance(value, ast.Attribute):
                 parts = self._extract_attribute_chain(node.func)
                 if len(parts) >= 2:
-                    obj_path = ".".join(parts[:-1])
-                    found = self._lookup_module_function(obj_path, parts[-1])
-                    if found:
-                        return Resolution(found, exact=True, via="import")
-                    return Resolution(f"{obj_path}.{parts[-1]}", via="attr")
+                    return CallSite(
+                        caller, node.lineno, "chain", parts[-1], obj=".".join(parts[:-1])
+                    )
 
             # method call on a call result: get_client().fetch()
-            # The inner call is captured by generic_visit; the outer method's
-            # receiver type is unknown, so allow a unique-only fallback.
             if isinstance(value, ast.Call):
-                return Resolution(method_name, via="attr")
+                return CallSite(caller, node.lineno, "result", method_name)
 
-        return Resolution(None)
+        return None
 
     @staticmethod
     def _is_super_call(node: ast.AST) -> bool:
@@ -310,114 +270,23 @@ class FunctionCallVisitor(ast.NodeVisitor):
             and node.func.id == "super"
         )
 
-    def _lookup_module_function(self, module_path: str, func_name: str) -> Optional[str]:
-        """Find ``module_path.func_name`` among project modules, if present."""
-        for m_name, analyzer in self.all_modules.items():
-            if m_name == module_path or m_name.endswith("." + module_path):
-                target = f"{m_name}.{func_name}"
-                if target in analyzer.functions:
-                    return target
-        return None
-
-    def _lookup_class(self, class_q: str) -> Optional[Dict[str, Any]]:
-        for analyzer in self.all_modules.values():
-            info = analyzer.classes.get(class_q)
-            if info:
-                return info
-        return None
-
-    def _find_method_in_hierarchy(
-        self, class_q: str, method_name: str, start_at_base: bool = False
-    ) -> Optional[str]:
-        """Resolve ``method_name`` on ``class_q`` through its MRO.
-
-        Returns the qualified target if found (in the class or any resolvable
-        ancestor), else ``None``. When ``start_at_base`` is set the class
-        itself is skipped (used for ``super()``).
-        """
-        visited: Set[str] = set()
-        queue: List[str] = []
-        if start_at_base:
-            info = self._lookup_class(class_q)
-            if info:
-                for b in info.get("bases", []):
-                    bq = self._resolve_class_name(b)
-                    if bq:
-                        queue.append(bq)
-        else:
-            queue.append(class_q)
-
-        while queue:
-            cq = queue.pop(0)
-            if cq in visited:
-                continue
-            visited.add(cq)
-            info = self._lookup_class(cq)
-            if not info:
-                continue
-            if method_name in info["methods"]:
-                return f"{cq}.{method_name}"
-            for b in info.get("bases", []):
-                bq = self._resolve_class_name(b)
-                if bq and bq not in visited:
-                    queue.append(bq)
-        return None
-
-    def _resolve_class_name(self, class_name: str) -> Optional[str]:
-        if class_name in self._class_cache:
-            return self._class_cache[class_name]
-
-        result: Optional[str] = None
-        for analyzer in self.all_modules.values():
-            if class_name in analyzer.classes:
-                result = class_name
-                break
-        if result is None and class_name in self.module_analyzer.imports.import_map:
-            imported = self.module_analyzer.imports.import_map[class_name]
-            # Only accept if it names a known project class.
-            for analyzer in self.all_modules.values():
-                if imported in analyzer.classes:
-                    result = imported
-                    break
-                # Try short-name match at tail.
-                for cq in analyzer.classes:
-                    if cq.endswith("." + imported.split(".")[-1]):
-                        result = cq
-                        break
-                if result:
-                    break
-        if result is None:
-            local_class = f"{self.module_name}.{class_name}"
-            if local_class in self.module_analyzer.classes:
-                result = local_class
-        if result is None:
-            # Match by bare class short-name across the project (last resort).
-            short = class_name.split(".")[-1]
-            for analyzer in self.all_modules.values():
-                for cq, cinfo in analyzer.classes.items():
-                    if cinfo["name"] == short:
-                        result = cq
-                        break
-                if result:
-                    break
-
-        self._class_cache[class_name] = result
-        return result
-
     def _extract_call_target(self, call_node: ast.Call) -> Optional[str]:
         if isinstance(call_node.func, ast.Name):
-            target_name = call_node.func.id
-            if target_name in self.module_analyzer.imports.import_map:
-                return self.module_analyzer.imports.import_map[target_name]
-            local_class = f"{self.module_name}.{target_name}"
-            if local_class in self.module_analyzer.classes:
-                return local_class
-            return target_name
+            return self._name_call_target(call_node.func.id)
         if isinstance(call_node.func, ast.Attribute):
             parts = self._extract_attribute_chain(call_node.func)
             return ".".join(parts) if parts else None
         return None
 
+    def _name_call_target(self, target_name: str) -> str:
+        """What a bare ``target_name(...)`` call constructs, for variable typing."""
+        if target_name in self.module_analyzer.imports.import_map:
+            return self.module_analyzer.imports.import_map[target_name]
+        local_class = f"{self.module_name}.{target_name}"
+        if local_class in self.module_analyzer.classes:
+            return local_class
+        return target_name
+
     def _extract_attribute_chain(self, node: ast.AST) -> List[str]:
         if isinstance(node, ast.Name):
             return [node.id]
@@ -440,6 +309,150 @@ class FunctionCallVisitor(ast.NodeVisitor):
         return None
 
 
+class CallResolver:
+    """Resolve one module's :class:`CallSite` records against the project.
+
+    Pure data in, pure data out: needs only the project's
+    :class:`SymbolIndex` (and this module's own symbols), never an AST, so it
+    runs equally well in a worker process. Share one index across every
+    module's resolver; building it is the only per-project cost.
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        index: SymbolIndex,
+        module: Optional[ModuleSymbols] = None,
+    ):
+        self.module_name = module_name
+        self.index = index
+        self.module = module if module is not None else index.table.modules[module_name]
+
+    def resolve_sites(self, sites: List[CallSite]) -> List[ResolvedCall]:
+        """Resolve ``sites`` in order, keeping only in-project candidates."""
+        calls: List[ResolvedCall] = []
+        for site in sites:
+            res = self.resolve(site)
+            if res.target and not res.external:
+                calls.append(ResolvedCall(site.caller, site.lineno, res))
+        return calls
+
+    def resolve(self, site: CallSite) -> Resolution:
+        import_map = self.module.import_map
+
+        # --- bare name: func_name() --------------------------------------
+        if site.kind == "name":
+            func_name = site.name
+
+            if func_name in import_map:
+                imported_path = import_map[func_name]
+                if "." in imported_path:
+                    module_path, short = imported_path.rsplit(".", 1)
+                    found = self._lookup_module_function(module_path, short)
+                    if found:
+                        return Resolution(found, exact=True, via="import")
+                    # Import resolves outside the project: no edge.
+                    return Resolution(imported_path, via="import", external=True)
+                return Resolution(imported_path, via="import", external=True)
+
+            local_target = f"{self.module_name}.{func_name}"
+            if local_target in self.module.functions:
+                return Resolution(local_target, exact=True, via="local")
+
+            # A locally instantiated class used as a callable? (rare) -> skip.
+            # Otherwise defer to a project-wide short-name lookup.
+            return Resolution(func_name, via="name")
+
+        method_name = site.name
+
+        # super().method()
+        if site.kind == "super":
+            found = self._find_method_in_hierarchy(site.cls or "", method_name, start_at_base=True)
+            if found:
+                return Resolution(found, exact=True, via="super", base=True)
+            return Resolution(None)
+
+        if site.kind == "attr":
+            obj_name = site.obj or ""
+            current_class = site.cls
+
+            # self.method()
+            if obj_name == "self" and current_class:
+                found = self._find_method_in_hierarchy(current_class, method_name)
+                if found:
+                    base = not found.startswith(current_class + ".")
+                    return Resolution(found, exact=True, via="self", base=base)
+                return Resolution(method_name, via="self-fallback")
+
+            # variable with a known class: obj.method()
+            if site.typed is not None:
+                class_q = self._resolve_class_name(site.typed)
+                if class_q:
+                    found = self._find_method_in_hierarchy(class_q, method_name)
+                    if found:
+                        base = not found.startswith(class_q + ".")
+                        return Resolution(found, exact=True, via="typed-var", base=base)
+                return Resolution(method_name, via="attr")
+
+            # ClassName.method()  (static/class methods, direct class ref)
+            class_q = self._resolve_class_name(obj_name)
+            if class_q:
+                found = self._find_method_in_hierarchy(class_q, method_name)
+                if found:
+                    base = not found.startswith(class_q + ".")
+                    return Resolution(found, exact=True, via="class", base=base)
+
+            # module.function()
+            if obj_name in import_map:
+                module_path = import_map[obj_name]
+                found = self._lookup_module_function(module_path, method_name)
+                if found:
+                    return Resolution(found, exact=True, via="import")
+                return Resolution(f"{module_path}.{method_name}", via="import", external=True)
+
+            if site.ctx is not None:
+                class_q = self._resolve_class_name(site.ctx)
+                if class_q:
+                    found = self._find_method_in_hierarchy(class_q, method_name)
+                    if found:
+                        return Resolution(found, exact=True, via="context")
+                return Resolution(method_name, via="attr")
+
+            # Unknown object type: eligible for a *unique-only* fallback.
+            return Resolution(method_name, via="attr")
+
+        # nested attribute: pkg.mod.function()
+        if site.kind == "chain":
+            obj_path = site.obj or ""
+            found = self._lookup_module_function(obj_path, method_name)
+            if found:
+                return Resolution(found, exact=True, via="import")
+            return Resolution(f"{obj_path}.{method_name}", via="attr")
+
+        # method call on a call result: get_client().fetch()
+        # The inner call is its own site; the outer method's receiver type is
+        # unknown, so allow a unique-only fallback.
+        if site.kind == "result":
+            return Resolution(method_name, via="attr")
+
+        return Resolution(None)
+
+    def _lookup_module_function(self, module_path: str, func_name: str) -> Optional[str]:
+        """Find ``module_path.func_name`` among project modules, if present."""
+        return self.index.module_function(module_path, func_name)
+
+    def _lookup_class(self, class_q: str) -> Optional[ClassSymbol]:
+        return self.index.classes.get(class_q)
+
+    def _find_method_in_hierarchy(
+        self, class_q: str, method_name: str, start_at_base: bool = False
+    ) -> Optional[str]:
+        return self.index.find_method(class_q, method_name, start_at_base)
+
+    def _resolve_class_name(self, class_name: str) -> Optional[str]:
+        return self.index.resolve_class(self.module_name, class_name, self.module)
+
+
 def _short_name(qualified: str) -> str:
     return qualified.split(".")[-1]
 
@@ -473,49 +486,86 @@ def _disambiguate(caller: str, matches: List[str]) -> List[str]:
 
 
 def build_call_graph(
-    module_analyzers: Dict[str, ModuleAnalyzer], all_calls: List[Dict[str, Any]]
-) -> nx.DiGraph:
-    """Build a directed call graph with confidence-tagged, sourced edges."""
-    G = nx.DiGraph()
-
+    module_analyzers: Dict[str, ModuleAnalyzer],
+    all_calls: List[ResolvedCall],
+    *,
+    frozen: bool = False,
+) -> Union[nx.DiGraph, CSRGraph]:
+    """Build a directed call graph with confidence-tagged, sourced edges.
+
+    With ``frozen`` the graph is emitted directly as a :class:`CSRGraph`
+    (same nodes, edges, attributes and order) without ever materializing
+    the networkx representation.
+    """
     # Nodes (added in deterministic order).
+    nodes: Dict[str, Dict[str, Any]] = {}
     for module_name in sorted(module_analyzers):
         analyzer = module_analyzers[module_name]
         for func_name in sorted(analyzer.functions):
-            func_info = analyzer.functions[func_name]
-            G.add_node(
-                func_name,
-                **{
-                    "name": func_info["name"],
-                    "module": module_name,
-                    "class": func_info.get("class"),
-                    "lineno": func_info.get("lineno", 0),
-                    "end_lineno": func_info.get("end_lineno"),
-                    "path": analyzer.file_path,
-                    "is_async": func_info.get("is_async", False),
-                    "is_property": func_info.get("is_property", False),
-                    "is_static": func_info.get("is_static", False),
-                    "is_classmethod": func_info.get("is_classmethod", False),
-                    "is_method": func_info.get("is_method", False),
-                    "is_nested": func_info.get("is_nested", False),
-                    "decorators": func_info.get("decorators", []),
-                    "decorator_names": func_info.get("decorator_names", []),
-                    "args": func_info.get("args", []),
-                },
-            )
-
-    # Short-name lookup for project-wide fallback resolution.
-    function_lookup: Dict[str, List[str]] = {}
-    for func_name in G.nodes:
-        function_lookup.setdefault(_short_name(func_name), []).append(func_name)
-    for key in function_lookup:
-        function_lookup[key].sort()
-
-    # File lookup for edge provenance.
-    node_file = {n: G.nodes[n].get("path", "") for n in G.nodes}
+            nodes[func_name] = node_attributes(analyzer, analyzer.functions[func_name])
 
     # Deterministic edge processing: aggregate then emit sorted.
-    edges: Dict[tuple, Dict[str, Any]] = {}
+    edges = aggregate_edges(nodes, function_lookup(nodes), all_calls)
+    if frozen:
+        return CSRGraph.from_edges(
+            nodes.items(), ((c, t, edges[(c, t)]) for c, t in sorted(edges)), mark_cycles=True
+        )
+
+    G = nx.DiGraph()
+    for func_name, attrs in nodes.items():
+        G.add_node(func_name, **attrs)
+    for caller, callee in sorted(edges):
+        data = edges[(caller, callee)]
+        G.add_edge(caller, callee, **data)
+
+    _mark_cycles(G)
+    return G
+
+
+def node_attributes(analyzer: ModuleAnalyzer, func_info: FunctionInfo) -> Dict[str, Any]:
+    """The attributes of ``func_info``'s graph node, in their canonical order."""
+    return {
+        "name": func_info.name,
+        "module": analyzer.module_name,
+        "class": func_info.cls,
+        "lineno": func_info.lineno,
+        "end_lineno": func_info.end_lineno,
+        "path": analyzer.file_path,
+        "is_async": func_info.is_async,
+        "is_property": func_info.is_property,
+        "is_static": func_info.is_static,
+        "is_classmethod": func_info.is_classmethod,
+        "is_method": func_info.is_method,
+        "is_nested": func_info.is_nested,
+        "decorators": func_info.decorators,
+        "decorator_names": func_info.decorator_names,
+        "args": func_info.args,
+    }
+
+
+def function_lookup(nodes: Iterable[str]) -> Dict[str, List[str]]:
+    """Short name -> sorted qualified names, for project-wide fallback resolution."""
+    lookup: Dict[str, List[str]] = {}
+    for func_name in nodes:
+        lookup.setdefault(_short_name(func_name), []).append(func_name)
+    for key in lookup:
+        lookup[key].sort()
+    return lookup
+
+
+def aggregate_edges(
+    nodes: Mapping[str, Mapping[str, Any]],
+    lookup: Dict[str, List[str]],
+    calls: Iterable[ResolvedCall],
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Turn resolved calls into one attribute dict per ``(caller, callee)`` edge.
+
+    ``nodes`` maps every function to its node attributes (``G.nodes`` will
+    do); ``lookup`` is :func:`function_lookup` over them. When several calls
+    map to the same edge, the highest-confidence explanation wins and the
+    earliest line is kept.
+    """
+    edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
     def _consider(
         caller: str,
@@ -533,28 +583,23 @@ def build_call_graph(
                 "confidence": confidence,
                 "via": via,
                 "candidates": candidates or [],
-                "file": node_file.get(caller, ""),
+                "file": nodes[caller].get("path", ""),
             }
         else:
             # Prefer the highest-confidence explanation; keep earliest line.
-            from pyvisualizer.core.model import CONFIDENCE_ORDER
-
             if CONFIDENCE_ORDER[confidence] < CONFIDENCE_ORDER[existing["confidence"]]:
                 existing["confidence"] = confidence
                 existing["via"] = via
                 existing["candidates"] = candidates or []
             existing["lineno"] = min(existing["lineno"], lineno)
 
-    for call in all_calls:
-        caller = call["caller"]
-        res: Resolution = call["res"]
-        lineno = call["lineno"]
+    for caller, lineno, res in calls:
         target = res.target
-        if caller not in G or target is None:
+        if caller not in nodes or target is None:
             continue
 
         # Exact hit on a known node.
-        if res.exact and target in G:
+        if res.exact and target in nodes:
             conf = CONFIDENCE_INHERITED if res.base else CONFIDENCE_RESOLVED
             _consider(caller, target, lineno, conf, res.via)
             continue
@@ -562,7 +607,7 @@ def build_call_graph(
         # Fallback-eligible: resolve by project-wide short name.
         if res.via in _FALLBACK_VIA:
             short = _short_name(target)
-            matches = function_lookup.get(short, [])
+            matches = lookup.get(short, [])
             if not matches:
                 continue  # external / builtin -> no invented edge
             narrowed = _disambiguate(caller, matches)
@@ -582,22 +627,19 @@ def build_call_graph(
 
         # exact target that isn't a project node, or external -> no edge.
 
-    for caller, callee in sorted(edges):
-        data = edges[(caller, callee)]
-        G.add_edge(caller, callee, **data)
-
-    _mark_cycles(G)
-    return G
+    return edges
 
 
 def _mark_cycles(G: nx.DiGraph) -> None:
-    """Flag edges that participate in a dependency cycle (deterministically)."""
-    try:
-        for cycle in nx.simple_cycles(G):
-            for i in range(len(cycle)):
-                source = cycle[i]
-                target = cycle[(i + 1) % len(cycle)]
-                if G.has_edge(source, target):
-                    G.edges[source, target]["is_cycle"] = True
-    except Exception as e:  # pragma: no cover - defensive
-        logger.warning(f"Could not detect cycles: {e}")
+    """Flag edges that participate in a dependency cycle (deterministically).
+
+    An edge is on a cycle iff it is a self-loop or both of its ends are in
+    the same strongly connected component, so this is linear in the graph.
+    Anything already computed about ``G`` is dropped first: it is called
+    after the graph has been (re)wired.
+    """
+    invalidate(G)
+    members = graph_analysis(G).component_map
+    for source, target, data in G.edges(data=True):
+        if source == target or members.get(source, -1) == members.get(target, -2):
+            data["is_cycle"] = True
@@ -0,0 +1,273 @@
+"""
+Memoized structural analysis shared by everything that reads one graph.
+
+A single command typically asks the same graph the same questions several
+times: cycle marking, the health report, the cycle gate, the AI export and
+the context pack each want the strongly connected components, the cycles,
+the degrees or the entry points. :func:`graph_analysis` hands every caller
+the same :class:`GraphAnalysis` for a graph, which computes each answer on
+first use and keeps it until the graph changes.
+"""
+
+from __future__ import annotations
+
+import re
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, cast
+
+import networkx as nx
+
+from pyvisualizer.core import csr
+from pyvisualizer.core.csr import CSRGraph, GraphLike, condensation, strongly_connected_components
+from pyvisualizer.core.cycles import (
+    DEFAULT_MAX_CYCLE_LENGTH,
+    DEFAULT_MAX_CYCLES,
+    cycle_rank,
+    find_simple_cycles,
+)
+from pyvisualizer.core.model import CONFIDENCE_AMBIGUOUS
+from pyvisualizer.core.node_index import NodeIndex
+from pyvisualizer.core.pagerank import PageRankGraph
+from pyvisualizer.core.reachability import DEFAULT_MAX_BYTES, ReachabilityIndex
+
+_T = TypeVar("_T")
+
+#: Reachability queries per graph version before the index is built.
+_INDEX_AFTER_QUERIES = 3
+
+# Key under which an analysis marks the graph's ``__networkx_cache__``.
+_CACHE_KEY = "pyvisualizer.graph_analysis"
+
+# Decorators that mark framework-registered entry points (called externally).
+_ENTRY_DECORATOR = re.compile(
+    r"(route|get|post|put|patch|delete|task|command|cli|fixture|"
+    r"app\.|router\.|celery|click|api\.|websocket|on_event|handler|listener)",
+    re.IGNORECASE,
+)
+_ENTRY_NAMES = {"main", "__main__", "run", "cli"}
+
+
+def is_entry_point(node: str, data: Dict) -> bool:
+    """Whether ``node`` is plausibly called from outside the analyzed code."""
+    name = data.get("name", node.split(".")[-1])
+    if name in _ENTRY_NAMES:
+        return True
+    if name.startswith("__") and name.endswith("__"):
+        return True  # dunders are called implicitly
+    for dec in data.get("decorator_names", []) or data.get("decorators", []):
+        dec_name = dec if isinstance(dec, str) else dec.get("name", "")
+        if _ENTRY_DECORATOR.search(dec_name or ""):
+            return True
+    return False
+
+
+class GraphAnalysis:
+    """Lazily computed, memoized facts about one graph's structure.
+
+    Every answer is computed on first access and kept until the graph
+    changes. Adding or removing nodes or edges through networkx is noticed
+    in constant time on every access: networkx empties the graph's
+    ``__networkx_cache__`` on each such edit, and the analysis keeps a
+    token there (before networkx 3.3, which has no such cache, it compares
+    node and edge counts instead). A :class:`~pyvisualizer.core.csr.CSRGraph`
+    never changes and is not checked. Code that edits node or edge
+    attributes in place must call :meth:`invalidate` (or the module-level
+    :func:`invalidate`). The graph is only referenced weakly, so an
+    analysis never outlives it.
+    """
+
+    def __init__(self, graph: GraphLike, *, reach_max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        # Weak, so that the shared registry never keeps a graph alive.
+        self._graph = weakref.ref(graph)
+        #: Memory ceiling for :attr:`reachability`; over it, queries search instead.
+        self.reach_max_bytes = reach_max_bytes
+        self._memo: Dict[Any, Any] = {}
+        self._token = object()
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    @property
+    def graph(self) -> GraphLike:
+        """The analyzed graph."""
+        graph = self._graph()
+        if graph is None:
+            raise ReferenceError("the analyzed graph no longer exists")
+        return graph
+
+    def invalidate(self) -> None:
+        """Forget everything computed so far."""
+        self._memo.clear()
+        self._stamp = None
+
+    def _check(self) -> None:
+        """Forget everything if the graph's nodes or edges changed since last asked."""
+        graph = self.graph
+        if isinstance(graph, CSRGraph):
+            return
+        cache = getattr(graph, "__networkx_cache__", None)
+        if cache is None:
+            stamp = (len(graph), graph.number_of_edges())
+            if stamp != self._stamp:
+                self._memo.clear()
+                self._stamp = stamp
+        elif cache.get(_CACHE_KEY) is not self._token:
+            self._memo.clear()
+            cache[_CACHE_KEY] = self._token
+
+    def _cached(self, key: Any, compute: Callable[[], _T]) -> _T:
+        self._check()
+        try:
+            return cast(_T, self._memo[key])
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+    @property
+    def sccs(self) -> List[Set[str]]:
+        """Every strongly connected component, in discovery order."""
+        return self._cached("sccs", lambda: list(strongly_connected_components(self.graph)))
+
+    @property
+    def cyclic_components(self) -> List[List[str]]:
+        """Components of two or more nodes, each sorted, ordered by smallest node."""
+
+        def compute() -> List[List[str]]:
+            components = [sorted(c) for c in self.sccs if len(c) > 1]
+            components.sort(key=lambda c: c[0])
+            return components
+
+        return self._cached("cyclic_components", compute)
+
+    @property
+    def component_map(self) -> Dict[str, int]:
+        """Node -> index into :attr:`cyclic_components`, for nodes on a cycle."""
+        return self._cached(
+            "component_map",
+            lambda: {n: i for i, c in enumerate(self.cyclic_components) for n in c},
+        )
+
+    @property
+    def cycle_rank(self) -> int:
+        """Independent cycles (see :func:`pyvisualizer.core.cycles.cycle_rank`)."""
+        return self._cached("cycle_rank", lambda: cycle_rank(self.graph, self.cyclic_components))
+
+    def cycles(
+        self,
+        *,
+        ignore_ambiguous: bool = False,
+        max_length: Optional[int] = DEFAULT_MAX_CYCLE_LENGTH,
+        max_cycles: Optional[int] = DEFAULT_MAX_CYCLES,
+    ) -> List[List[str]]:
+        """Bounded elementary cycles (see :func:`~pyvisualizer.core.cycles.find_simple_cycles`).
+
+        With ``ignore_ambiguous``, only cycles that hold without any
+        ``ambiguous`` edge. Callers must not mutate the returned lists.
+        """
+
+        def compute() -> List[List[str]]:
+            if not ignore_ambiguous:
+                return find_simple_cycles(
+                    self.graph,
+                    max_length=max_length,
+                    max_cycles=max_cycles,
+                    components=self.cyclic_components,
+                )
+            source = nx.DiGraph()
+            source.add_nodes_from(self.graph.nodes())
+            source.add_edges_from(
+                (s, t)
+                for s, t, d in self.graph.edges(data=True)
+                if d.get("confidence") != CONFIDENCE_AMBIGUOUS
+            )
+            return find_simple_cycles(source, max_length=max_length, max_cycles=max_cycles)
+
+        return self._cached(("cycles", ignore_ambiguous, max_length, max_cycles), compute)
+
+    @property
+    def condensation(self) -> nx.DiGraph:
+        """The DAG of strongly connected components (``networkx.condensation``)."""
+        return self._cached("condensation", lambda: condensation(self.graph, self.sccs))
+
+    @property
+    def reachability(self) -> Optional[ReachabilityIndex]:
+        """The reachability index (built on first access); ``None`` over the memory ceiling."""
+        return self._cached(
+            "reachability",
+            lambda: ReachabilityIndex.build(self.graph, self.sccs, max_bytes=self.reach_max_bytes),
+        )
+
+    def ancestors(self, node: str) -> Set[str]:
+        """Transitive callers of ``node`` (:func:`networkx.ancestors`)."""
+        index = self._reach_index()
+        return index.ancestors(node) if index is not None else csr.ancestors(self.graph, node)
+
+    def descendants(self, node: str) -> Set[str]:
+        """Transitive callees of ``node`` (:func:`networkx.descendants`)."""
+        index = self._reach_index()
+        return index.descendants(node) if index is not None else csr.descendants(self.graph, node)
+
+    def blast_radius(self, node: str) -> int:
+        """How many functions transitively call ``node``; ``len(self.ancestors(node))``."""
+        index = self._reach_index()
+        return index.count_ancestors(node) if index is not None else len(self.ancestors(node))
+
+    def _reach_index(self) -> Optional[ReachabilityIndex]:
+        """The index once this graph version has been queried often enough to pay for it.
+
+        A one-off query (the ``impact`` command asks for one node's callers
+        and callees) is cheaper as two searches than as an index build; a
+        long-lived graph answering many (the MCP server, ``review`` over many
+        changed functions) builds the index on its third query.
+        """
+        queries = self._cached("reach_queries", lambda: [0])
+        queries[0] += 1
+        if queries[0] < _INDEX_AFTER_QUERIES and "reachability" not in self._memo:
+            return None
+        return self.reachability
+
+    @property
+    def node_index(self) -> NodeIndex:
+        """Name and file-path lookups over the nodes (see :class:`NodeIndex`)."""
+        return self._cached("node_index", lambda: NodeIndex(self.graph))
+
+    def pagerank_graph(self, bidirectional: bool = True) -> PageRankGraph:
+        """The walk structure personalized PageRank iterates over."""
+        return self._cached(
+            ("pagerank_graph", bidirectional),
+            lambda: PageRankGraph(self.graph, bidirectional=bidirectional),
+        )
+
+    @property
+    def in_degree(self) -> Dict[str, int]:
+        """Node -> number of callers."""
+        return self._cached("in_degree", lambda: dict(self.graph.in_degree()))
+
+    @property
+    def out_degree(self) -> Dict[str, int]:
+        """Node -> number of callees."""
+        return self._cached("out_degree", lambda: dict(self.graph.out_degree()))
+
+    @property
+    def entry_points(self) -> List[str]:
+        """Plausible entry points (see :func:`is_entry_point`), in node order."""
+        return self._cached(
+            "entry_points",
+            lambda: [n for n, data in self.graph.nodes(data=True) if is_entry_point(n, data)],
+        )
+
+
+_ANALYSES: "weakref.WeakKeyDictionary[nx.DiGraph, GraphAnalysis]" = weakref.WeakKeyDictionary()
+
+
+def graph_analysis(G: nx.DiGraph) -> GraphAnalysis:
+    """The shared :class:`GraphAnalysis` for ``G`` (created on first use)."""
+    analysis = _ANALYSES.get(G)
+    if analysis is None:
+        analysis = _ANALYSES[G] = GraphAnalysis(G)
+    return analysis
+
+
+def invalidate(G: nx.DiGraph) -> None:
+    """Drop whatever has been computed about ``G``; call after editing it in place."""
+    analysis = _ANALYSES.get(G)
+    if analysis is not None:
+        analysis.invalidate()
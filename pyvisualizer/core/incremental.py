@@ -0,0 +1,466 @@
+"""
+In-place updates of a built call graph.
+
+A long-lived process (the MCP server, an editor integration) needs the graph
+again after every save, yet a save usually touches one file. :class:`GraphState`
+keeps what a full build computed -- the analyzers (without their ASTs), the
+symbol table and index, and every caller's resolved calls -- so that
+:meth:`GraphState.update` can take just the re-analyzed modules, re-resolve
+only the callers whose lookups could have changed, and patch the
+:class:`networkx.DiGraph` in place.
+
+The patched graph is indistinguishable from a fresh build: same nodes, edges
+and attributes, in the same insertion order.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+import networkx as nx
+
+from pyvisualizer.core.analyzer import CallSite, ModuleAnalyzer
+from pyvisualizer.core.graph import (
+    CallResolver,
+    ResolvedCall,
+    _short_name,
+    aggregate_edges,
+    function_lookup,
+    node_attributes,
+)
+from pyvisualizer.core.graph_analysis import invalidate
+from pyvisualizer.core.symbols import ModuleSymbols, SymbolIndex, SymbolTable
+
+logger = logging.getLogger("pyvisualizer.incremental")
+
+Edge = Tuple[str, str]
+CallerCalls = Dict[str, List[ResolvedCall]]  # caller -> its resolved calls, in site order
+
+
+def _by_caller(calls: Iterable[ResolvedCall]) -> CallerCalls:
+    grouped: CallerCalls = {}
+    for call in calls:
+        grouped.setdefault(call.caller, []).append(call)
+    return grouped
+
+
+def _hierarchy(symbols: ModuleSymbols) -> Tuple[object, object]:
+    """What of a module feeds the class hierarchy: its classes, and the
+    imports their bases are resolved through (if it defines any)."""
+    return symbols.classes, symbols.import_map if symbols.classes else None
+
+
+def _lookup_keys(site: CallSite, import_map: Mapping[str, str]) -> Set[str]:
+    """Every name whose definitions can decide how ``site`` resolves.
+
+    A site only ever lands on a function with the short name it calls (or,
+    through an aliased import, the imported name's tail), and only ever
+    resolves a class whose short name is the tail of a receiver expression
+    (or of what that is imported as) -- or, for ``self.`` and ``super()``,
+    its enclosing class.
+    """
+    keys = {site.name}
+    if site.name in import_map:
+        keys.add(_short_name(import_map[site.name]))
+    if site.cls:
+        keys.add(site.cls)
+    for expr in (site.obj, site.typed, site.ctx):
+        if expr:
+            keys.add(_short_name(expr))
+            if expr in import_map:
+                keys.add(_short_name(import_map[expr]))
+    return keys
+
+
+class GraphState:
+    """A built call graph plus what is needed to update it in place.
+
+    ``analyzers`` must not hold ASTs (see :meth:`ModuleAnalyzer.release_ast`)
+    and are kept in project order; ``calls`` holds each module's resolved
+    calls. ``reusable`` is false for the rare projects an update cannot
+    reproduce exactly (a qualified name defined by two modules, or calls
+    attributed to another module's function); :meth:`update` then refuses
+    and the caller rebuilds from scratch.
+    """
+
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        analyzers: Mapping[str, ModuleAnalyzer],
+        symbols: SymbolTable,
+        calls: Mapping[str, List[ResolvedCall]],
+        index: Optional[SymbolIndex] = None,
+    ) -> None:
+        self.graph = graph
+        self.analyzers: Dict[str, ModuleAnalyzer] = dict(analyzers)
+        self.symbols = symbols
+        self.calls: Dict[str, CallerCalls] = {m: _by_caller(c) for m, c in calls.items()}
+        self.index = index if index is not None else SymbolIndex(symbols)
+        self.function_lookup = function_lookup(graph.nodes)
+        #: Caller -> the module whose calls it makes.
+        self.caller_modules = {c: m for m, callers in self.calls.items() for c in callers}
+        self.reusable = self._is_reusable()
+        # Lookup key -> module -> callers with a site that depends on it;
+        # built on the first update that changes any definition.
+        self._callers_by_key: Optional[Dict[str, Dict[str, Set[str]]]] = None
+        self._module_keys: Dict[str, FrozenSet[str]] = {}
+        # Node -> the strongly connected component it belongs to, for every
+        # node on a cycle of two or more functions.
+        self._components: Dict[str, FrozenSet[str]] = {}
+        if self.reusable:
+            self._assign_components(nx.strongly_connected_components(graph))
+
+    def _is_reusable(self) -> bool:
+        G = self.graph
+        if sum(len(a.functions) for a in self.analyzers.values()) != G.number_of_nodes():
+            return False
+        nodes = G.nodes
+        return all(
+            caller not in G or nodes[caller]["module"] == module_name
+            for caller, module_name in self.caller_modules.items()
+        )
+
+    def _assign_components(self, components: Iterable[Set[str]]) -> None:
+        for component in components:
+            if len(component) > 1:
+                frozen = frozenset(component)
+                for node in frozen:
+                    self._components[node] = frozen
+
+    def update(self, modules: Mapping[str, Optional[ModuleAnalyzer]]) -> bool:
+        """Apply re-analyzed modules to the graph, in place.
+
+        ``modules`` maps each changed, added or deleted module to its fresh
+        analyzer (without an AST), or to ``None`` if it no longer exists.
+        Returns ``False`` -- leaving the state untouched -- when the update
+        cannot be done exactly; the caller should then rebuild.
+        """
+        if not self.reusable:
+            return False
+        G = self.graph
+        old_symbols = self.symbols.modules
+        fresh = {m: a for m, a in modules.items() if a is not None}
+        new_symbols = {m: ModuleSymbols.from_analyzer(a) for m, a in fresh.items()}
+        added = [m for m in fresh if m not in self.analyzers]
+        removed = [m for m in modules if m not in fresh and m in self.analyzers]
+
+        # Every qualified name must keep a single owning module, and no
+        # other module's calls may be attributed to it.
+        owners: Dict[str, str] = {}
+        for module_name in new_symbols:
+            for func in new_symbols[module_name].functions:
+                if func in owners:
+                    return False
+                owners[func] = module_name
+                if func in G and G.nodes[func]["module"] not in modules:
+                    return False
+                if self.caller_modules.get(func, module_name) not in (module_name, *modules):
+                    return False
+
+        # Project order is sorted file order; it only moves when modules come or go.
+        if added or removed:
+            merged = {m: a for m, a in self.analyzers.items() if m not in modules}
+            merged.update(fresh)
+            analyzers = {
+                m: merged[m] for _, m in sorted((a.file_path, m) for m, a in merged.items())
+            }
+        else:
+            analyzers = dict(self.analyzers)
+            analyzers.update(fresh)
+
+        symbols, index = self.symbols, self.index
+        dirty: Dict[str, Set[str]] = {}  # module -> callers to re-resolve
+        if added or removed or any(new_symbols[m] != old_symbols[m] for m in new_symbols):
+            symbols = SymbolTable({m: new_symbols.get(m) or old_symbols[m] for m in analyzers})
+            if (
+                added
+                or removed
+                or any(
+                    _hierarchy(new_symbols[m]) != _hierarchy(old_symbols[m]) for m in new_symbols
+                )
+            ):
+                index = SymbolIndex(symbols)
+            else:
+                index = index.rebind(symbols, new_symbols)
+            dirty = self._dependent_callers(self._changed_keys(index, new_symbols, modules))
+        # Otherwise definitions and imports are the same everywhere: only the
+        # edited modules' own calls can have changed, and every memoized
+        # lookup in the index still holds.
+
+        # Callers of functions that disappear lose their edges with them.
+        vanished: Set[str] = set()
+        for module_name in modules:
+            if module_name in self.analyzers:
+                keep = new_symbols[module_name].functions if module_name in new_symbols else ()
+                vanished.update(f for f in self.analyzers[module_name].functions if f not in keep)
+        for func in vanished:
+            for caller in G.pred[func]:
+                dirty.setdefault(G.nodes[caller]["module"], set()).add(caller)
+
+        # Re-resolve: every site of an edited module, and the dependent
+        # callers' sites elsewhere.
+        calls: Dict[str, CallerCalls] = {}
+        rederive: Dict[str, Set[str]] = {}  # module -> callers whose edges change
+        for module_name in sorted(new_symbols):
+            resolver = CallResolver(module_name, index, new_symbols[module_name])
+            calls[module_name] = _by_caller(resolver.resolve_sites(fresh[module_name].call_sites))
+            rederive[module_name] = set(fresh[module_name].functions).union(calls[module_name])
+        for module_name in sorted(dirty):
+            if module_name in modules or module_name not in analyzers:
+                continue
+            callers = dirty[module_name]
+            sites = [s for s in analyzers[module_name].call_sites if s.caller in callers]
+            resolver = CallResolver(module_name, index, symbols.modules[module_name])
+            updated = {c: v for c, v in self.calls[module_name].items() if c not in callers}
+            updated.update(_by_caller(resolver.resolve_sites(sites)))
+            calls[module_name] = updated
+            rederive[module_name] = callers
+        for module_name, module_calls in calls.items():
+            for caller in module_calls:
+                owner = owners.get(caller)
+                if owner is None and caller in G and caller not in vanished:
+                    owner = G.nodes[caller]["module"]
+                if owner is not None and owner != module_name:
+                    return False
+
+        # Nothing below can fail: patch the graph.
+        touched: Set[str] = set()  # endpoints of edges that appeared or disappeared
+        for func in vanished:
+            touched.update(G.succ[func])
+            touched.update(G.pred[func])
+            touched.add(func)
+            lookup = self.function_lookup[_short_name(func)]
+            lookup.remove(func)
+            if not lookup:
+                del self.function_lookup[_short_name(func)]
+            G.remove_node(func)
+
+        new_nodes: List[str] = []
+        for module_name in sorted(new_symbols):
+            analyzer = analyzers[module_name]
+            for func in sorted(analyzer.functions):
+                attrs = node_attributes(analyzer, analyzer.functions[func])
+                if func in G:
+                    data = G.nodes[func]
+                    data.clear()
+                    data.update(attrs)
+                else:
+                    G.add_node(func, **attrs)
+                    bisect.insort(self.function_lookup.setdefault(_short_name(func), []), func)
+                    new_nodes.append(func)
+
+        old_flags: Dict[Edge, bool] = {}
+        resolved: List[ResolvedCall] = []
+        for module_name, callers in rederive.items():
+            for caller in callers:
+                resolved.extend(calls[module_name].get(caller, ()))
+                if caller in G:
+                    for callee, data in list(G.succ[caller].items()):
+                        old_flags[(caller, callee)] = bool(data.get("is_cycle"))
+                        G.remove_edge(caller, callee)
+        edges = aggregate_edges(G.nodes, self.function_lookup, resolved)
+
+        resort: Set[str] = set()
+        for caller, callee in sorted(edges):
+            G.add_edge(caller, callee, **edges[(caller, callee)])
+            resort.add(callee)
+            if (caller, callee) not in old_flags:
+                touched.update((caller, callee))
+        for edge in old_flags:
+            if edge not in edges:
+                touched.update(edge)
+
+        if new_nodes:
+            _restore_node_order(G, new_nodes)
+        for callee in resort:
+            _sort_adjacency(G._pred[callee])
+
+        self._refresh_cycles(touched, {e for e in edges if e in old_flags}, old_flags)
+        invalidate(G)
+
+        for module_name in removed:
+            for caller in self.calls.pop(module_name, {}):
+                del self.caller_modules[caller]
+        for module_name, module_calls in calls.items():
+            for caller in self.calls.get(module_name, {}):
+                self.caller_modules.pop(caller, None)
+            self.caller_modules.update(dict.fromkeys(module_calls, module_name))
+        self.calls.update(calls)
+        self.analyzers = analyzers
+        self.symbols = symbols
+        self.index = index
+        self._reindex(modules)
+        logger.debug(
+            "Updated %d module(s); re-derived %d caller(s), %d edge endpoint(s) touched",
+            len(modules),
+            sum(len(c) for c in rederive.values()),
+            len(touched),
+        )
+        return True
+
+    def _changed_keys(
+        self,
+        index: SymbolIndex,
+        new_symbols: Mapping[str, ModuleSymbols],
+        modules: Mapping[str, Optional[ModuleAnalyzer]],
+    ) -> Set[str]:
+        """The lookup keys (see :func:`_lookup_keys`) whose answers may have changed.
+
+        That is the short name of every function that came or went, and every
+        class whose definition, bases or ancestry changed, by qualified and
+        by short name.
+        """
+        old_symbols = self.symbols.modules
+        keys: Set[str] = set()
+        changed_classes: Set[str] = set()
+        for module_name in modules:
+            before, after = old_symbols.get(module_name), new_symbols.get(module_name)
+            keys.update(
+                _short_name(f)
+                for f in (before.functions if before else frozenset())
+                ^ (after.functions if after else frozenset())
+            )
+            before_classes = before.classes if before else {}
+            after_classes = after.classes if after else {}
+            if before and after and before.import_map != after.import_map:
+                # Bases are resolved through the defining module's imports.
+                changed_classes.update(before_classes, after_classes)
+            else:
+                changed_classes.update(
+                    q
+                    for q in before_classes.keys() | after_classes.keys()
+                    if before_classes.get(q) != after_classes.get(q)
+                )
+        if not changed_classes:
+            return keys
+
+        # A class coming or going can re-point another class's base by name;
+        # then everything that inherits from a changed class is affected too.
+        children: Dict[str, Set[str]] = {}
+        for idx in (self.index, index):
+            for cls in idx.classes:
+                if self.index.bases(cls) != index.bases(cls):
+                    changed_classes.add(cls)
+                for base in idx.bases(cls):
+                    children.setdefault(base, set()).add(cls)
+        affected: Set[str] = set()
+        stack = list(changed_classes)
+        while stack:
+            cls = stack.pop()
+            if cls not in affected:
+                affected.add(cls)
+                stack.extend(children.get(cls, ()))
+        keys.update(affected)
+        keys.update(_short_name(c) for c in affected)
+        return keys
+
+    def _dependent_callers(self, keys: Set[str]) -> Dict[str, Set[str]]:
+        """Module -> callers with a call site that looks up any of ``keys``."""
+        if self._callers_by_key is None:
+            self._callers_by_key = {}
+            self._reindex(self.analyzers)
+        dependents: Dict[str, Set[str]] = {}
+        for key in keys:
+            for module_name, callers in self._callers_by_key.get(key, {}).items():
+                dependents.setdefault(module_name, set()).update(callers)
+        return dependents
+
+    def _reindex(self, modules: Iterable[str]) -> None:
+        """Refresh ``modules``' entries in the key -> callers index, if built."""
+        by_key = self._callers_by_key
+        if by_key is None:
+            return
+        for module_name in modules:
+            for key in self._module_keys.pop(module_name, ()):
+                del by_key[key][module_name]
+                if not by_key[key]:
+                    del by_key[key]
+            analyzer = self.analyzers.get(module_name)
+            if analyzer is None:
+                continue
+            import_map = analyzer.imports.import_map
+            module_keys: Set[str] = set()
+            for site in analyzer.call_sites:
+                for key in _lookup_keys(site, import_map):
+                    by_key.setdefault(key, {}).setdefault(module_name, set()).add(site.caller)
+                    module_keys.add(key)
+            self._module_keys[module_name] = frozenset(module_keys)
+
+    def _refresh_cycles(
+        self, touched: Set[str], kept: Set[Edge], old_flags: Mapping[Edge, bool]
+    ) -> None:
+        """Re-flag ``is_cycle`` where the update could have changed it.
+
+        Only components that contained a touched node before the update, or
+        that can be reached from one after it, can gain or lose a cycle; every
+        other component is the same set of nodes with the same edges.
+        """
+        G = self.graph
+        touched = {n for n in touched if n in G}
+        reached = set(touched)
+        stack = list(touched)
+        while stack:
+            for callee in G.succ[stack.pop()]:
+                if callee not in reached:
+                    reached.add(callee)
+                    stack.append(callee)
+        region = set(reached)
+        for node in touched:
+            region.update(n for n in self._components.get(node, ()) if n in G)
+
+        for node in region:
+            self._components.pop(node, None)
+        for node in list(self._components):
+            if node not in G:
+                del self._components[node]
+        self._assign_components(nx.strongly_connected_components(G.subgraph(region)))
+
+        for edge in kept:
+            if edge[0] not in region and old_flags[edge]:
+                G.edges[edge]["is_cycle"] = True
+        for node in region:
+            component = self._components.get(node)
+            for callee, data in G.succ[node].items():
+                if callee == node or (component is not None and callee in component):
+                    data["is_cycle"] = True
+                else:
+                    data.pop("is_cycle", None)
+
+
+def _restore_node_order(G: nx.DiGraph, new_nodes: List[str]) -> None:
+    """Move ``new_nodes`` from the end of ``G``'s node order to their build position.
+
+    A fresh build inserts nodes by module, then name, and consumers iterate
+    ``G.nodes`` as inserted; :meth:`networkx.DiGraph.add_node` appends. The
+    node and adjacency dicts are reordered in place so existing views stay
+    valid.
+    """
+    nodes = G._node
+
+    def key(node: str) -> Tuple[str, str]:
+        return nodes[node]["module"], node
+
+    fresh = set(new_nodes)
+    order = [n for n in nodes if n not in fresh]
+    for node in sorted(new_nodes, key=key):
+        target, lo, hi = key(node), 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(order[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        order.insert(lo, node)
+    for mapping in (G._node, G._succ, G._pred):
+        values = [mapping[n] for n in order]
+        mapping.clear()
+        mapping.update(zip(order, values))
+
+
+def _sort_adjacency(adjacency: Dict[str, Dict]) -> None:
+    """Sort one node's neighbour dict by neighbour, as sorted edge insertion leaves it."""
+    items = sorted(adjacency.items())
+    adjacency.clear()
+    adjacency.update(items)
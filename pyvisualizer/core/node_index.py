@@ -0,0 +1,126 @@
+"""
+Name lookups over a call graph: exact id, dotted suffix, short name, file path.
+
+Every command that takes a user-supplied symbol or file (``impact``,
+``context --focus``, ``review``, the MCP tools) has to turn it into node
+ids. Doing that by scanning every node -- and, for file fragments, every
+node's ``path`` -- costs a pass over the graph per lookup. :class:`NodeIndex`
+builds the maps once per graph version (see
+:attr:`pyvisualizer.core.graph_analysis.GraphAnalysis.node_index`) and answers
+each lookup by walking only as many trie levels as the query has components.
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from typing import Dict, List, Mapping, Optional, Set
+
+from pyvisualizer.core.csr import GraphLike
+from pyvisualizer.core.symbols import SuffixTrie
+
+
+class _PathTrie:
+    """Trie over reversed ``/``-separated path components.
+
+    Unlike :class:`~pyvisualizer.core.symbols.SuffixTrie`, a query may start
+    mid-component (``ice.py`` matches ``src/service.py``, as
+    ``str.endswith`` would), so each level also keeps its child keys
+    reversed and sorted, and the partial leading component becomes a
+    prefix range found by bisection.
+    """
+
+    __slots__ = ("children", "values", "_reversed_keys")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PathTrie"] = {}
+        self.values: List[str] = []
+        self._reversed_keys: Optional[List[str]] = None
+
+    def insert(self, path: str, value: str) -> None:
+        node = self
+        for part in reversed(path.split("/")):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _PathTrie()
+                node._reversed_keys = None
+            child.values.append(value)
+            node = child
+
+    def get(self, fragment: str) -> List[str]:
+        """Values of every inserted path ending with ``fragment`` (non-empty)."""
+        parts = fragment.split("/")
+        node = self
+        for part in reversed(parts[1:]):
+            child = node.children.get(part)
+            if child is None:
+                return []
+            node = child
+        if node._reversed_keys is None:
+            node._reversed_keys = sorted(key[::-1] for key in node.children)
+        keys = node._reversed_keys
+        head = parts[0][::-1]
+        found: List[str] = []
+        i = bisect_left(keys, head)
+        while i < len(keys) and keys[i].startswith(head):
+            found.extend(node.children[keys[i][::-1]].values)
+            i += 1
+        return found
+
+
+class NodeIndex:
+    """Lookup maps over one graph version's node ids and source paths.
+
+    Build it through :func:`~pyvisualizer.core.graph_analysis.graph_analysis`
+    so every caller shares one; like the rest of the analysis it describes
+    the graph as it was when built.
+    """
+
+    def __init__(self, G: GraphLike) -> None:
+        self._suffixes = SuffixTrie()
+        self._short: Dict[str, List[str]] = {}
+        self._by_path: Dict[str, List[str]] = {}
+        for node, data in G.nodes(data=True):
+            self._suffixes.insert(node, node)
+            self._short.setdefault(node.rsplit(".", 1)[-1], []).append(node)
+            self._by_path.setdefault(data.get("path", ""), []).append(node)
+        self._paths = _PathTrie()
+        for path in self._by_path:
+            if path:
+                self._paths.insert(path.replace(os.sep, "/"), path)
+
+    @property
+    def by_path(self) -> Mapping[str, List[str]]:
+        """Source path (as stored on the nodes) -> its nodes, in graph order."""
+        return self._by_path
+
+    def suffix_matches(self, name: str) -> List[str]:
+        """Nodes equal to ``name`` or ending in ``.name``, in graph order."""
+        return list(self._suffixes.get(name))
+
+    def short_name_matches(self, name: str) -> List[str]:
+        """Nodes whose last dotted component is ``name``, in graph order."""
+        return list(self._short.get(name, ()))
+
+    def resolve(self, target: str) -> Optional[str]:
+        """A user-supplied target as one node id (exact or unique suffix match)."""
+        matches = self._suffixes.get(target)
+        if target in matches:
+            return target
+        if len(matches) == 1:
+            match: str = matches[0]
+            return match
+        # Prefer an exact short-name match if unique.
+        short = self._short.get(target, ())
+        if len(short) == 1:
+            return short[0]
+        return None
+
+    def path_matches(self, fragment: str) -> Set[str]:
+        """Nodes whose ``path`` ends with ``fragment`` (``/`` or ``os.sep``)."""
+        if not fragment:
+            return {node for nodes in self._by_path.values() for node in nodes}
+        found: Set[str] = set()
+        for path in self._paths.get(fragment.replace(os.sep, "/")):
+            found.update(self._by_path[path])
+        return found
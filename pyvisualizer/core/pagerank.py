@@ -0,0 +1,394 @@
+"""
+Personalized PageRank over integer adjacency arrays, or locally by push.
+
+The context pack ranks every function by a random walk that keeps
+teleporting back to the focus set. This module runs that walk over the
+graph flattened to integer arrays -- built once per graph version and
+shared through :attr:`~pyvisualizer.core.graph_analysis.GraphAnalysis` --
+rather than over dicts keyed by name.
+
+Two backends compute the same iteration. The stdlib one uses ``array`` and
+lists; when NumPy is installed the same steps run vectorized. Both add the
+walk's contributions into each node in the same order (by source node, in
+name order) and sum the leaked mass and the convergence delta exactly
+(:func:`math.fsum`), so they produce the same floats and the ranking never
+depends on whether NumPy happens to be importable.
+
+:func:`push_pagerank` trades exactness for locality: it only ever touches
+the focus neighbourhood, so its cost does not grow with the project.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import OrderedDict, deque
+from functools import reduce
+from itertools import repeat
+from operator import add, mul, sub, truediv
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from pyvisualizer.core.csr import GraphLike
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None  # type: ignore[assignment]
+
+#: Backends accepted by :func:`personalized_pagerank`.
+BACKENDS = ("array", "numpy")
+
+#: Residual threshold for :func:`push_pagerank` where a caller needs a default.
+DEFAULT_PUSH_EPSILON = 1.0e-5
+
+#: Score vectors a :class:`PageRankCache` keeps by default.
+DEFAULT_CACHE_SIZE = 256
+
+#: Largest focus set :class:`PageRankCache` composes from single seeds;
+#: bigger sets (e.g. "the whole project") are walked jointly.
+MAX_COMPOSED_SEEDS = 32
+
+
+#: Nodes with at most this many incoming walk edges are summed column by column.
+_COLUMNS = 16
+
+
+class PageRankGraph:
+    """A graph's walk structure as integer arrays.
+
+    ``names`` is every node in name order (``index`` inverts it). Internally nodes sit at
+    ``position[i]``, grouped by how many nodes pass rank to them: all with
+    one incoming edge, then all with two, and so on up to ``_COLUMNS``,
+    then the few high fan-in nodes. Within a group, the j-th incoming
+    source of every member forms one column, so the stdlib backend sums a
+    whole group with one C-level ``map`` per column instead of one call per
+    node -- and still adds each node's sources in ascending name order,
+    exactly as a per-node loop (or ``numpy.bincount``) would. With
+    ``bidirectional``, a node's neighbours are its callers and callees alike.
+    """
+
+    __slots__ = (
+        "names",
+        "index",
+        "position",
+        "divisor",
+        "dangling",
+        "unreached",
+        "columns",
+        "wide",
+        "_arrays",
+    )
+
+    def __init__(self, G: GraphLike, *, bidirectional: bool = True) -> None:
+        self.names: List[str] = sorted(G.nodes())
+        self.index: Dict[str, int] = {n: i for i, n in enumerate(self.names)}
+        index = self.index
+        incoming: List[List[int]] = [[] for _ in self.names]
+        degree = [0] * len(self.names)
+        for i, n in enumerate(self.names):
+            out = {index[m] for m in G.successors(n)}
+            if bidirectional:
+                out.update(index[m] for m in G.predecessors(n))
+            degree[i] = len(out)
+            for j in out:
+                incoming[j].append(i)  # i ascends, so every list stays sorted
+
+        def group(i: int) -> int:
+            return min(len(incoming[i]), _COLUMNS + 1)
+
+        order = sorted(range(len(self.names)), key=lambda i: (group(i), i))
+        position = array("l", [0]) * len(order)
+        for p, i in enumerate(order):
+            position[i] = p
+        self.position = position
+        #: Out-degree by position (1 for dangling nodes, which pass nothing on).
+        self.divisor = array("l", (degree[i] or 1 for i in order))
+        self.dangling = array("l", (position[i] for i, d in enumerate(degree) if not d))
+        #: How many leading positions nothing passes rank to.
+        self.unreached = sum(1 for i in order if not incoming[i])
+        #: Per in-degree 1.._COLUMNS: that group's source columns, by position.
+        self.columns: List[List[array]] = []
+        for k in range(1, _COLUMNS + 1):
+            members = [i for i in order if len(incoming[i]) == k]
+            if members:
+                self.columns.append(
+                    [array("l", (position[incoming[i][j]] for i in members)) for j in range(k)]
+                )
+        #: Sources (by position) of each node past the last column group.
+        self.wide = [
+            array("l", (position[s] for s in incoming[i]))
+            for i in order
+            if len(incoming[i]) > _COLUMNS
+        ]
+        self._arrays: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def edge_arrays(self) -> tuple:
+        """``(src, dst)`` positions as NumPy arrays, per destination in source order."""
+        if self._arrays is None:
+            dst: List[int] = []
+            src: List[int] = []
+            p = self.unreached
+            for cols in self.columns:
+                for r in range(len(cols[0])):
+                    dst.extend([p] * len(cols))
+                    src.extend(col[r] for col in cols)
+                    p += 1
+            for srcs in self.wide:
+                dst.extend([p] * len(srcs))
+                src.extend(srcs)
+                p += 1
+            self._arrays = (np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+        return self._arrays
+
+
+def personalized_pagerank(
+    graph: PageRankGraph,
+    focus: Sequence[str],
+    *,
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1.0e-10,
+    backend: Optional[str] = None,
+) -> Dict[str, float]:
+    """Power iteration of the walk that teleports back to ``focus``.
+
+    ``backend`` is ``"array"``, ``"numpy"`` or ``None`` (NumPy when it is
+    installed). Mass stranded on dangling nodes teleports back to the focus
+    set. Focus names missing from the graph are dropped and repeated names
+    count once, so every distinct focus node in the graph gets the same
+    teleport share and the scores sum to one. Returns every node's score,
+    in name order.
+    """
+    if backend is None:
+        backend = "numpy" if np is not None else "array"
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "numpy" and np is None:
+        raise ValueError("the numpy backend needs NumPy installed")
+
+    names = graph.names
+    if not names:
+        return {}
+    index = graph.index
+    seeds = sorted({graph.position[index[n]] for n in focus if n in index})
+    if not seeds:
+        return {n: 0.0 for n in names}
+    weight = 1.0 / len(seeds)
+
+    step = _iterate_numpy if backend == "numpy" else _iterate_array
+    rank = step(graph, seeds, weight, alpha, max_iter, tol)
+    return dict(zip(names, map(rank.__getitem__, graph.position)))
+
+
+def _iterate_array(
+    graph: PageRankGraph, seeds: List[int], weight: float, alpha: float, max_iter: int, tol: float
+) -> List[float]:
+    n = len(graph)
+    divisor = graph.divisor
+    rank = [0.0] * n
+    for p in seeds:
+        rank[p] = weight
+    for _ in range(max_iter):
+        leaked = alpha * math.fsum(map(rank.__getitem__, graph.dangling))
+        share = list(map(truediv, map(mul, repeat(alpha, n), rank), divisor))
+        get = share.__getitem__
+        nxt = [0.0] * graph.unreached
+        for cols in graph.columns:
+            acc = list(map(get, cols[0]))
+            for col in cols[1:]:
+                acc = list(map(add, acc, map(get, col)))
+            nxt += acc
+        nxt.extend(reduce(add, map(get, srcs)) for srcs in graph.wide)
+        back = 1.0 - alpha + leaked
+        for p in seeds:
+            nxt[p] += back * weight
+        delta = math.fsum(map(abs, map(sub, nxt, rank)))
+        rank = nxt
+        if delta < tol:
+            break
+    return rank
+
+
+def _iterate_numpy(
+    graph: PageRankGraph, seeds: List[int], weight: float, alpha: float, max_iter: int, tol: float
+) -> List[float]:
+    src, dst = graph.edge_arrays()
+    n = len(graph)
+    divisor = np.array(graph.divisor, dtype=np.float64)
+    dangling = np.array(graph.dangling, dtype=np.int64)
+    seed_index = np.array(seeds, dtype=np.int64)
+    rank = np.zeros(n)
+    rank[seed_index] = weight
+    for _ in range(max_iter):
+        leaked = alpha * math.fsum(rank[dangling].tolist())
+        share = alpha * rank / divisor
+        # bincount accumulates in input order: per destination, by ascending source.
+        nxt = np.bincount(dst, weights=share[src], minlength=n).astype(np.float64, copy=False)
+        nxt[seed_index] += (1.0 - alpha + leaked) * weight
+        delta = math.fsum(np.abs(nxt - rank).tolist())
+        rank = nxt
+        if delta < tol:
+            break
+    scores: List[float] = rank.tolist()
+    return scores
+
+
+def push_pagerank(
+    G: GraphLike,
+    focus: Sequence[str],
+    *,
+    alpha: float = 0.85,
+    epsilon: float = DEFAULT_PUSH_EPSILON,
+    bidirectional: bool = True,
+) -> Dict[str, float]:
+    """Approximate personalized PageRank by local forward push.
+
+    Starts with all the walk's mass as *residual* on the focus and, while
+    some node holds a residual of at least ``epsilon`` per neighbour, keeps
+    ``1 - alpha`` of it as that node's score and spreads the rest over its
+    neighbours (or, for a dangling node, back over the focus -- the same
+    walk :func:`personalized_pagerank` iterates). On the bidirectional walk
+    each score is within ``epsilon`` times the node's degree of the exact
+    one, and in either direction the total
+    work is bounded by ``1 / (epsilon * (1 - alpha))`` neighbour updates
+    however large the graph is: only the focus neighbourhood is touched.
+
+    Nodes are pushed first-in first-out, starting from the focus in name
+    order and enqueueing neighbours in name order, so the result is
+    deterministic. Only nodes with a positive score appear in it.
+    """
+    seeds = sorted({n for n in focus if n in G})
+    if not seeds:
+        return {}
+    weight = 1.0 / len(seeds)
+
+    neighbours: Dict[str, List[str]] = {}
+
+    def around(u: str) -> List[str]:
+        out = neighbours.get(u)
+        if out is None:
+            found = set(G.successors(u))
+            if bidirectional:
+                found.update(G.predecessors(u))
+            out = neighbours[u] = sorted(found)
+        return out
+
+    def due(u: str) -> bool:
+        return residual[u] >= epsilon * (len(around(u)) or 1)
+
+    score: Dict[str, float] = {}
+    residual: Dict[str, float] = dict.fromkeys(seeds, weight)
+    queue = deque(u for u in seeds if due(u))
+    queued = set(queue)
+    while queue:
+        u = queue.popleft()
+        queued.discard(u)
+        mass = residual[u]
+        residual[u] = 0.0
+        score[u] = score.get(u, 0.0) + (1.0 - alpha) * mass
+        out = around(u)
+        if out:
+            targets, share = out, alpha * mass / len(out)
+        else:
+            targets, share = seeds, alpha * mass * weight
+        for v in targets:
+            residual[v] = residual.get(v, 0.0) + share
+            if v not in queued and due(v):
+                queue.append(v)
+                queued.add(v)
+    return score
+
+
+class PageRankCache:
+    """Least-recently-used cache of score vectors, optionally composed from single seeds.
+
+    By default each focus set is walked jointly and cached as a whole, so a
+    cached answer is exactly what an uncached walk would return.
+
+    With ``compose=True``, :meth:`scores` instead answers a multi-node focus
+    with the average of its members' single-seed vectors -- whether or not
+    anything was cached, so the ranking never depends on the cache's state
+    -- and keeps every single-seed vector it computes: a later focus set
+    mixing seeds seen before costs no walk at all. That is only sound when
+    the walk is linear in where it teleports to, i.e. when no node of the
+    walk is dangling (dangling mass returns to the focus set in proportion
+    to each seed's own score, which no average reproduces); the caller must
+    check. Sets larger than ``max_composed`` are walked jointly regardless.
+
+    ``key`` must identify the graph version and the walk's parameters.
+    ``hits`` and ``misses`` count whole lookups.
+    """
+
+    def __init__(
+        self, maxsize: int = DEFAULT_CACHE_SIZE, max_composed: int = MAX_COMPOSED_SEEDS
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_composed = max_composed
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, Tuple[str, ...]], Dict[str, float]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def scores(
+        self,
+        key: Hashable,
+        focus: Sequence[str],
+        compute: Callable[[List[str]], Dict[str, float]],
+        *,
+        compose: bool = False,
+    ) -> Dict[str, float]:
+        """Scores for ``focus``; ``compute`` runs the walk for one seed list.
+
+        ``compose`` averages single-seed vectors (see the class docstring).
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        seeds = tuple(sorted(set(focus)))
+        found = self._get((key, seeds))
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+        if not compose or len(seeds) <= 1 or len(seeds) > self.max_composed:
+            result = compute(list(seeds))
+        else:
+            parts = []
+            for seed in seeds:
+                part = self._get((key, (seed,)))
+                if part is None:
+                    part = compute([seed])
+                    self._put((key, (seed,)), part)
+                parts.append(part)
+            result = _average(parts)
+        self._put((key, seeds), result)
+        return result
+
+    def _get(self, entry: Tuple[Hashable, Tuple[str, ...]]) -> Optional[Dict[str, float]]:
+        found = self._entries.get(entry)
+        if found is not None:
+            self._entries.move_to_end(entry)
+        return found
+
+    def _put(self, entry: Tuple[Hashable, Tuple[str, ...]], value: Dict[str, float]) -> None:
+        self._entries[entry] = value
+        self._entries.move_to_end(entry)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _average(parts: List[Dict[str, float]]) -> Dict[str, float]:
+    """Node-wise mean of score vectors; exact sums, so the order never matters."""
+    names: Dict[str, None] = {}
+    for part in parts:
+        names.update(dict.fromkeys(part))
+    k = len(parts)
+    return {n: math.fsum([part.get(n, 0.0) for part in parts]) / k for n in names}
@@ -0,0 +1,242 @@
+"""
+Precomputed reachability: transitive callers and callees without a search.
+
+Every node in a strongly connected component reaches exactly what the
+others do, so the index works on the condensation DAG: one set per
+component of the components below it (its transitive callees) and one of
+those above it (its transitive callers), built bottom-up in a single pass
+over the DAG with Python's arbitrary-precision ints as bitsets. Numbering
+components in DFS post-order makes most of each set one contiguous run, so
+a bitset stored from its lowest member on is short -- interval labeling's
+locality without its restriction to trees. Call graphs are sparse, and the
+typical set is a handful of components scattered across the numbering;
+those are kept as small sorted arrays instead. A query is then a lookup
+plus expanding the set -- no graph traversal at all.
+
+A transitive closure can be quadratic in the number of components, so the
+build stops as soon as the sets outgrow a memory ceiling; callers then
+fall back to a plain breadth-first search (see
+:meth:`pyvisualizer.core.graph_analysis.GraphAnalysis.ancestors`).
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from pyvisualizer.core.csr import GraphLike, strongly_connected_components
+
+#: Default ceiling on the index's total size, in bytes.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bytes per entry of a set stored as an array of component numbers.
+_ENTRY_BYTES = 4
+
+# One component's reachable set: an offset bitset, or an ``array("i")``.
+_Set = Union[int, "array[int]"]
+_Closure = Tuple[List[int], List[int], List[_Set], int]
+
+
+def iter_bits(x: int) -> Iterator[int]:
+    """Indexes of the set bits of ``x``."""
+    s = bin(x)
+    top = len(s) - 1
+    i = s.find("1", 2)
+    while i != -1:
+        yield top - i
+        i = s.find("1", i + 1)
+
+
+def _bitset(positions: Iterable[int], base: int, top: int) -> int:
+    """``positions`` (all within ``base..top``) as a bitset shifted down by ``base``."""
+    buf = bytearray((top - base) // 8 + 1)
+    for p in positions:
+        p -= base
+        buf[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _closure(children: List[Set[int]], budget: int) -> Optional[_Closure]:
+    """Transitive closure of a DAG, numbered in DFS post-order.
+
+    Components are renumbered in post-order, so everything reachable from
+    ``c`` through its own DFS subtree is one contiguous run of numbers just
+    below ``c``'s; such a set is stored as a bitset shifted down to the
+    lowest number it contains, which keeps it about as long as that run
+    rather than as long as the whole graph. A set that is small but spread
+    out -- two callees at opposite ends of the numbering -- is cheaper as a
+    sorted array of its numbers, and is stored as one. Returns ``(by_post,
+    offsets, sets, bytes)`` indexed by component, or ``None`` once the sets
+    exceed ``budget``.
+    """
+    k = len(children)
+    ordered = [sorted(c) for c in children]
+    post = [-1] * k
+    by_post: List[int] = []
+    for root in range(k):
+        if post[root] != -1:
+            continue
+        post[root] = -2  # on the stack
+        work = [(root, 0)]
+        while work:
+            c, i = work[-1]
+            if i < len(ordered[c]):
+                work[-1] = (c, i + 1)
+                d = ordered[c][i]
+                if post[d] == -1:
+                    post[d] = -2
+                    work.append((d, 0))
+                continue
+            work.pop()
+            post[c] = len(by_post)
+            by_post.append(c)
+
+    offsets = [0] * k
+    sets: List[_Set] = [0] * k
+    # An upper bound on each set's size: counting the bits of a wide bitset
+    # costs as much as building it, so the choice between the two forms is
+    # made from the children's bounds instead.
+    bounds = [0] * k
+    used = 0
+    for c in by_post:  # children are always numbered (and finished) first
+        if not ordered[c]:
+            continue
+        found = {post[d] for d in ordered[c]}
+        dense: List[Tuple[int, int]] = []  # (offset, bits) of the children's bitsets
+        bound = 0
+        for d in ordered[c]:
+            below = sets[d]
+            if isinstance(below, int):
+                if below:
+                    dense.append((offsets[d], below))
+                    bound += bounds[d]
+            else:
+                found.update(below)
+        low, high = min(found), max(found)
+        bound += len(found)
+        for offset, below in dense:
+            low = min(low, offset)
+            high = max(high, offset + below.bit_length() - 1)
+        size = (high - low) // 8 + 1
+        if bound * _ENTRY_BYTES < size:
+            for offset, below in dense:  # each is narrow: it was stored as a bitset
+                found.update(offset + i for i in iter_bits(below))
+            sets[c] = array("i", sorted(found))
+            bounds[c] = len(found)
+            used += len(found) * _ENTRY_BYTES
+        else:
+            bits = _bitset(found, low, high)
+            for offset, below in dense:
+                bits |= below << (offset - low)
+            offsets[c], sets[c] = low, bits
+            bounds[c] = min(bound, high - low + 1)
+            used += size
+        if used > budget:
+            return None
+    return by_post, offsets, sets, used
+
+
+class ReachabilityIndex:
+    """Transitive callers/callees of every node of one graph version.
+
+    Build with :meth:`build`; the index describes the graph as it was then
+    and must be rebuilt after the graph changes.
+    """
+
+    def __init__(
+        self,
+        members: List[List[str]],
+        component: Dict[str, int],
+        down: _Closure,
+        up: _Closure,
+    ) -> None:
+        self._members = members
+        self._component = component
+        self._down = down
+        self._up = up
+        #: Total size of the stored sets, in bytes.
+        self.nbytes = down[3] + up[3]
+        self._counts: Dict[Tuple[int, bool], int] = {}
+
+    @classmethod
+    def build(
+        cls,
+        G: GraphLike,
+        sccs: Optional[Sequence[Set[str]]] = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> Optional["ReachabilityIndex"]:
+        """Index ``G``; ``None`` if the sets would exceed ``max_bytes``.
+
+        ``sccs`` may pass in ``G``'s strongly connected components if they
+        are already known.
+        """
+        if sccs is None:
+            sccs = list(strongly_connected_components(G))
+        members = [sorted(c) for c in sccs]
+        component = {n: c for c, nodes in enumerate(members) for n in nodes}
+
+        below: List[Set[int]] = [set() for _ in members]
+        above: List[Set[int]] = [set() for _ in members]
+        for node, c in component.items():
+            for callee in G.successors(node):
+                d = component[callee]
+                if d != c:
+                    below[c].add(d)
+                    above[d].add(c)
+
+        down = _closure(below, max_bytes)
+        if down is None:
+            return None
+        up = _closure(above, max_bytes - down[3])
+        if up is None:
+            return None
+        return cls(members, component, down, up)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._component
+
+    def _components(self, node: str, closure: _Closure) -> Iterator[int]:
+        by_post, offsets, sets, _ = closure
+        c = self._component[node]
+        found = sets[c]
+        if isinstance(found, int):
+            base = offsets[c]
+            for i in iter_bits(found):
+                yield by_post[base + i]
+        else:
+            for p in found:
+                yield by_post[p]
+
+    def _expand(self, node: str, closure: _Closure) -> Set[str]:
+        result = set(self._members[self._component[node]])
+        result.discard(node)
+        for d in self._components(node, closure):
+            result.update(self._members[d])
+        return result
+
+    def _count(self, node: str, closure: _Closure) -> int:
+        c = self._component[node]
+        key = (c, closure is self._up)
+        total = self._counts.get(key)
+        if total is None:
+            total = self._counts[key] = sum(
+                len(self._members[d]) for d in self._components(node, closure)
+            )
+        return total + len(self._members[c]) - 1
+
+    def descendants(self, node: str) -> Set[str]:
+        """Every function ``node`` can reach (its transitive callees)."""
+        return self._expand(node, self._down)
+
+    def ancestors(self, node: str) -> Set[str]:
+        """Every function that can reach ``node`` (its transitive callers)."""
+        return self._expand(node, self._up)
+
+    def count_descendants(self, node: str) -> int:
+        """``len(self.descendants(node))``, memoized per component."""
+        return self._count(node, self._down)
+
+    def count_ancestors(self, node: str) -> int:
+        """``len(self.ancestors(node))`` -- the blast radius -- memoized per component."""
+        return self._count(node, self._up)
@@ -0,0 +1,319 @@
+"""
+Project-wide symbol table for call resolution.
+
+Call resolution only ever asks a few questions of the rest of the project:
+which qualified functions exist, which classes exist (with their bases and
+direct methods), and what each module's imports bind. :class:`SymbolTable`
+captures exactly that as immutable, picklable data, built once after the
+definition pass, so resolution can run anywhere -- including in worker
+processes -- without the analyzers or their ASTs.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from pyvisualizer.core.analyzer import ModuleAnalyzer
+
+
+class ClassSymbol(NamedTuple):
+    """What resolution needs to know about one class."""
+
+    name: str
+    bases: Tuple[str, ...]  # base-class expressions as written (dotted)
+    methods: FrozenSet[str]  # names of methods defined directly on the class
+
+
+class ModuleSymbols(NamedTuple):
+    """One module's definitions and import bindings."""
+
+    functions: FrozenSet[str]  # qualified names of every function/method
+    classes: Dict[str, ClassSymbol]  # qualified name -> class, definition order
+    import_map: Dict[str, str]  # bound name -> imported dotted path
+
+    @classmethod
+    def from_analyzer(cls, analyzer: ModuleAnalyzer) -> "ModuleSymbols":
+        return cls(
+            functions=frozenset(analyzer.functions),
+            classes={
+                q: ClassSymbol(info.name, tuple(info.bases), frozenset(info.methods))
+                for q, info in analyzer.classes.items()
+            },
+            import_map=dict(analyzer.imports.import_map),
+        )
+
+
+class SymbolTable:
+    """Read-only, picklable view of every module's definitions and imports.
+
+    ``modules`` keeps the analyzers' iteration order: when several modules
+    could satisfy a lookup, the first one in that order wins, exactly as it
+    did when resolution scanned the analyzers directly.
+    """
+
+    def __init__(self, modules: Mapping[str, ModuleSymbols]) -> None:
+        self.modules: Dict[str, ModuleSymbols] = dict(modules)
+
+    @classmethod
+    def from_analyzers(cls, analyzers: Mapping[str, ModuleAnalyzer]) -> "SymbolTable":
+        return cls({m: ModuleSymbols.from_analyzer(a) for m, a in analyzers.items()})
+
+
+class SuffixTrie:
+    """Trie over reversed dotted-name components, for suffix lookups.
+
+    ``get("b.c")`` returns the values of every inserted name equal to
+    ``b.c`` or ending in ``.b.c``, in insertion order, after walking only as
+    many nodes as the query has components -- independent of how many names
+    are stored. Suffixes are never materialized as strings, so memory grows
+    with the number of components rather than quadratically with depth.
+    """
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "SuffixTrie"] = {}
+        self.values: List[Any] = []
+
+    def insert(self, name: str, value: Any) -> None:
+        node = self
+        for part in reversed(name.split(".")):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = SuffixTrie()
+            child.values.append(value)
+            node = child
+
+    def get(self, suffix: str) -> List[Any]:
+        node = self
+        for part in reversed(suffix.split(".")):
+            child = node.children.get(part)
+            if child is None:
+                return []
+            node = child
+        return node.values
+
+
+class SymbolIndex:
+    """Hash indexes over a :class:`SymbolTable`, built once per project.
+
+    Every lookup the resolver makes used to scan all modules (and, for the
+    short-name fallback, all of their classes) per call site. These maps
+    answer the same questions directly while preserving the scans' semantics:
+    every candidate list is kept in project order, so "first match wins"
+    picks exactly what the linear scan picked.
+
+    The index also owns the project's class hierarchy: each class's bases
+    are resolved once, in the module that defines it, and linearized into an
+    MRO (C3 where the hierarchy allows it, breadth-first otherwise). Class
+    name resolutions and ``(class, method)`` lookups are memoized here, so
+    every module's resolver shares them; ``method_hits``/``method_misses``
+    count how often the memo answered.
+    """
+
+    def __init__(self, table: SymbolTable) -> None:
+        self.table = table
+        #: Every qualified function/method name in the project.
+        self.functions: Set[str] = set()
+        #: Qualified class name -> class (first definition in project order).
+        self.classes: Dict[str, ClassSymbol] = {}
+        #: Qualified class name -> the module that defines it.
+        self.class_modules: Dict[str, str] = {}
+        #: Module names by dotted suffix ('c', 'b.c', 'a.b.c'), project order.
+        self.modules_by_suffix = SuffixTrie()
+        #: ``(module, qualified)`` classes by dotted suffix, project/definition order.
+        self.classes_by_suffix = SuffixTrie()
+
+        self.method_hits = 0
+        self.method_misses = 0
+        self._class_names: Dict[Tuple[str, str], Optional[str]] = {}
+        self._methods: Dict[Tuple[str, str, bool], Optional[str]] = {}
+        self._mros: Dict[str, Tuple[str, ...]] = {}
+        self._cyclic: Set[str] = set()  # classes with an inheritance cycle above them
+        self._linearizing: Set[str] = set()
+
+        for module_name, symbols in table.modules.items():
+            self.functions.update(symbols.functions)
+            self.modules_by_suffix.insert(module_name, module_name)
+            for q, info in symbols.classes.items():
+                if q not in self.classes:
+                    self.classes[q] = info
+                    self.class_modules[q] = module_name
+                self.classes_by_suffix.insert(q, (module_name, q))
+
+    def rebind(self, table: SymbolTable, changed: Iterable[str]) -> "SymbolIndex":
+        """An index for ``table``, derived from this one without a full rebuild.
+
+        ``table`` must differ from this index's table only in the ``changed``
+        modules' functions, and in the imports of those among them that
+        define no classes: the module and class indexes, resolved bases, MROs
+        and method lookups all carry over unchanged. Class names resolved
+        from within a changed module are forgotten, since its imports may
+        have moved.
+        """
+        changed = set(changed)
+        index = copy.copy(self)
+        index.table = table
+        index.functions = set(self.functions)
+        for module_name in changed:
+            before = self.table.modules[module_name].functions
+            after = table.modules[module_name].functions
+            index.functions.update(after - before)
+            for func in before - after:
+                if not any(func in m.functions for m in table.modules.values()):
+                    index.functions.discard(func)
+        index._class_names = {k: v for k, v in self._class_names.items() if k[0] not in changed}
+        index._methods = dict(self._methods)
+        index._mros = dict(self._mros)
+        index._cyclic = set(self._cyclic)
+        index._linearizing = set()
+        return index
+
+    def module_function(self, module_path: str, func_name: str) -> Optional[str]:
+        """``module_path.func_name`` in the first module named (or ending in) ``module_path``."""
+        for module_name in self.modules_by_suffix.get(module_path):
+            target = f"{module_name}.{func_name}"
+            if target in self.functions and target in self.table.modules[module_name].functions:
+                return target
+        return None
+
+    def imported_class(self, imported: str) -> Optional[str]:
+        """The project class an import of ``imported`` most plausibly names.
+
+        The first module (in project order) that defines either ``imported``
+        itself or any class with the same bare name decides; within it, the
+        exact name wins over the first same-named class.
+        """
+        candidates = self.classes_by_suffix.get(imported.split(".")[-1])
+        if not candidates:
+            return None
+        first_module = candidates[0][0]
+        if imported in self.table.modules[first_module].classes:
+            return imported
+        name: str = candidates[0][1]
+        return name
+
+    def class_by_short_name(self, short: str) -> Optional[str]:
+        """The first class (in project order) whose bare name is ``short``."""
+        candidates = self.classes_by_suffix.get(short)
+        return candidates[0][1] if candidates else None
+
+    def resolve_class(
+        self, module_name: str, class_name: str, module: Optional[ModuleSymbols] = None
+    ) -> Optional[str]:
+        """The project class ``class_name`` refers to when written in ``module_name``."""
+        key = (module_name, class_name)
+        if key in self._class_names:
+            return self._class_names[key]
+        if module is None:
+            module = self.table.modules[module_name]
+
+        result: Optional[str] = None
+        if class_name in self.classes:
+            result = class_name
+        if result is None and class_name in module.import_map:
+            # Only accept if it names a known project class (exactly or by tail).
+            result = self.imported_class(module.import_map[class_name])
+        if result is None:
+            local_class = f"{module_name}.{class_name}"
+            if local_class in module.classes:
+                result = local_class
+        if result is None:
+            # Match by bare class short-name across the project (last resort).
+            result = self.class_by_short_name(class_name.split(".")[-1])
+
+        self._class_names[key] = result
+        return result
+
+    def bases(self, class_q: str) -> List[str]:
+        """``class_q``'s resolvable project bases, resolved where it is defined."""
+        info = self.classes.get(class_q)
+        if info is None:
+            return []
+        module_name = self.class_modules[class_q]
+        resolved: List[str] = []
+        for b in info.bases:
+            bq = self.resolve_class(module_name, b)
+            if bq and bq not in resolved:
+                resolved.append(bq)
+        return resolved
+
+    def mro(self, class_q: str) -> Tuple[str, ...]:
+        """``class_q`` followed by its project ancestors in lookup order."""
+        cached = self._mros.get(class_q)
+        if cached is not None:
+            return cached
+        if class_q not in self.classes:
+            return ()
+
+        bases = self.bases(class_q)
+        self._linearizing.add(class_q)
+        try:
+            parents = [self.mro(b) for b in bases if b not in self._linearizing]
+        finally:
+            self._linearizing.discard(class_q)
+
+        merged: Optional[List[str]] = None
+        if len(parents) == len(bases) and not any(b in self._cyclic for b in bases):
+            merged = _c3_merge([list(p) for p in parents] + [list(bases)])
+        else:
+            self._cyclic.add(class_q)
+        result = (class_q,) + tuple(merged) if merged is not None else self._bfs(class_q)
+        self._mros[class_q] = result
+        return result
+
+    def _bfs(self, class_q: str) -> Tuple[str, ...]:
+        """Breadth-first ancestor order; used when C3 cannot linearize."""
+        order: List[str] = []
+        seen: Set[str] = set()
+        queue = deque([class_q])
+        while queue:
+            cq = queue.popleft()
+            if cq in seen:
+                continue
+            seen.add(cq)
+            order.append(cq)
+            queue.extend(b for b in self.bases(cq) if b not in seen)
+        return tuple(order)
+
+    def find_method(
+        self, class_q: str, method_name: str, start_at_base: bool = False
+    ) -> Optional[str]:
+        """Resolve ``method_name`` on ``class_q`` through its MRO.
+
+        Returns the qualified target if found (in the class or any resolvable
+        ancestor), else ``None``. When ``start_at_base`` is set the class
+        itself is skipped (used for ``super()``).
+        """
+        key = (class_q, method_name, start_at_base)
+        if key in self._methods:
+            self.method_hits += 1
+            return self._methods[key]
+        self.method_misses += 1
+
+        found: Optional[str] = None
+        for cq in self.mro(class_q)[1 if start_at_base else 0 :]:
+            if method_name in self.classes[cq].methods:
+                found = f"{cq}.{method_name}"
+                break
+        self._methods[key] = found
+        return found
+
+
+def _c3_merge(sequences: List[List[str]]) -> Optional[List[str]]:
+    """C3 linearization merge; ``None`` if the hierarchy is inconsistent."""
+    result: List[str] = []
+    sequences = [seq for seq in sequences if seq]
+    while sequences:
+        for seq in sequences:
+            head = seq[0]
+            if not any(head in other[1:] for other in sequences):
+                break
+        else:
+            return None
+        result.append(head)
+        sequences = [[c for c in seq if c != head] for seq in sequences]
+        sequences = [seq for seq in sequences if seq]
+    return result
@@ -0,0 +1,130 @@
+"""
+Single-pass module analysis.
+
+:class:`ModuleAnalyzer` collects imports and definitions in two walks and
+:class:`FunctionCallVisitor` records call sites in a third. The walker here
+does all three in one traversal: imports and definitions are recorded as
+their statements are reached, call sites as before, and resolution is left
+to the pure-data :class:`CallResolver` phase.
+
+One subtlety keeps the result identical to the three-walk pipeline. Call-site
+recording consults module-wide tables (the import map and local classes, to
+type ``x = Foo()``; the function table, to seed annotated parameter types)
+that a single pass has only partly filled -- an import at the bottom of the
+file, or a later redefinition, is not seen yet. The walker notes every such
+read and checks it against the finished tables afterwards; in the rare
+module where one changed, call sites are re-collected with a plain
+:class:`FunctionCallVisitor` walk.
+"""
+
+import ast
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pyvisualizer.core.analyzer import (
+    CallSite,
+    DefinitionCollector,
+    FunctionInfo,
+    ModuleAnalyzer,
+    _Scope,
+)
+from pyvisualizer.core.graph import FunctionCallVisitor
+
+
+class ModuleWalker(FunctionCallVisitor):
+    """Fused import/definition/call-site walker for one module."""
+
+    # Node type -> unbound visit method, shared by all walkers.
+    _handlers: Dict[type, Callable[..., Any]] = {}
+
+    def __init__(self, analyzer: ModuleAnalyzer):
+        super().__init__(analyzer.module_name, analyzer.file_path, analyzer, {}, set())
+        self.definitions = DefinitionCollector(analyzer)
+        # Reads of not-yet-final module tables, re-checked after the walk.
+        self._seed_reads: List[Tuple[str, Optional[FunctionInfo]]] = []
+        self._target_reads: List[Tuple[str, str]] = []
+
+    def walk(self, tree: ast.AST) -> List[CallSite]:
+        """Analyze ``tree`` into the analyzer; return (and store) its call sites."""
+        self.visit(tree)
+        sites = self.sites
+        if not self._reads_are_final():
+            visitor = FunctionCallVisitor(
+                self.module_name, self.file_path, self.module_analyzer, {}, set()
+            )
+            visitor.visit(tree)
+            sites = visitor.sites
+        self.module_analyzer.call_sites = sites
+        return sites
+
+    def _reads_are_final(self) -> bool:
+        functions = self.module_analyzer.functions
+        if any(functions.get(name) is not info for name, info in self._seed_reads):
+            return False
+        return all(
+            FunctionCallVisitor._name_call_target(self, name) == target
+            for name, target in self._target_reads
+        )
+
+    # -------------------------------------------------------------- dispatch
+    def visit(self, node: ast.AST) -> Any:
+        cls = node.__class__
+        handler = self._handlers.get(cls)
+        if handler is None:
+            found: Callable[..., Any] = getattr(
+                type(self), f"visit_{cls.__name__}", type(self).generic_visit
+            )
+            handler = self._handlers[cls] = found
+        return handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+
+    # --------------------------------------------------------------- imports
+    def visit_Import(self, node: ast.Import) -> None:
+        self.module_analyzer.imports.record_import(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        self.module_analyzer.imports.record_import_from(node)
+
+    # ----------------------------------------------------------- definitions
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        qualified = self.definitions.record_class(node)
+        self.definitions.scope_stack.append(_Scope("class", qualified, qualified))
+        super().visit_ClassDef(node)
+        self.definitions.scope_stack.pop()
+
+    def _visit_function_common(self, node: Any) -> None:
+        is_async = isinstance(node, ast.AsyncFunctionDef)
+        qualified, class_qualified = self.definitions.record_function(node, is_async)
+        self.definitions.scope_stack.append(_Scope("function", qualified, class_qualified))
+        super()._visit_function_common(node)
+        self.definitions.scope_stack.pop()
+
+    # ----------------------------------------------------- table reads (noted)
+    def _seed_param_types(self, node: Any) -> None:
+        name = self.current_function or ""
+        self._seed_reads.append((name, self.module_analyzer.functions.get(name)))
+        super()._seed_param_types(node)
+
+    def _name_call_target(self, target_name: str) -> str:
+        target = super()._name_call_target(target_name)
+        self._target_reads.append((target_name, target))
+        return target
+
+
+def analyze_module(
+    module_name: str, file_path: str, tree: ast.AST, project_root: str
+) -> ModuleAnalyzer:
+    """Collect imports, definitions and raw call sites in a single walk."""
+    analyzer = ModuleAnalyzer(module_name, file_path, None, project_root)
+    analyzer.tree = tree
+    ModuleWalker(analyzer).walk(tree)
+    return analyzer
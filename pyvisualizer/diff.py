@@ -15,6 +15,13 @@ from typing import Any, Callable, Dict, List, Set, Tuple
 
 import networkx as nx
 
+from pyvisualizer.core.cycles import (
+    DEFAULT_MAX_CYCLES,
+    cycle_rank,
+    cyclic_components,
+    find_simple_cycles,
+)
+
 Edge = Tuple[str, str]
 
 
@@ -27,20 +34,55 @@ def _graph_from_json(data: Dict[str, Any]) -> nx.DiGraph:
     return G
 
 
-def _cycle_keys(G: nx.DiGraph) -> Set[Tuple[str, ...]]:
-    """Return canonical keys for each elementary cycle (rotation-invariant)."""
-    keys: Set[Tuple[str, ...]] = set()
-    try:
-        for cycle in nx.simple_cycles(G):
-            if len(cycle) < 2:
-                continue
-            # Rotate so the lexicographically smallest node is first.
-            i = cycle.index(min(cycle))
-            rotated = tuple(cycle[i:] + cycle[:i])
-            keys.add(rotated)
-    except Exception:  # pragma: no cover - defensive
-        pass
-    return keys
+def _enumerate_cycles(G: nx.DiGraph, nodes: Set[str]) -> Tuple[List[Tuple[str, ...]], bool]:
+    """Bounded elementary cycles among ``nodes``, and whether the bounds bit.
+
+    Each cycle starts at its smallest node, so it is rotation-invariant. The
+    flag is set when the enumeration stopped at ``DEFAULT_MAX_CYCLES`` or
+    returned fewer cycles than :func:`cycle_rank` proves exist (some were
+    longer than ``DEFAULT_MAX_CYCLE_LENGTH``).
+    """
+    sub = G.subgraph(nodes)
+    components = cyclic_components(sub)
+    cycles = find_simple_cycles(sub, components=components)
+    truncated = len(cycles) >= DEFAULT_MAX_CYCLES or len(cycles) < cycle_rank(sub, components)
+    return [tuple(cycle) for cycle in cycles], truncated
+
+
+def _missing_from(cycles: List[Tuple[str, ...]], G: nx.DiGraph) -> List[Tuple[str, ...]]:
+    """The ``cycles`` that are not cycles of ``G`` (one of their edges is gone).
+
+    Checked edge by edge rather than against ``G``'s own enumeration: both
+    enumerations are capped, so a cycle absent from one of them may well
+    still exist.
+    """
+    missing = []
+    for cycle in cycles:
+        if not all(G.has_edge(s, t) for s, t in zip(cycle, cycle[1:] + cycle[:1])):
+            missing.append(cycle)
+    return sorted(missing)
+
+
+def _changed_cycle_nodes(
+    gb: nx.DiGraph,
+    gh: nx.DiGraph,
+    base_components: List[List[str]],
+    head_components: List[List[str]],
+) -> Set[str]:
+    """Nodes of the cyclic components that differ between ``gb`` and ``gh``.
+
+    A component with the same nodes and internal edges on both sides has
+    exactly the same cycles on both, so only the others need enumerating.
+    """
+
+    def signature(G: nx.DiGraph, component: List[str]) -> Tuple:
+        members = set(component)
+        internal = sorted((s, t) for s in component for t in G.succ[s] if t in members)
+        return tuple(component), tuple(internal)
+
+    base = {signature(gb, c) for c in base_components}
+    head = {signature(gh, c) for c in head_components}
+    return {node for nodes, _ in base ^ head for node in nodes}
 
 
 @dataclass
@@ -51,6 +93,13 @@ class DiffResult:
     removed_edges: List[Edge] = field(default_factory=list)
     new_cycles: List[Tuple[str, ...]] = field(default_factory=list)
     resolved_cycles: List[Tuple[str, ...]] = field(default_factory=list)
+    #: Set when the cycle enumeration was capped on either side, so
+    #: ``new_cycles`` and ``resolved_cycles`` may be incomplete; the
+    #: ``cycle_rank`` and ``cyclic_functions`` stats are always exact.
+    cycles_truncated: bool = False
+    #: Functions that joined or left a cycle (strongly connected component).
+    entered_cycles: List[str] = field(default_factory=list)
+    left_cycles: List[str] = field(default_factory=list)
     base_stats: Dict[str, int] = field(default_factory=dict)
     head_stats: Dict[str, int] = field(default_factory=dict)
     base_grade: str = ""
@@ -96,25 +145,37 @@ def diff_graphs(base: Dict[str, Any], head: Dict[str, Any]) -> DiffResult:
     base_edges: Set[Edge] = set(gb.edges())
     head_edges: Set[Edge] = set(gh.edges())
 
-    base_cycles = _cycle_keys(gb)
-    head_cycles = _cycle_keys(gh)
+    base_components = cyclic_components(gb)
+    head_components = cyclic_components(gh)
+    base_cyclic = {n for c in base_components for n in c}
+    head_cyclic = {n for c in head_components for n in c}
+    changed = _changed_cycle_nodes(gb, gh, base_components, head_components)
+    base_cycles, base_truncated = _enumerate_cycles(gb, changed)
+    head_cycles, head_truncated = _enumerate_cycles(gh, changed)
 
     result = DiffResult(
         added_functions=sorted(head_nodes - base_nodes),
         removed_functions=sorted(base_nodes - head_nodes),
         added_edges=sorted(head_edges - base_edges),
         removed_edges=sorted(base_edges - head_edges),
-        new_cycles=sorted(head_cycles - base_cycles),
-        resolved_cycles=sorted(base_cycles - head_cycles),
+        new_cycles=_missing_from(head_cycles, gb),
+        resolved_cycles=_missing_from(base_cycles, gh),
+        cycles_truncated=base_truncated or head_truncated,
+        entered_cycles=sorted(head_cyclic - base_cyclic),
+        left_cycles=sorted(base_cyclic - head_cyclic),
         base_stats={
             "nodes": gb.number_of_nodes(),
             "edges": gb.number_of_edges(),
             "cross_module_edges": _cross_module_edges(gb),
+            "cycle_rank": cycle_rank(gb, base_components),
+            "cyclic_functions": len(base_cyclic),
         },
         head_stats={
             "nodes": gh.number_of_nodes(),
             "edges": gh.number_of_edges(),
             "cross_module_edges": _cross_module_edges(gh),
+            "cycle_rank": cycle_rank(gh, head_components),
+            "cyclic_functions": len(head_cyclic),
         },
         base_grade=hb.grade,
         head_grade=hh.grade,
@@ -211,6 +272,12 @@ def render_markdown(
     if diff.resolved_cycles:
         md.append(f"### 🟢 Resolved {len(diff.resolved_cycles)} cycle(s)")
         md.append("")
+    if diff.cycles_truncated and (diff.new_cycles or diff.resolved_cycles):
+        md.append(
+            f"_Cycle lists are capped at {DEFAULT_MAX_CYCLES} per side; "
+            "the cycle rank below is exact._"
+        )
+        md.append("")
 
     # Summary table.
     b, h = diff.base_stats, diff.head_stats
@@ -220,6 +287,8 @@ def render_markdown(
         ("Functions", "nodes"),
         ("Call edges", "edges"),
         ("Cross-module edges", "cross_module_edges"),
+        ("Cycle rank", "cycle_rank"),
+        ("Functions on cycles", "cyclic_functions"),
     ]:
         bv, hv = b.get(key, 0), h.get(key, 0)
         delta = hv - bv
@@ -246,6 +315,8 @@ def render_markdown(
     _list_section(
         "✂️ Removed calls", diff.removed_edges, lambda e: f"`{_short(e[0])}` → `{_short(e[1])}`"
     )
+    _list_section("🔁 Functions now on a cycle", diff.entered_cycles, lambda n: f"`{n}`")
+    _list_section("🔓 Functions no longer on a cycle", diff.left_cycles, lambda n: f"`{n}`")
 
     if include_diagram and (diff.added_edges or diff.removed_edges):
         md.append("### Changed neighborhood")
@@ -16,16 +16,17 @@ from typing import Dict, List, Tuple
 import networkx as nx
 
 from pyvisualizer.api import GraphResult
+from pyvisualizer.core.graph_analysis import graph_analysis
 from pyvisualizer.gates import find_cycles
 from pyvisualizer.metrics import compute_health, find_dead_code
 from pyvisualizer.serializers.json_graph import graph_to_dict
 
 
 def _entry_points(G: nx.DiGraph) -> List[str]:
-    from pyvisualizer.metrics import _is_entry_point
-
-    eps = [n for n in G.nodes() if _is_entry_point(n, G.nodes[n]) and G.out_degree(n) > 0]
-    eps.sort(key=lambda n: G.out_degree(n), reverse=True)
+    analysis = graph_analysis(G)
+    out_degree = analysis.out_degree
+    eps = [n for n in analysis.entry_points if out_degree[n] > 0]
+    eps.sort(key=lambda n: out_degree[n], reverse=True)
     return eps
 
 
@@ -18,6 +18,8 @@ from typing import List, Optional, Tuple
 import networkx as nx
 
 from pyvisualizer.config import Rules
+from pyvisualizer.core.cycles import DEFAULT_MAX_CYCLE_LENGTH, DEFAULT_MAX_CYCLES
+from pyvisualizer.core.graph_analysis import graph_analysis
 from pyvisualizer.core.model import CONFIDENCE_AMBIGUOUS
 
 
@@ -80,27 +82,25 @@ def check_layer_rules(G: nx.DiGraph, rules: Rules) -> List[Violation]:
     return violations
 
 
-def find_cycles(G: nx.DiGraph, *, ignore_ambiguous: bool = True) -> List[List[str]]:
-    """Return elementary cycles (optionally ignoring ambiguous-only edges)."""
-    if ignore_ambiguous:
-        H = nx.DiGraph()
-        H.add_nodes_from(G.nodes())
-        for s, t, d in G.edges(data=True):
-            if d.get("confidence") != CONFIDENCE_AMBIGUOUS:
-                H.add_edge(s, t)
-        source = H
-    else:
-        source = G
-
-    cycles: List[List[str]] = []
-    try:
-        for cycle in nx.simple_cycles(source):
-            if len(cycle) >= 2:
-                cycles.append(cycle)
-    except Exception:  # pragma: no cover - defensive
-        pass
-    cycles.sort(key=lambda c: (len(c), c))
-    return cycles
+def find_cycles(
+    G: nx.DiGraph,
+    *,
+    ignore_ambiguous: bool = True,
+    max_length: Optional[int] = DEFAULT_MAX_CYCLE_LENGTH,
+    max_cycles: Optional[int] = DEFAULT_MAX_CYCLES,
+) -> List[List[str]]:
+    """Return elementary cycles (optionally ignoring ambiguous-only edges).
+
+    Bounded and deterministic (see :func:`~pyvisualizer.core.cycles.find_simple_cycles`):
+    each cycle starts at its smallest node, and the result is empty iff
+    there is no cycle at all, whatever the bounds. Shared with every other
+    caller through the graph's :class:`~pyvisualizer.core.graph_analysis.GraphAnalysis`,
+    so each cycle comes back as a fresh copy.
+    """
+    cycles = graph_analysis(G).cycles(
+        ignore_ambiguous=ignore_ambiguous, max_length=max_length, max_cycles=max_cycles
+    )
+    return [list(cycle) for cycle in cycles]
 
 
 def cycle_violations(G: nx.DiGraph) -> List[Violation]:
@@ -9,10 +9,14 @@ the blast radius; transitive callees are the dependency footprint.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Sequence, Set
 
 import networkx as nx
 
+from pyvisualizer.core.csr import reachable
+from pyvisualizer.core.graph_analysis import graph_analysis
+from pyvisualizer.core.reachability import iter_bits
+
 
 @dataclass
 class ImpactResult:
@@ -31,16 +35,7 @@ class ImpactResult:
 
 def resolve_target(G: nx.DiGraph, target: str) -> Optional[str]:
     """Resolve a user-supplied target to a node id (exact or suffix match)."""
-    if target in G:
-        return target
-    matches: List[str] = [n for n in G.nodes() if n.endswith("." + target) or n == target]
-    if len(matches) == 1:
-        return matches[0]
-    # Prefer an exact short-name match if unique.
-    short_matches: List[str] = [n for n in G.nodes() if n.split(".")[-1] == target]
-    if len(short_matches) == 1:
-        return short_matches[0]
-    return None
+    return graph_analysis(G).node_index.resolve(target)
 
 
 def analyze_impact(G: nx.DiGraph, target: str) -> ImpactResult:
@@ -48,8 +43,9 @@ def analyze_impact(G: nx.DiGraph, target: str) -> ImpactResult:
     if node is None:
         return ImpactResult(target=target, found=False)
 
-    ancestors: Set[str] = nx.ancestors(G, node)
-    descendants: Set[str] = nx.descendants(G, node)
+    analysis = graph_analysis(G)
+    ancestors: Set[str] = analysis.ancestors(node)
+    descendants: Set[str] = analysis.descendants(node)
 
     modules = {G.nodes[n].get("module", "") for n in ancestors | descendants | {node}}
     modules.discard("")
@@ -65,6 +61,127 @@ def analyze_impact(G: nx.DiGraph, target: str) -> ImpactResult:
     )
 
 
+@dataclass
+class BatchImpactResult:
+    """Impact of touching several functions at once.
+
+    ``results`` holds one :class:`ImpactResult` per requested target, in
+    request order. The union fields cover every found target together and
+    leave the targets themselves out: ``transitive_callers`` is what calls
+    into the change from outside it.
+    """
+
+    results: List[ImpactResult] = field(default_factory=list)
+    transitive_callers: List[str] = field(default_factory=list)
+    transitive_callees: List[str] = field(default_factory=list)
+    modules_affected: List[str] = field(default_factory=list)
+
+    @property
+    def blast_radius(self) -> int:
+        return len(self.transitive_callers)
+
+
+def analyze_impact_many(
+    G: nx.DiGraph, targets: Sequence[str], *, per_target: bool = True
+) -> BatchImpactResult:
+    """:func:`analyze_impact` for many targets in one sweep each way.
+
+    Rather than one search per target, a single pass over the condensation
+    (the DAG of strongly connected components) carries a bitmask of the
+    targets that reach each component, so the union *and* the attribution
+    back to each target fall out of one traversal. With ``per_target=False``
+    only the union is filled in -- by a plain multi-source search, with no
+    condensation needed -- and ``results`` carries just ``found``.
+    """
+    index = graph_analysis(G).node_index
+    nodes: Dict[str, Optional[str]] = {t: index.resolve(t) for t in targets}
+    found = sorted({n for n in nodes.values() if n is not None})
+
+    found_set = set(found)
+    if per_target:
+        callers = _sweep(G, found, upward=True)
+        callees = _sweep(G, found, upward=False)
+    else:
+        callers = dict.fromkeys(reachable(G, found, forward=False), 0)
+        callees = dict.fromkeys(reachable(G, found, forward=True), 0)
+    batch = BatchImpactResult(
+        transitive_callers=sorted(set(callers) - found_set),
+        transitive_callees=sorted(set(callees) - found_set),
+    )
+    module = {n: G.nodes[n].get("module", "") for n in found_set.union(callers, callees)}
+    batch.modules_affected = sorted(set(module.values()) - {""})
+
+    ancestors: Dict[str, List[str]] = {n: [] for n in found}
+    descendants: Dict[str, List[str]] = {n: [] for n in found}
+    if per_target:
+        for reached, per in ((callers, ancestors), (callees, descendants)):
+            for n, mask in reached.items():
+                for i in iter_bits(mask):
+                    if found[i] != n:
+                        per[found[i]].append(n)
+
+    for target, node in nodes.items():
+        if node is None:
+            batch.results.append(ImpactResult(target=target, found=False))
+        elif not per_target:
+            batch.results.append(ImpactResult(target=node, found=True))
+        else:
+            mods = {module[n] for n in ancestors[node]}
+            mods.update(module[n] for n in descendants[node])
+            mods.add(module[node])
+            mods.discard("")
+            batch.results.append(
+                ImpactResult(
+                    target=node,
+                    found=True,
+                    direct_callers=sorted(G.predecessors(node)),
+                    direct_callees=sorted(G.successors(node)),
+                    transitive_callers=sorted(ancestors[node]),
+                    transitive_callees=sorted(descendants[node]),
+                    modules_affected=sorted(mods),
+                )
+            )
+    return batch
+
+
+def _sweep(G: nx.DiGraph, targets: List[str], *, upward: bool) -> Dict[str, int]:
+    """Node -> bitmask of the ``targets`` it is reached from (callers if ``upward``).
+
+    Bit ``i`` stands for ``targets[i]``. Every node that some target reaches
+    is present, and so is every target (with at least its own bit).
+    """
+    C = graph_analysis(G).condensation
+    mapping = C.graph["mapping"]
+    step = C.predecessors if upward else C.successors
+    back = C.successors if upward else C.predecessors
+
+    mask: Dict[int, int] = {}
+    for i, n in enumerate(targets):
+        c = mapping[n]
+        mask[c] = mask.get(c, 0) | (1 << i)
+    reached = set(mask)
+    stack = list(mask)
+    while stack:
+        for d in step(stack.pop()):
+            if d not in reached:
+                reached.add(d)
+                stack.append(d)
+
+    # Push masks along the DAG in topological order, restricted to what was
+    # reached: a component is final once everything leading into it is.
+    pending = {c: sum(1 for d in back(c) if d in reached) for c in reached}
+    ready = [c for c in reached if not pending[c]]
+    while ready:
+        c = ready.pop()
+        m = mask.get(c, 0)
+        for d in step(c):
+            mask[d] = mask.get(d, 0) | m
+            pending[d] -= 1
+            if not pending[d]:
+                ready.append(d)
+    return {n: mask[c] for c in reached for n in C.nodes[c]["members"]}
+
+
 def risk_line(result: ImpactResult) -> str:
     """One-line risk summary suitable for a PR comment."""
     if not result.found:
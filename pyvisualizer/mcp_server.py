@@ -11,7 +11,12 @@ the same engine as the CLI through three deliberately few, high-signal tools:
 
 The server is long-lived, so the graph and the search index are built lazily
 and cached in memory, invalidated by a fingerprint of the project's Python
-files (path, mtime, size). Nothing is written to disk and no code is executed —
+files (path, mtime, size); the graph and the index are then updated in
+place for just the files that changed. Personalized PageRank vectors are kept in an LRU keyed
+by that fingerprint, so repeated focus sets skip the walk; packs are ranked
+exactly as the CLI ranks them unless ``--ppr-epsilon`` or
+``--compose-pagerank`` trades that for speed.
+Nothing is written to disk and no code is executed —
 same guarantees as the CLI.
 
 The ``mcp`` SDK (Python ≥3.10) is an optional extra: ``pip install
@@ -25,43 +30,115 @@ import argparse
 import hashlib
 import os
 import sys
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pyvisualizer.api import GraphResult, build_graph
-from pyvisualizer.retrieval import BM25Index, build_bm25
+from pyvisualizer.core.graph_analysis import graph_analysis
+from pyvisualizer.core.pagerank import PageRankCache
+from pyvisualizer.retrieval import BM25Index, build_bm25, update_bm25
 from pyvisualizer.utils.file_discovery import find_project_python_files, parse_python_file
 
 
 class ProjectSession:
-    """Lazily-built, fingerprint-invalidated graph + search index for one project."""
-
-    def __init__(self, project_root: str) -> None:
+    """Lazily-built, fingerprint-invalidated graph + search index for one project.
+
+    The graph is built once and then updated in place: each file is
+    fingerprinted individually (mtime, size), so a rebuild re-analyzes only
+    the files that changed, were added or were deleted since the last one,
+    and re-indexes only the functions defined in them.
+
+    ``ppr_epsilon`` ranks packs by local push PageRank instead of the exact
+    iteration, and ``compose_pagerank`` builds multi-node focus vectors from
+    cached single-node ones (see
+    :class:`~pyvisualizer.core.pagerank.PageRankCache`). Both are off by
+    default, so the server's packs match the CLI's exactly.
+    """
+
+    def __init__(
+        self,
+        project_root: str,
+        *,
+        ppr_epsilon: Optional[float] = None,
+        compose_pagerank: bool = False,
+    ) -> None:
         self.project_root = os.path.abspath(project_root)
+        self.ppr_epsilon = ppr_epsilon
+        self.compose_pagerank = compose_pagerank
         self._fingerprint: Optional[str] = None
+        self._stats: Dict[str, Tuple[int, int]] = {}
         self._graph: Optional[GraphResult] = None
         self._bm25: Optional[BM25Index] = None
+        self._pagerank = PageRankCache()
 
-    def _current_fingerprint(self) -> str:
-        h = hashlib.sha256()
+    def _current_stats(self) -> Dict[str, Tuple[int, int]]:
+        stats: Dict[str, Tuple[int, int]] = {}
         for path in find_project_python_files(self.project_root):
             try:
                 st = os.stat(path)
             except OSError:
                 continue
-            h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
-        return h.hexdigest()
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
 
     def get(self) -> Tuple[GraphResult, BM25Index]:
-        fp = self._current_fingerprint()
+        stats = self._current_stats()
+        fp = _fingerprint(stats)
         if self._graph is None or self._bm25 is None or fp != self._fingerprint:
             # parse_python_file caches ASTs by path; a long-lived server must
             # drop that cache or a rebuild would re-serve stale parses.
             parse_python_file.cache_clear()
-            self._graph = build_graph(self.project_root)
-            self._bm25 = build_bm25(self._graph.graph)
+            if self._graph is None or self._bm25 is None:
+                self._graph = build_graph(self.project_root, incremental=True)
+                self._bm25 = build_bm25(self._graph.graph)
+            else:
+                changed = {
+                    p
+                    for p in stats.keys() | self._stats.keys()
+                    if stats.get(p) != self._stats.get(p)
+                }
+                self._graph = build_graph(self.project_root, previous=self._graph, changed=changed)
+                # Re-tokenize only the functions of the files that changed.
+                update_bm25(self._bm25, self._graph.graph, changed)
             self._fingerprint = fp
+            self._stats = stats
         return self._graph, self._bm25
 
+    def pagerank(
+        self, focus: List[str], *, alpha: float = 0.85, bidirectional: bool = True
+    ) -> Dict[str, float]:
+        """Cached personalized PageRank over the graph of the last :meth:`get`.
+
+        Vectors are keyed by the project fingerprint, so an edit to any file
+        retires them. With ``compose_pagerank``, a multi-node focus is
+        composed from single-node vectors, but only while no node of the walk
+        is dangling; otherwise it is walked jointly, as it is by default.
+        """
+        from pyvisualizer.context import personalized_pagerank
+
+        result = self._graph
+        if result is None:
+            result, _ = self.get()
+        G = result.graph
+        epsilon = self.ppr_epsilon
+        compose = (
+            self.compose_pagerank and not graph_analysis(G).pagerank_graph(bidirectional).dangling
+        )
+        return self._pagerank.scores(
+            (self._fingerprint, alpha, bidirectional, epsilon),
+            focus,
+            lambda seeds: personalized_pagerank(
+                G, seeds, alpha=alpha, bidirectional=bidirectional, epsilon=epsilon
+            ),
+            compose=compose,
+        )
+
+
+def _fingerprint(stats: Dict[str, Tuple[int, int]]) -> str:
+    h = hashlib.sha256()
+    for path, (mtime_ns, size) in stats.items():
+        h.update(f"{path}\0{mtime_ns}\0{size}\n".encode())
+    return h.hexdigest()
+
 
 def tool_search_code(session: ProjectSession, query: str, k: int = 10) -> str:
     """Lexical search over every function's qualified name, file, and source."""
@@ -98,6 +175,8 @@ def tool_context_pack(
             budget_tokens=max(200, int(budget_tokens)),
             task=task or None,
             strategy=strategy or None,
+            # Reuse vectors across calls on the same graph.
+            ranker=session.pagerank,
         )
     except ValueError as e:
         return f"Cannot build pack: {e}"
@@ -158,6 +237,19 @@ def main(argv: Optional[list] = None) -> int:
         description="MCP server exposing a Python project's verified call graph to agents",
     )
     parser.add_argument("path", nargs="?", default=".", help="Project root (default: cwd)")
+    parser.add_argument(
+        "--ppr-epsilon",
+        dest="ppr_epsilon",
+        type=float,
+        help="Rank packs by local push PageRank to this residual (e.g. 1e-5) instead of the "
+        "exact whole-graph iteration; faster on very large projects",
+    )
+    parser.add_argument(
+        "--compose-pagerank",
+        action="store_true",
+        help="Build multi-function focus rankings from cached single-function ones "
+        "(used only while no function is a dead end of the walk)",
+    )
     args = parser.parse_args(argv)
 
     if sys.version_info < (3, 10):
@@ -177,7 +269,9 @@ def main(argv: Optional[list] = None) -> int:
         )
         return 1
 
-    session = ProjectSession(args.path)
+    session = ProjectSession(
+        args.path, ppr_epsilon=args.ppr_epsilon, compose_pagerank=args.compose_pagerank
+    )
     app = FastMCP("pyvisualizer")
     _register(app, session)
     app.run()
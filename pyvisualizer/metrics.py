@@ -9,21 +9,14 @@ same code always yields the same grade, and PR diffs can report grade movement.
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Set
 
 import networkx as nx
 
+from pyvisualizer.core.graph_analysis import graph_analysis
 from pyvisualizer.core.model import CONFIDENCE_AMBIGUOUS
 
-# Decorators that mark framework-registered entry points (called externally).
-_ENTRY_DECORATOR = re.compile(
-    r"(route|get|post|put|patch|delete|task|command|cli|fixture|"
-    r"app\.|router\.|celery|click|api\.|websocket|on_event|handler|listener)",
-    re.IGNORECASE,
-)
-_ENTRY_NAMES = {"main", "__main__", "run", "cli"}
 _GOD_DEGREE = 20
 
 
@@ -33,7 +26,7 @@ class HealthReport:
     grade: str
     components: Dict[str, int] = field(default_factory=dict)
     god_nodes: List[str] = field(default_factory=list)
-    num_cycles: int = 0
+    num_cycles: int = 0  # independent cycles (see core.cycles.cycle_rank)
     orphan_count: int = 0
     cross_module_ratio: float = 0.0
     ambiguous_ratio: float = 0.0
@@ -72,19 +65,6 @@ def _grade(score: int) -> str:
     return "F"
 
 
-def _is_entry_point(node: str, data: Dict) -> bool:
-    name = data.get("name", node.split(".")[-1])
-    if name in _ENTRY_NAMES:
-        return True
-    if name.startswith("__") and name.endswith("__"):
-        return True  # dunders are called implicitly
-    for dec in data.get("decorator_names", []) or data.get("decorators", []):
-        dec_name = dec if isinstance(dec, str) else dec.get("name", "")
-        if _ENTRY_DECORATOR.search(dec_name or ""):
-            return True
-    return False
-
-
 def compute_health(G: nx.DiGraph) -> HealthReport:
     """Compute a deterministic architecture health report for ``G``."""
     n = G.number_of_nodes()
@@ -103,24 +83,24 @@ def compute_health(G: nx.DiGraph) -> HealthReport:
     cross_ratio = cross / e if e else 0.0
     amb_ratio = ambiguous / e if e else 0.0
 
-    # Cycles.
-    try:
-        num_cycles = sum(1 for c in nx.simple_cycles(G) if len(c) >= 2)
-    except Exception:
-        num_cycles = 0
+    analysis = graph_analysis(G)
+    in_degree = analysis.in_degree
+    out_degree = analysis.out_degree
+
+    # Cycles: independent loops, not every elementary cycle (exponential).
+    num_cycles = analysis.cycle_rank
 
     # God nodes: unusually high total degree (hub risk).
     god_nodes = sorted(
-        node for node in G.nodes() if (G.in_degree(node) + G.out_degree(node)) >= _GOD_DEGREE
+        node for node in G.nodes() if in_degree[node] + out_degree[node] >= _GOD_DEGREE
     )
 
     # Orphans: no calls in or out, and not a plausible entry point.
+    entry_points = set(analysis.entry_points)
     orphans = [
         node
         for node in G.nodes()
-        if G.in_degree(node) == 0
-        and G.out_degree(node) == 0
-        and not _is_entry_point(node, G.nodes[node])
+        if in_degree[node] == 0 and out_degree[node] == 0 and node not in entry_points
     ]
     orphan_ratio = len(orphans) / n
 
@@ -158,19 +138,12 @@ def find_dead_code(G: nx.DiGraph) -> List[str]:
     may still be public API called from outside the analyzed tree, so callers
     should treat this as a review list, not a delete list.
     """
-    entry_points: Set[str] = {node for node in G.nodes() if _is_entry_point(node, G.nodes[node])}
-    # Anything with callers is reachable in principle.
-    reachable: Set[str] = set(entry_points)
-    for ep in entry_points:
-        reachable |= nx.descendants(G, ep)
-
-    dead = [
-        node
-        for node in G.nodes()
-        if node not in reachable
-        and G.in_degree(node) == 0
-        and not _is_entry_point(node, G.nodes[node])
-    ]
+    analysis = graph_analysis(G)
+    in_degree = analysis.in_degree
+    # Anything with callers is reachable in principle, so only uncalled
+    # non-entry-points remain (nothing reaches a node without callers).
+    entry_points: Set[str] = set(analysis.entry_points)
+    dead = [node for node in G.nodes() if in_degree[node] == 0 and node not in entry_points]
     return sorted(dead)
 
 
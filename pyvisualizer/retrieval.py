@@ -23,21 +23,56 @@ and callers must label them as such (the context pack does).
 
 from __future__ import annotations
 
+import hashlib
+import heapq
+import logging
 import math
+import mmap
 import os
 import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
 from collections import Counter
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
 import networkx as nx
 
+logger = logging.getLogger("pyvisualizer.retrieval")
+
 _TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# The words inside an identifier: acronyms, Capitalized, lower, and digit runs.
+_WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z][a-z]*|[a-z]+|\d+")
+# Distinct identifiers whose split _token_words remembers.
+_SPLIT_CACHE_SIZE = 1 << 16
 
 # Identifier-ish tokens in prose: snake_case, CamelCase, and dotted paths.
 _IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
 _BACKTICK_RE = re.compile(r"`([^`]+)`")
 _MIN_LEN = 4
 
+# Slack on score upper bounds in top-k pruning. Bounds and scores are summed
+# in different orders, so a bound may undershoot its score by a few ulps; a
+# document is dropped only when even this margin cannot lift it to the k-th
+# score, which also keeps it strictly below after rounding to 12 places.
+_BOUND_SLACK = 1.0e-9
+
+# On-disk index layout (BM25Index.save/load). Bump _FORMAT whenever it, or the
+# way documents are tokenized, changes so old files are never misread.
+_FORMAT = 1
+_MAGIC = b"PVBM25" + bytes([_FORMAT, 0])
+_BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+_HEADER = struct.Struct("=8sQQQQQQddd")
+# Stored indexes build_bm25 keeps per cache directory, newest first; one per
+# project version, so a few cover switching back and forth between branches.
+_KEEP_STORED = 3
+
+# An editable index's postings: term -> (document numbers, frequencies).
+_Postings = Dict[str, Tuple["array[int]", "array[int]"]]
+
 # Words that look like identifiers but carry no localization signal. Kept short
 # and generic on purpose — a big hand-tuned list would be tuning on anecdotes.
 _STOPWORDS = {
@@ -54,22 +89,30 @@ _STOPWORDS = {
 
 def _split_identifier(tok: str) -> List[str]:
     """``get_user_name`` / ``GetUserName`` → the words inside, for lexical matching."""
-    parts = re.split(r"_+", tok)
-    out: List[str] = []
-    for p in parts:
-        out.extend(re.findall(r"[A-Z]+(?![a-z])|[A-Z][a-z]*|[a-z]+|\d+", p) or [p])
-    return [w.lower() for w in out if w]
+    # No word pattern matches "_", so one pass over the whole identifier finds
+    # exactly the words of each underscore-separated part.
+    return [w.lower() for w in _WORD_RE.findall(tok)]
+
+
+@lru_cache(maxsize=_SPLIT_CACHE_SIZE)
+def _token_words(tok: str) -> Tuple[str, ...]:
+    """What one identifier contributes to a token stream, as interned strings.
+
+    Source code repeats the same identifiers over and over, so tokenizing a
+    project is mostly re-splitting names already seen: memoizing the split
+    turns it into one lookup, and interning makes every occurrence of a term
+    share one string -- a smaller index, and postings keyed by it hash once.
+    """
+    lower = sys.intern(tok.lower())
+    words = _split_identifier(tok)
+    if len(words) > 1:
+        return (lower, *map(sys.intern, words))
+    return (lower,)
 
 
 def tokenize(text: str) -> List[str]:
     """Lowercased tokens plus the words hidden inside compound identifiers."""
-    out: List[str] = []
-    for tok in _TOKEN_RE.findall(text):
-        out.append(tok.lower())
-        words = _split_identifier(tok)
-        if len(words) > 1:
-            out.extend(words)
-    return out
+    return list(chain.from_iterable(map(_token_words, _TOKEN_RE.findall(text))))
 
 
 def function_source(
@@ -103,54 +146,534 @@ def function_source(
 
 
 class BM25Index:
-    """Okapi BM25 over a fixed document set. Standard parameters, no tuning."""
+    """Okapi BM25 over a fixed document set. Standard parameters, no tuning.
+
+    Stored as an inverted index: each term maps to its postings -- parallel
+    arrays of document numbers (positions in ``ids``), ascending, and term
+    frequencies -- and each document's length normalisation is computed
+    once. A query touches only the postings of its own terms, so a term
+    found in three functions costs three updates, not one per function.
+    Scores accumulate per document in query-term order, exactly as a
+    document-at-a-time loop would add them, so they are the same floats.
+
+    :meth:`save` writes the index as one flat binary file that :meth:`load`
+    maps straight back into memory (see :func:`build_bm25`).
+
+    :meth:`add` and :meth:`remove` edit single documents in place; document
+    frequencies, the average length and the normalisations they feed are
+    brought up to date on the next query, and rankings then equal those of
+    an index built from scratch over the same documents.
+    """
 
     def __init__(self, docs: Dict[str, List[str]], k1: float = 1.5, b: float = 0.75) -> None:
         self.k1, self.b = k1, b
-        self.ids = sorted(docs)
-        self.tf = {d: Counter(docs[d]) for d in self.ids}
-        self.len = {d: len(docs[d]) for d in self.ids}
-        self.avg = (sum(self.len.values()) / len(self.ids)) if self.ids else 0.0
-        df: Counter = Counter()
-        for d in self.ids:
-            df.update(set(self.tf[d]))
-        n = len(self.ids)
-        self.idf = {t: math.log(1.0 + (n - c + 0.5) / (c + 0.5)) for t, c in df.items()}
+        names = sorted(docs)
+        self.ids: List[Optional[str]] = list(names)  # None: removed
+        lengths = array("i", (len(docs[d]) for d in names))
+        self.lengths: Sequence[int] = lengths
+        self.avg = (sum(lengths) / len(self.ids)) if self.ids else 0.0
+        avg = self.avg or 1.0
+        # The constant half of each document's BM25 denominator (tf + norm).
+        self.norms: Sequence[float] = array(
+            "d", (k1 * (1 - b + b * dl / avg) for dl in lengths)
+        )
+        postings: _Postings = {}
+        for number, d in enumerate(names):
+            for term, f in Counter(docs[d]).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("i"), array("i"))
+                entry[0].append(number)
+                entry[1].append(f)
+        self.postings: Mapping[str, Tuple[Sequence[int], Sequence[int]]] = postings
+        self._init_state(len(self.ids), sum(lengths))
+
+    def _init_state(self, count: int, total: int) -> None:
+        self._count = count  # live documents
+        self._total = total  # their summed lengths
+        self._idfs: Dict[str, float] = {}
+        self._bounds: Dict[str, float] = {}
+        self._stale = False
+        # While document numbers follow the sorted ids, they break ties by id.
+        self._in_order = True
+        self._numbers: Optional[Dict[str, int]] = None
+        # Each document's distinct terms, kept once the index is first edited.
+        self._terms: Optional[Dict[int, List[str]]] = None
+        # The file a loaded index reads its arrays from, open while they are used.
+        self._mapped: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, doc: object) -> bool:
+        return doc in self._doc_numbers()
+
+    def _doc_numbers(self) -> Dict[str, int]:
+        if self._numbers is None:
+            self._numbers = {d: n for n, d in enumerate(self.ids) if d is not None}
+        return self._numbers
+
+    def add(self, doc: str, tokens: Sequence[str]) -> None:
+        """Index ``doc`` as ``tokens``, replacing any earlier version of it."""
+        self.remove(doc)
+        postings, lengths, terms = self._thaw()
+        number = len(self.ids)
+        self._in_order = False
+        self.ids.append(doc)
+        self._doc_numbers()[doc] = number
+        lengths.append(len(tokens))
+        self._count += 1
+        self._total += len(tokens)
+        counts = Counter(tokens)
+        for term, f in counts.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array("i"), array("i"))
+            entry[0].append(number)  # the highest number yet: order is kept
+            entry[1].append(f)
+        terms[number] = list(counts)
+        self._stale = True
+
+    def remove(self, doc: str) -> bool:
+        """Drop ``doc`` from the index; ``False`` if it was not there."""
+        known = self._doc_numbers()
+        number = known.get(doc)
+        if number is None:
+            return False
+        postings, lengths, terms = self._thaw()
+        for term in terms.pop(number):
+            numbers, freqs = postings[term]
+            i = bisect_left(numbers, number)
+            del numbers[i], freqs[i]
+            if not numbers:
+                del postings[term]
+        del known[doc]
+        self.ids[number] = None
+        self._count -= 1
+        self._total -= lengths[number]
+        lengths[number] = 0
+        self._stale = True
+        # Removed numbers are never reused; renumber once they dominate.
+        if len(self.ids) > 2 * self._count + 1024:
+            self._compact()
+        return True
+
+    def _thaw(self) -> Tuple[_Postings, "array[int]", Dict[int, List[str]]]:
+        """Make the index editable: own, mutable arrays and per-document terms.
+
+        Returns the editable postings, lengths and per-document terms.
+        """
+        if self._terms is None:
+            postings: _Postings = {
+                term: (array("i", numbers), array("i", freqs))
+                for term, (numbers, freqs) in self.postings.items()
+            }
+            # Every live document, including those without a single term.
+            terms: Dict[int, List[str]] = {n: [] for n, d in enumerate(self.ids) if d is not None}
+            for term, (numbers, _) in postings.items():
+                for number in numbers:
+                    terms[number].append(term)
+            self.postings = postings
+            self.lengths = array("i", self.lengths)
+            self.norms = array("d", self.norms)
+            self._terms = terms
+        # Once thawed, _compact and _refresh only ever store these forms.
+        return cast(_Postings, self.postings), cast("array[int]", self.lengths), self._terms
+
+    def _compact(self, by_id: bool = False) -> None:
+        """Renumber the live documents densely, in their current or in id order."""
+        ids = self.ids
+        live = [(d, n) for n, d in enumerate(ids) if d is not None]
+        if by_id:
+            live.sort()
+        keep = [n for _, n in live]
+        new = {old: i for i, old in enumerate(keep)}
+        self.ids = [ids[n] for n in keep]
+        self.lengths = array("i", (self.lengths[n] for n in keep))
+        postings: _Postings = {}
+        for term, (numbers, freqs) in self.postings.items():
+            if by_id:
+                pairs = sorted(zip((new[n] for n in numbers), freqs))
+                postings[term] = (
+                    array("i", (n for n, _ in pairs)),
+                    array("i", (f for _, f in pairs)),
+                )
+            else:
+                postings[term] = (array("i", (new[n] for n in numbers)), array("i", freqs))
+        self.postings = postings
+        if by_id:
+            self._in_order = True
+        if self._terms is not None:
+            self._terms = {new[n]: terms for n, terms in self._terms.items()}
+        self._numbers = None
+        self._stale = True
+
+    def _refresh(self) -> None:
+        """Recompute what every edit invalidates: avg length, norms, idf, bounds."""
+        if not self._stale:
+            return
+        k1, b = self.k1, self.b
+        self.avg = (self._total / self._count) if self._count else 0.0
+        avg = self.avg or 1.0
+        self.norms = array("d", (k1 * (1 - b + b * dl / avg) for dl in self.lengths))
+        self._idfs.clear()
+        self._bounds.clear()
+        self._stale = False
+
+    def _idf(self, term: str) -> float:
+        idf = self._idfs.get(term)
+        if idf is None:
+            n, c = self._count, len(self.postings[term][0])
+            idf = self._idfs[term] = math.log(1.0 + (n - c + 0.5) / (c + 0.5))
+        return idf
+
+    def _bound(self, term: str) -> float:
+        """The largest score ``term`` alone contributes to any document."""
+        bound = self._bounds.get(term)
+        if bound is None:
+            numbers, freqs = self.postings[term]
+            idf, norms, scale = self._idf(term), self.norms, self.k1 + 1
+            bound = self._bounds[term] = max(
+                idf * f * scale / (f + norms[number]) for number, f in zip(numbers, freqs)
+            )
+        return bound
+
+    def _score(self, query: Sequence[str], number: int) -> float:
+        """One document's score, summed in query-term order like :meth:`_scores`."""
+        s = 0.0
+        norm, scale = self.norms[number], self.k1 + 1
+        for term in query:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            numbers = entry[0]
+            i = bisect_left(numbers, number)
+            if i < len(numbers) and numbers[i] == number:
+                f = entry[1][i]
+                s += self._idf(term) * f * scale / (f + norm)
+        return s
+
+    def _scores(self, query: Sequence[str]) -> Dict[int, float]:
+        """Document number -> BM25 score, for every document matching ``query``."""
+        scores: Dict[int, float] = {}
+        norms, scale = self.norms, self.k1 + 1
+        for term in query:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            idf = self._idf(term)
+            for number, f in zip(*entry):
+                scores[number] = scores.get(number, 0.0) + idf * f * scale / (f + norms[number])
+        return scores
 
     def rank(self, query: Sequence[str]) -> List[Tuple[str, float]]:
         """Positively-scored docs for pre-tokenized ``query``, best first."""
-        scores: Dict[str, float] = {}
-        for doc in self.ids:
-            tf, dl = self.tf[doc], self.len[doc]
-            s = 0.0
-            for term in query:
-                f = tf.get(term)
-                if not f:
-                    continue
-                denom = f + self.k1 * (1 - self.b + self.b * dl / (self.avg or 1.0))
-                s += self.idf.get(term, 0.0) * f * (self.k1 + 1) / denom
-            if s > 0:
-                scores[doc] = s
-        ordered = sorted(scores, key=lambda d: (-round(scores[d], 12), d))
-        return [(d, scores[d]) for d in ordered]
+        self._refresh()
+        scores = self._scores(query)
+        ids = cast(List[str], self.ids)  # only live documents score
+        if self._in_order:
+            ordered = sorted((-round(s, 12), number) for number, s in scores.items() if s > 0)
+            return [(ids[number], scores[number]) for _, number in ordered]
+        named = sorted((-round(s, 12), ids[number], s) for number, s in scores.items() if s > 0)
+        return [(doc, s) for _, doc, s in named]
+
+    def top(self, query: Sequence[str], k: int) -> List[Tuple[str, float]]:
+        """``rank(query)[:k]``, without scoring every matching document.
+
+        MaxScore pruning: terms are accumulated best upper bound first, and
+        once the bounds of the terms left cannot lift a document to the k-th
+        best partial score, documents not yet seen are out of the running and
+        the remaining (typically common, low-weight) terms' postings are never
+        walked. The few survivors are rescored exactly, so scores and order
+        are identical to :meth:`rank`.
+        """
+        if k <= 0:
+            return []
+        self._refresh()
+        counts = Counter(term for term in query if term in self.postings)
+        bounds = {t: c * self._bound(t) for t, c in counts.items()}
+        order = sorted(counts, key=lambda t: (-bounds[t], t))
+        # left[i]: the most terms order[i:] can still add to any document.
+        left = [0.0] * (len(order) + 1)
+        for i in range(len(order) - 1, -1, -1):
+            left[i] = left[i + 1] + bounds[order[i]]
+        left = [u * (1 + _BOUND_SLACK) + _BOUND_SLACK for u in left]
+
+        partial: Dict[int, float] = {}
+        norms, scale = self.norms, self.k1 + 1
+        threshold = -math.inf
+        done = 0
+        for term in order:
+            numbers, freqs = self.postings[term]
+            weight = self._idf(term) * counts[term]
+            for number, f in zip(numbers, freqs):
+                gain = weight * f * scale / (f + norms[number])
+                partial[number] = partial.get(number, 0.0) + gain
+            done += 1
+            # Cheap test first: no document can yet hold more than left[0] - left[done].
+            if len(partial) >= k and left[done] < left[0] - left[done]:
+                threshold = heapq.nlargest(k, partial.values())[-1]
+                if left[done] < threshold:
+                    break
+        if len(partial) >= k:
+            threshold = heapq.nlargest(k, partial.values())[-1]
+        rest = left[done]
+        scored = [
+            (self._score(query, number), number)
+            for number, p in partial.items()
+            if p * (1 + _BOUND_SLACK) + rest >= threshold
+        ]
+        ids = cast(List[str], self.ids)  # only live documents score
+        best = heapq.nsmallest(k, ((-round(s, 12), ids[number], s) for s, number in scored))
+        return [(doc, s) for _, doc, s in best]
+
+    def score(self, query: Sequence[str], doc: str) -> float:
+        """``doc``'s score for pre-tokenized ``query`` (0.0 if unknown)."""
+        number = self._doc_numbers().get(doc)
+        if number is None:
+            return 0.0
+        self._refresh()
+        return self._score(query, number)
 
     def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
         """Top-``k`` documents for a natural-language query."""
-        return self.rank(tokenize(query))[:k]
+        return self.top(tokenize(query), k)
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` (atomically) in the :meth:`load` format."""
+        if not self._in_order or self._count != len(self.ids):
+            self._compact(by_id=True)  # a loaded index's numbers follow its ids
+        self._refresh()
+        terms = sorted(self.postings)
+        offsets = array("q", [0])
+        numbers, freqs = array("i"), array("i")
+        for term in terms:
+            entry = self.postings[term]
+            numbers.extend(entry[0])
+            freqs.extend(entry[1])
+            offsets.append(len(numbers))
+        ids = [d for d in self.ids if d is not None]  # all of them, once compacted
+        ids_blob = "\n".join(ids).encode("utf-8")
+        terms_blob = "\n".join(terms).encode("utf-8")
+        header = _HEADER.pack(
+            _MAGIC,
+            _BYTE_ORDER,
+            len(ids),
+            len(terms),
+            len(numbers),
+            len(ids_blob),
+            len(terms_blob),
+            self.k1,
+            self.b,
+            self.avg,
+        )
+        sections = [
+            array("d", self.norms).tobytes(),
+            array("i", self.lengths).tobytes(),
+            offsets.tobytes(),
+            numbers.tobytes(),
+            freqs.tobytes(),
+            ids_blob,
+            terms_blob,
+        ]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                for section in sections:
+                    f.write(section)
+                    f.write(bytes(-len(section) % 8))  # keep every section 8-aligned
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """Map an index written by :meth:`save`; ``None`` if missing or unreadable.
+
+        Nothing is parsed up front but the document ids and the term list:
+        lengths, normalisations and postings are read in place from the
+        mapped file, a term's postings only when a query asks for it.
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls._from_buffer(mapped)
+        except (struct.error, ValueError, TypeError, UnicodeDecodeError):
+            return None  # the mapping is released with its last view
+
+    @classmethod
+    def _from_buffer(cls, mapped: mmap.mmap) -> Optional["BM25Index"]:
+        magic, order, n_docs, n_terms, n_postings, ids_len, terms_len, k1, b, avg = (
+            _HEADER.unpack_from(mapped)
+        )
+        if magic != _MAGIC or order != _BYTE_ORDER:
+            raise ValueError("not a BM25 index for this format or platform")
+        view = memoryview(mapped)
+        pos = _HEADER.size
+
+        def take(size: int) -> memoryview:
+            nonlocal pos
+            if pos + size > len(view):
+                raise ValueError("truncated BM25 index")
+            section = view[pos : pos + size]
+            pos += size + (-size % 8)
+            return section
+
+        norms = take(8 * n_docs).cast("d")
+        lengths = take(4 * n_docs).cast("i")
+        offsets = take(8 * (n_terms + 1)).cast("q")
+        numbers = take(4 * n_postings).cast("i")
+        freqs = take(4 * n_postings).cast("i")
+        ids = bytes(take(ids_len)).decode("utf-8").split("\n") if n_docs else []
+        terms = bytes(take(terms_len)).decode("utf-8").split("\n") if n_terms else []
+        if len(ids) != n_docs or len(terms) != n_terms:
+            raise ValueError("corrupt BM25 index")
+
+        index = cls.__new__(cls)
+        index.k1, index.b, index.avg = k1, b, avg
+        index.ids = list(ids)
+        index.lengths = lengths
+        index.norms = norms
+        index.postings = _MappedPostings(terms, offsets, numbers, freqs)
+        index._init_state(n_docs, sum(lengths))
+        index._mapped = mapped
+        return index
+
+
+class _MappedPostings(Mapping):
+    """Term -> postings view over the flat arrays of a mapped index file."""
+
+    def __init__(
+        self, terms: List[str], offsets: memoryview, numbers: memoryview, freqs: memoryview
+    ) -> None:
+        self._terms = {term: i for i, term in enumerate(terms)}
+        self._offsets = offsets
+        self._numbers = numbers
+        self._freqs = freqs
+
+    def __getitem__(self, term: str) -> Tuple[memoryview, memoryview]:
+        i = self._terms[term]
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._numbers[start:end], self._freqs[start:end]
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._terms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+def bm25_fingerprint(G: nx.DiGraph) -> str:
+    """Key of the index :func:`build_bm25` would build for ``G`` right now.
+
+    Covers what the documents are made of: every node's id and source span,
+    and each source file's size and modification time (the same signal the
+    MCP server invalidates on).
+    """
+    from pyvisualizer import __version__
+
+    h = hashlib.sha256(f"{_FORMAT}\0{__version__}\n".encode("utf-8"))
+    paths: Dict[str, None] = {}
+    for node, data in G.nodes(data=True):
+        path = data.get("path", "")
+        paths[path] = None
+        h.update(f"{node}\0{path}\0{data.get('lineno', 0)}\0{data.get('end_lineno', 0)}\n".encode())
+    for path in paths:
+        try:
+            st = os.stat(path) if path else None
+        except OSError:
+            st = None
+        stamp = f"{st.st_mtime_ns}\0{st.st_size}" if st is not None else "-"
+        h.update(f"{path}\0{stamp}\n".encode())
+    return h.hexdigest()
+
+
+def _document(node: str, data: Mapping, cache: Dict[str, List[str]]) -> List[str]:
+    """A function's tokens: its qualified name, file basename, and source slice."""
+    path = data.get("path", "")
+    start = int(data.get("lineno", 0) or 0)
+    end = int(data.get("end_lineno", start) or start)
+    body = function_source(path, start, end, cache)
+    return tokenize(node) + tokenize(os.path.basename(path)) + tokenize(body)
 
 
-def build_bm25(G: nx.DiGraph) -> BM25Index:
-    """One document per function: its qualified name, file basename, and source."""
+def build_bm25(G: nx.DiGraph, cache_dir: Optional[str] = None) -> BM25Index:
+    """One document per function: its qualified name, file basename, and source.
+
+    With ``cache_dir``, the index is stored there under
+    :func:`bm25_fingerprint` and later calls on an unchanged project map the
+    stored file instead of reading and tokenizing every function again.
+    Writing one deletes all but the most recent other stored indexes.
+    Write failures only cost a future rebuild.
+    """
+    stored = ""
+    if cache_dir:
+        stored = os.path.join(cache_dir, "bm25", f"{bm25_fingerprint(G)}.bin")
+        index = BM25Index.load(stored)
+        if index is not None:
+            return index
     cache: Dict[str, List[str]] = {}
-    docs: Dict[str, List[str]] = {}
-    for node in G.nodes():
-        data = G.nodes[node]
-        path = data.get("path", "")
-        start = int(data.get("lineno", 0) or 0)
-        end = int(data.get("end_lineno", start) or start)
-        body = function_source(path, start, end, cache)
-        docs[node] = tokenize(node) + tokenize(os.path.basename(path)) + tokenize(body)
-    return BM25Index(docs)
+    docs = {node: _document(node, data, cache) for node, data in G.nodes(data=True)}
+    index = BM25Index(docs)
+    if stored:
+        try:
+            os.makedirs(os.path.dirname(stored), exist_ok=True)
+            index.save(stored)
+        except OSError as e:
+            logger.debug(f"Could not write search index {stored}: {e}")
+        else:
+            _prune_stored(stored)
+    return index
+
+
+def _prune_stored(current: str) -> None:
+    """Delete the stored indexes beside ``current`` but the newest few."""
+    try:
+        older = [
+            entry
+            for entry in os.scandir(os.path.dirname(current))
+            if entry.name.endswith(".bin") and entry.path != current
+        ]
+        older.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+    except OSError:
+        return
+    for entry in older[_KEEP_STORED - 1 :]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass  # in use or already gone: the next write tries again
+
+
+def update_bm25(index: BM25Index, G: nx.DiGraph, changed: Iterable[str]) -> int:
+    """Bring ``index`` up to date with ``G`` after the files ``changed`` changed.
+
+    Only the functions defined in those files are read and tokenized again;
+    functions that left the graph are dropped. The result ranks exactly as a
+    fresh :func:`build_bm25` of ``G`` would. Returns the documents touched.
+    """
+    changed = set(changed)
+    live = set(G)
+    gone = [doc for doc in index.ids if doc is not None and doc not in live]
+    for doc in gone:
+        index.remove(doc)
+    cache: Dict[str, List[str]] = {}
+    touched = len(gone)
+    for node, data in G.nodes(data=True):
+        if data.get("path", "") in changed or node not in index:
+            index.add(node, _document(node, data, cache))
+            touched += 1
+    return touched
 
 
 def extract_identifiers(text: str) -> List[str]:
@@ -229,8 +752,7 @@ def rank_seeds(
     on purpose: expansion from a shortlist recovers from any single wrong guess,
     where a single best-guess seed cannot.
     """
-    ranked = bm25.rank(tokenize(task))
-    hits = dict(ranked)
+    query = tokenize(task)
     out: List[Tuple[str, float, str]] = []
     taken: Set[str] = set()
     for node in derive_seeds(task, G):
@@ -238,8 +760,10 @@ def rank_seeds(
             break
         if node not in taken:
             taken.add(node)
-            out.append((node, round(hits.get(node, 0.0), 4), "symbol"))
-    for node, score in ranked:
+            out.append((node, round(bm25.score(query, node), 4), "symbol"))
+    # At most len(out) of the top k are symbol seeds already taken, so the
+    # top k always has enough left to fill the remaining slots.
+    for node, score in bm25.top(query, k):
         if len(out) >= k:
             break
         if node not in taken:
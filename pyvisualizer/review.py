@@ -28,6 +28,7 @@ from pyvisualizer.changes import (
 )
 from pyvisualizer.core.model import CONFIDENCE_AMBIGUOUS
 from pyvisualizer.gates import find_cycles
+from pyvisualizer.impact import analyze_impact_many
 from pyvisualizer.metrics import compute_health
 
 
@@ -62,13 +63,11 @@ def analyze_review(
         return result
 
     changed_set = set(changed)
-    impacted: set = set()
-    for node in changed:
-        impacted |= nx.ancestors(G, node)
-    impacted -= changed_set
-    result.impacted_callers = sorted(impacted)
+    # One sweep over the graph for every changed function, not one per function.
+    impact = analyze_impact_many(G, changed, per_target=False)
+    result.impacted_callers = impact.transitive_callers
 
-    modules = {G.nodes[n].get("module", "") for n in impacted}
+    modules = {G.nodes[n].get("module", "") for n in result.impacted_callers}
     modules.discard("")
     result.modules_affected = sorted(modules)
 
@@ -85,10 +84,7 @@ def analyze_review(
 
     for cycle in find_cycles(G):
         if changed_set & set(cycle):
-            # Rotate to the lexicographically smallest node so the rendered
-            # chain is identical run-to-run (simple_cycles' start node isn't).
-            i = cycle.index(min(cycle))
-            result.cycle_changes.append(tuple(cycle[i:] + cycle[:i]))
+            result.cycle_changes.append(tuple(cycle))  # starts at its smallest node
     result.cycle_changes.sort()
 
     amb: List[Tuple[str, str]] = []
@@ -1,15 +1,21 @@
 """Utility modules for PyVisualizer."""
 
+from pyvisualizer.utils.analysis_cache import AnalysisCache
 from pyvisualizer.utils.file_discovery import (
     analyze_project,
+    analyze_project_modules,
     find_project_python_files,
     get_module_name,
+    load_module,
     parse_python_file,
 )
 
 __all__ = [
     "find_project_python_files",
     "get_module_name",
+    "load_module",
     "parse_python_file",
     "analyze_project",
+    "analyze_project_modules",
+    "AnalysisCache",
 ]
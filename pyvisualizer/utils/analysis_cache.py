@@ -0,0 +1,99 @@
+"""
+Persistent, content-addressed cache of per-module analysis.
+
+Parsing and walking every file is the dominant cost of ``build_graph`` on a
+large tree, yet between two CI runs almost every file is unchanged. This cache
+stores each module's AST-free summary (imports, classes, functions and raw,
+unresolved call sites) under a key derived from the file's bytes, its module
+name, the tool version and the interpreter version. Call *resolution* is never
+cached — it depends on the whole project — so a warm run re-resolves every call
+site against the current definitions and produces byte-identical output.
+
+Entries are written with :mod:`marshal` (plain builtin data only, nothing is
+ever executed on load) and replaced atomically, so concurrent runs sharing a
+directory are safe. Stale entries are harmless; delete the directory to prune.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+import platform
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("pyvisualizer.cache")
+
+#: Default cache directory name, relative to the current working directory.
+DEFAULT_CACHE_DIR = ".pyvisualizer-cache"
+
+# Bump whenever the summary layout changes so old entries are never misread.
+_FORMAT = 2
+
+
+class AnalysisCache:
+    """On-disk store of :meth:`ModuleAnalyzer.to_summary` results."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR) -> None:
+        from pyvisualizer import __version__
+
+        self.directory = os.path.abspath(directory)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._salt = (
+            f"{_FORMAT}\0{__version__}\0"
+            f"{platform.python_implementation()}-{platform.python_version()}\0"
+        ).encode("utf-8")
+
+    def key(self, module_name: str, source: bytes) -> str:
+        """The content address of ``source`` analyzed as ``module_name``."""
+        h = hashlib.sha256(self._salt)
+        h.update(module_name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(source)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.bin")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored summary for ``key``, or ``None`` (missing or unreadable)."""
+        try:
+            with open(self._path(key), "rb") as f:
+                data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            data = None
+        with self._lock:
+            if isinstance(data, dict):
+                self.hits += 1
+                return data
+            self.misses += 1
+        return None
+
+    def store(self, key: str, summary: Dict[str, Any]) -> None:
+        """Persist ``summary``; failures only cost a future cache miss."""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._ensure_directory()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                marshal.dump(summary, f)
+            os.replace(tmp, path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not write cache entry {path}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _ensure_directory(self) -> None:
+        if os.path.isdir(self.directory):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # Keep the cache out of version control, like pytest/mypy caches do.
+        with open(os.path.join(self.directory, ".gitignore"), "w", encoding="utf-8") as f:
+            f.write("# Created by py-code-visualizer\n*\n")
@@ -10,10 +10,13 @@ import concurrent.futures
 import logging
 import os
 from functools import lru_cache
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-from pyvisualizer.core.analyzer import ModuleAnalyzer
-from pyvisualizer.core.graph import FunctionCallVisitor
+from pyvisualizer.core.analyzer import CallSite, ModuleAnalyzer
+from pyvisualizer.core.graph import CallResolver, ResolvedCall
+from pyvisualizer.core.symbols import SymbolIndex, SymbolTable
+from pyvisualizer.core.walker import analyze_module
+from pyvisualizer.utils.analysis_cache import AnalysisCache
 
 logger = logging.getLogger("pyvisualizer.discovery")
 
@@ -35,6 +38,20 @@ def parse_python_file(file_path: str) -> Optional[ast.AST]:
         return None
 
 
+def _parse_source(source: bytes, file_path: str) -> Optional[ast.AST]:
+    """Parse raw file bytes exactly as :func:`parse_python_file` reads them."""
+    try:
+        # Text-mode open() semantics: strict UTF-8, universal newlines.
+        text = source.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        return ast.parse(text, filename=file_path)
+    except SyntaxError as e:
+        logger.warning(f"Syntax error in {file_path}: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"Unexpected error parsing {file_path}: {e}")
+        return None
+
+
 def find_project_python_files(project_path: str) -> List[str]:
     """
     Find all Python files within the project directory only.
@@ -62,6 +79,7 @@ def find_project_python_files(project_path: str) -> List[str]:
         "dist",
         "*.egg-info",
         "site-packages",
+        ".pyvisualizer-cache",
         ".idea",
         ".vscode",
         "htmlcov",
@@ -148,20 +166,199 @@ def get_module_name(file_path: str, project_root: str) -> str:
     return ".".join(module_parts)
 
 
-def analyze_project(
-    py_files: List[str], project_root: str
-) -> Tuple[Dict[str, ModuleAnalyzer], List[Dict]]:
+def _read_source(file_path: str) -> Optional[bytes]:
+    try:
+        with open(file_path, "rb") as file:
+            return file.read()
+    except (OSError, IOError) as e:
+        logger.warning(f"Could not read file {file_path}: {e}")
+        return None
+
+
+def load_module(
+    file_path: str,
+    module_name: str,
+    project_root: str,
+    cache: Optional[AnalysisCache],
+    low_memory: bool = False,
+) -> Optional[ModuleAnalyzer]:
+    """Analyze one file, through ``cache`` when given. ``None`` if unparseable.
+
+    With ``low_memory`` the file is parsed outside :func:`parse_python_file`'s
+    cache and the analyzer keeps no AST, so each tree is freed as soon as the
+    file is processed.
+    """
+    if cache is None and not low_memory:
+        tree = parse_python_file(file_path)
+        if tree is None:
+            return None
+        return analyze_module(module_name, file_path, tree, project_root)
+
+    source = _read_source(file_path)
+    if source is None:
+        return None
+    key = None
+    if cache is not None:
+        key = cache.key(module_name, source)
+        summary = cache.load(key)
+        if summary is not None:
+            return ModuleAnalyzer.from_summary(module_name, file_path, summary, project_root)
+
+    tree = _parse_source(source, file_path)
+    if tree is None:
+        return None
+    analyzer = analyze_module(module_name, file_path, tree, project_root)
+    if cache is not None and key is not None:
+        cache.store(key, analyzer.to_summary())
+    if low_memory:
+        analyzer.release_ast()
+    return analyzer
+
+
+def _summarize_source(
+    source: bytes, file_path: str, module_name: str, project_root: str
+) -> Optional[Dict[str, Any]]:
+    """Worker-process entry point: parse + analyze, return only the summary.
+
+    ASTs never cross the process boundary; the compact summary is a fraction
+    of their size to pickle and is all the resolution pass needs.
+    """
+    tree = _parse_source(source, file_path)
+    if tree is None:
+        return None
+    return analyze_module(module_name, file_path, tree, project_root).to_summary()
+
+
+def _load_modules_in_processes(
+    ordered: List[Tuple[str, str]],
+    project_root: str,
+    cache: Optional[AnalysisCache],
+    jobs: int,
+) -> List[Optional[ModuleAnalyzer]]:
+    """Analyze ``ordered`` files in a pool of ``jobs`` worker processes.
+
+    Files are read (and looked up in ``cache``) here; only cache misses are
+    shipped to workers. Results are placed back by index, so the outcome is
+    independent of worker scheduling.
+    """
+    loaded: List[Optional[ModuleAnalyzer]] = [None] * len(ordered)
+    pending: List[Tuple[int, Optional[str], bytes]] = []
+    for i, (file_path, module_name) in enumerate(ordered):
+        source = _read_source(file_path)
+        if source is None:
+            continue
+        key = None
+        if cache is not None:
+            key = cache.key(module_name, source)
+            summary = cache.load(key)
+            if summary is not None:
+                loaded[i] = ModuleAnalyzer.from_summary(
+                    module_name, file_path, summary, project_root
+                )
+                continue
+        pending.append((i, key, source))
+
+    if not pending:
+        return loaded
+
+    chunksize = max(1, len(pending) // (jobs * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        summaries = executor.map(
+            _summarize_source,
+            [source for _, _, source in pending],
+            [ordered[i][0] for i, _, _ in pending],
+            [ordered[i][1] for i, _, _ in pending],
+            [project_root] * len(pending),
+            chunksize=chunksize,
+        )
+        for (i, key, _), summary in zip(pending, summaries):
+            if summary is None:
+                continue
+            if cache is not None and key is not None:
+                cache.store(key, summary)
+            file_path, module_name = ordered[i]
+            loaded[i] = ModuleAnalyzer.from_summary(module_name, file_path, summary, project_root)
+    return loaded
+
+
+# The symbol index a resolver worker process built at startup.
+_WORKER_INDEX: Optional[SymbolIndex] = None
+
+
+def _init_resolver_worker(symbols: SymbolTable) -> None:
+    global _WORKER_INDEX
+    _WORKER_INDEX = SymbolIndex(symbols)
+
+
+def _resolve_module_sites(module_name: str, sites: List[CallSite]) -> List[ResolvedCall]:
+    """Worker-process entry point: resolve one module's call sites."""
+    assert _WORKER_INDEX is not None, "resolver worker was not initialized"
+    return CallResolver(module_name, _WORKER_INDEX).resolve_sites(sites)
+
+
+def _resolve_in_processes(
+    module_analyzers: Dict[str, ModuleAnalyzer], symbols: SymbolTable, jobs: int
+) -> Dict[str, List[ResolvedCall]]:
+    """Shard call resolution by module across ``jobs`` worker processes.
+
+    The symbol table is pickled once per worker (not per task) and indexed
+    there; per-module results come back in sorted module order, exactly as
+    the sequential pass emits them.
+    """
+    names = sorted(module_analyzers)
+    chunksize = max(1, len(names) // (jobs * 4))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_resolver_worker, initargs=(symbols,)
+    ) as executor:
+        results = executor.map(
+            _resolve_module_sites,
+            names,
+            [module_analyzers[m].call_sites for m in names],
+            chunksize=chunksize,
+        )
+        return dict(zip(names, results))
+
+
+class ProjectAnalysis(NamedTuple):
+    """Everything :func:`analyze_project_modules` learned about a project."""
+
+    analyzers: Dict[str, ModuleAnalyzer]  # project (sorted file) order
+    symbols: SymbolTable
+    symbol_index: Optional[SymbolIndex]  # None when resolution ran in worker processes
+    calls: Dict[str, List[ResolvedCall]]  # per module, sorted module order
+    module_names: Dict[str, str]  # every discovered file -> its module name
+
+
+def analyze_project_modules(
+    py_files: List[str],
+    project_root: str,
+    cache: Optional[AnalysisCache] = None,
+    jobs: Optional[int] = None,
+    low_memory: bool = False,
+) -> ProjectAnalysis:
     """
     Analyze all modules in the project and extract function calls.
 
-    Returns:
-        A tuple of (module_analyzers, all_calls) where:
-        - module_analyzers: Dict mapping module names to their analyzers
-        - all_calls: List of all function calls found
+    When ``cache`` is given, modules whose content is unchanged since a
+    previous run are loaded from it instead of being parsed again; call
+    resolution always runs against the current project.
+
+    ``jobs`` > 1 runs both passes -- parsing/analysis and call resolution --
+    in that many worker processes (``0`` means one per CPU); the default
+    stays in-process, which is faster for small projects where process
+    start-up dominates.
+
+    ``low_memory`` keeps no syntax trees: each file's AST is released as soon
+    as its summary is collected, instead of staying reachable from the
+    analyzers (and the parse cache) until the graph is built. Analyzers
+    loaded from ``cache`` or from worker processes never hold one.
+
+    Returns the analyzers together with the symbol table, the index and each
+    module's resolved calls, which is what an in-place graph update needs;
+    :func:`analyze_project` is the flattened form.
     """
-    # First pass: analyze modules and collect class/function definitions.
+    # First pass: analyze modules, collecting definitions and raw call sites.
     module_analyzers: Dict[str, ModuleAnalyzer] = {}
-    all_module_names: Set[str] = set()
 
     # Parse files in parallel for speed, but assemble results in a stable,
     # sorted order so the downstream graph and rendered output are byte-stable
@@ -169,29 +366,69 @@ def analyze_project(
     ordered = sorted(
         (file_path, get_module_name(file_path, project_root)) for file_path in py_files
     )
-    max_workers = min(os.cpu_count() or 4, 8)
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        parsed = list(executor.map(parse_python_file, [fp for fp, _ in ordered]))
+    if jobs is not None and jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    if jobs is not None and jobs > 1:
+        loaded = _load_modules_in_processes(ordered, project_root, cache, jobs)
+    else:
+        max_workers = min(os.cpu_count() or 4, 8)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(
+                executor.map(
+                    lambda item: load_module(item[0], item[1], project_root, cache, low_memory),
+                    ordered,
+                )
+            )
 
-    for (file_path, module_name), tree in zip(ordered, parsed):
-        all_module_names.add(module_name)
-        if tree is not None:
+    for (file_path, module_name), analyzer in zip(ordered, loaded):
+        if analyzer is not None:
             logger.debug(f"Parsed module: {module_name}")
-            module_analyzers[module_name] = ModuleAnalyzer(
-                module_name, file_path, tree, project_root
-            )
+            module_analyzers[module_name] = analyzer
+
+    if cache is not None:
+        logger.info(f"Analysis cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+
+    # Second pass: resolve call sites against the full, read-only table.
+    symbols = SymbolTable.from_analyzers(module_analyzers)
+    index: Optional[SymbolIndex] = None
+    calls: Dict[str, List[ResolvedCall]] = {}
+
+    if jobs is not None and jobs > 1:
+        calls = _resolve_in_processes(module_analyzers, symbols, jobs)
+    else:
+        index = SymbolIndex(symbols)
+        for module_name in sorted(module_analyzers):
+            analyzer = module_analyzers[module_name]
+            logger.debug(f"Analyzing function calls in: {module_name}")
+            resolver = CallResolver(module_name, index)
+            calls[module_name] = resolver.resolve_sites(analyzer.call_sites)
+        logger.debug(
+            f"Method lookups: {index.method_hits} memo hit(s), {index.method_misses} miss(es)"
+        )
 
-    # Second pass: analyze function calls (sequential; needs the full table).
-    all_calls: List[Dict] = []
+    return ProjectAnalysis(module_analyzers, symbols, index, calls, dict(ordered))
 
-    for module_name in sorted(module_analyzers):
-        analyzer = module_analyzers[module_name]
-        logger.debug(f"Analyzing function calls in: {module_name}")
-        visitor = FunctionCallVisitor(
-            module_name, analyzer.file_path, analyzer, module_analyzers, all_module_names
-        )
-        visitor.visit(analyzer.tree)
-        all_calls.extend(visitor.calls)
 
-    return module_analyzers, all_calls
+def analyze_project(
+    py_files: List[str],
+    project_root: str,
+    cache: Optional[AnalysisCache] = None,
+    jobs: Optional[int] = None,
+    low_memory: bool = False,
+) -> Tuple[Dict[str, ModuleAnalyzer], List[ResolvedCall]]:
+    """
+    Analyze all modules in the project and extract function calls.
+
+    See :func:`analyze_project_modules` for the parameters.
+
+    Returns:
+        A tuple of (module_analyzers, all_calls) where:
+        - module_analyzers: Dict mapping module names to their analyzers
+        - all_calls: List of all function calls found
+    """
+    analysis = analyze_project_modules(py_files, project_root, cache, jobs, low_memory)
+    all_calls: List[ResolvedCall] = []
+    for module_calls in analysis.calls.values():
+        all_calls.extend(module_calls)
+    return analysis.analyzers, all_calls
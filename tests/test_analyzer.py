@@ -5,6 +5,8 @@ import ast
 import pytest
 
 from pyvisualizer.core.analyzer import ImportCollector, ImportInfo, ModuleAnalyzer
+from pyvisualizer.core.graph import FunctionCallVisitor
+from pyvisualizer.core.walker import analyze_module
 
 
 class TestImportInfo:
@@ -83,8 +85,8 @@ def hello():
 
         assert "test_module.hello" in analyzer.functions
         func_info = analyzer.functions["test_module.hello"]
-        assert func_info["name"] == "hello"
-        assert func_info["class"] is None
+        assert func_info.name == "hello"
+        assert func_info.cls is None
 
     def test_analyze_async_function(self):
         code = """
@@ -96,7 +98,7 @@ async def fetch_data():
 
         assert "test_module.fetch_data" in analyzer.functions
         func_info = analyzer.functions["test_module.fetch_data"]
-        assert func_info["is_async"] is True
+        assert func_info.is_async is True
 
     def test_analyze_class(self):
         code = """
@@ -109,8 +111,8 @@ class MyClass:
 
         assert "test_module.MyClass" in analyzer.classes
         class_info = analyzer.classes["test_module.MyClass"]
-        assert class_info["name"] == "MyClass"
-        assert "method" in class_info["methods"]
+        assert class_info.name == "MyClass"
+        assert "method" in class_info.methods
 
     def test_analyze_class_with_inheritance(self):
         code = """
@@ -124,7 +126,7 @@ class Child(Parent):
         analyzer = ModuleAnalyzer("test_module", "/test/module.py", tree, "/test")
 
         child_info = analyzer.classes["test_module.Child"]
-        assert "Parent" in child_info["bases"]
+        assert "Parent" in child_info.bases
 
     def test_analyze_property_decorator(self):
         code = """
@@ -136,8 +138,8 @@ class MyClass:
         tree = ast.parse(code)
         analyzer = ModuleAnalyzer("test_module", "/test/module.py", tree, "/test")
 
-        method_info = analyzer.classes["test_module.MyClass"]["methods"]["value"]
-        assert method_info["is_property"] is True
+        method_info = analyzer.classes["test_module.MyClass"].methods["value"]
+        assert method_info.is_property is True
 
     def test_analyze_type_annotations(self):
         code = """
@@ -148,6 +150,70 @@ def add(a: int, b: int) -> int:
         analyzer = ModuleAnalyzer("test_module", "/test/module.py", tree, "/test")
 
         func_info = analyzer.functions["test_module.add"]
-        assert func_info["return_annotation"] is not None
-        assert "a" in func_info["arg_types"]
-        assert "b" in func_info["arg_types"]
+        assert func_info.return_annotation is not None
+        assert "a" in func_info.arg_types
+        assert "b" in func_info.arg_types
+
+    def test_records_survive_summary_round_trip(self):
+        code = """
+class Shape:
+    @property
+    def area(self) -> float:
+        return 0.0
+"""
+        analyzer = ModuleAnalyzer("m", "/test/m.py", ast.parse(code), "/test")
+        method = analyzer.classes["m.Shape"].methods["area"]
+        assert method is analyzer.functions["m.Shape.area"]
+        rebuilt = ModuleAnalyzer.from_summary("m", "/test/m.py", analyzer.to_summary(), "/test")
+        assert rebuilt.functions == analyzer.functions
+        assert rebuilt.classes == analyzer.classes
+        assert rebuilt.classes["m.Shape"].methods["area"] is rebuilt.functions["m.Shape.area"]
+
+
+class TestModuleWalker:
+    """Tests for the single-pass analyzer."""
+
+    @staticmethod
+    def _three_pass(code):
+        tree = ast.parse(code)
+        analyzer = ModuleAnalyzer("m", "/test/m.py", tree, "/test")
+        visitor = FunctionCallVisitor("m", "/test/m.py", analyzer, {}, set())
+        visitor.visit(tree)
+        analyzer.call_sites = visitor.sites
+        return analyzer.to_summary()
+
+    def test_matches_separate_passes(self):
+        code = """
+import os
+from pkg.client import Client as C
+
+class Base:
+    @staticmethod
+    def make(x: C) -> "Base":
+        x.fetch()
+        return Base()
+
+class Child(Base):
+    def run(self):
+        super().make(None)
+        with open("f") as fh:
+            fh.read()
+        def inner():
+            os.path.join("a", "b")
+        return inner
+"""
+        summary = analyze_module("m", "/test/m.py", ast.parse(code), "/test").to_summary()
+        assert summary == self._three_pass(code)
+
+    def test_late_import_still_types_variables(self):
+        code = """
+def run():
+    c = Client()
+    c.fetch()
+
+from svc import Client
+"""
+        analyzer = analyze_module("m", "/test/m.py", ast.parse(code), "/test")
+        fetch = [s for s in analyzer.call_sites if s.name == "fetch"]
+        assert fetch and fetch[0].typed == "svc.Client"
+        assert analyzer.to_summary() == self._three_pass(code)
@@ -1,16 +1,27 @@
 """Tests for the call-graph truth engine: accuracy, confidence, determinism."""
 
+import gc
 import os
+import random
 import tempfile
+import weakref
 
+import networkx as nx
 import pytest
 
-from pyvisualizer.core.graph import build_call_graph
+from pyvisualizer.core.csr import CSRGraph
+from pyvisualizer.core.cycles import cycle_rank, find_simple_cycles
+from pyvisualizer.core.graph import _mark_cycles, build_call_graph
+from pyvisualizer.core.graph_analysis import graph_analysis, invalidate
 from pyvisualizer.core.model import (
     CONFIDENCE_AMBIGUOUS,
     CONFIDENCE_INHERITED,
     CONFIDENCE_RESOLVED,
 )
+from pyvisualizer.core.node_index import NodeIndex
+from pyvisualizer.core.reachability import ReachabilityIndex
+from pyvisualizer.core.symbols import SuffixTrie, SymbolIndex, SymbolTable
+from pyvisualizer.utils.analysis_cache import AnalysisCache
 from pyvisualizer.utils.file_discovery import (
     analyze_project,
     find_project_python_files,
@@ -162,6 +173,43 @@ class TestInheritance:
         assert edge is not None
         assert edge["confidence"] == CONFIDENCE_INHERITED
 
+    def test_method_lookup_follows_c3_order(self):
+        G, _ = _build_from_sources(
+            {
+                "m.py": (
+                    "class A:\n"
+                    "    def step(self):\n"
+                    "        pass\n"
+                    "class X:\n"
+                    "    pass\n"
+                    "class B(A):\n"
+                    "    pass\n"
+                    "class C(X):\n"
+                    "    def step(self):\n"
+                    "        pass\n"
+                    "class D(B, C):\n"
+                    "    def run(self):\n"
+                    "        self.step()\n"
+                )
+            }
+        )
+        # Python's MRO is D, B, A, C, X: A.step wins over C.step.
+        assert _edge(G, "D.run", "A.step") is not None
+        assert _edge(G, "D.run", "C.step") is None
+
+    def test_base_shadowing_own_name_is_not_a_self_call(self):
+        G, _ = _build_from_sources(
+            {
+                "m.py": (
+                    "import subprocess\n"
+                    "class Popen(subprocess.Popen):\n"
+                    "    def __init__(self):\n"
+                    "        super().__init__()\n"
+                )
+            }
+        )
+        assert not G.has_edge("m.Popen.__init__", "m.Popen.__init__")
+
 
 class TestDeterminism:
     def test_two_runs_are_identical(self):
@@ -184,3 +232,540 @@ class TestDeterminism:
             return "\n".join(lines)
 
         assert sig(G1) == sig(G2)
+
+
+class TestAnalysisCache:
+    SOURCES = {
+        "a.py": "from b import B\ndef main():\n    B().go()\n",
+        "b.py": "class B:\n    def go(self):\n        self.step()\n    def step(self):\n        pass\n",
+    }
+
+    @staticmethod
+    def _sig(G):
+        lines = [f"N {n} {sorted(d.items())}" for n, d in sorted(G.nodes(data=True))]
+        lines += [f"E {s}|{t}|{sorted(d.items())}" for s, t, d in sorted(G.edges(data=True))]
+        return "\n".join(lines)
+
+    def test_warm_cache_is_identical_to_uncached(self):
+        G, tmp = _build_from_sources(self.SOURCES)
+        files = find_project_python_files(tmp)
+        cache = AnalysisCache(os.path.join(tmp, ".pyvisualizer-cache"))
+
+        cold = build_call_graph(*analyze_project(files, tmp, cache=cache))
+        assert cache.hits == 0 and cache.misses == 2
+
+        warm_cache = AnalysisCache(cache.directory)
+        warm = build_call_graph(*analyze_project(files, tmp, cache=warm_cache))
+        assert warm_cache.hits == 2 and warm_cache.misses == 0
+        assert self._sig(G) == self._sig(cold) == self._sig(warm)
+
+    def test_changed_file_is_reanalyzed(self):
+        _, tmp = _build_from_sources(self.SOURCES)
+        files = find_project_python_files(tmp)
+        directory = os.path.join(tmp, ".pyvisualizer-cache")
+        analyze_project(files, tmp, cache=AnalysisCache(directory))
+
+        with open(os.path.join(tmp, "b.py"), "a", encoding="utf-8") as f:
+            f.write("    def extra(self):\n        self.step()\n")
+        cache = AnalysisCache(directory)
+        G = build_call_graph(*analyze_project(files, tmp, cache=cache))
+        assert cache.hits == 1 and cache.misses == 1
+        assert _edge(G, "B.extra", "B.step") is not None
+
+
+class TestProcessPool:
+    def test_jobs_match_in_process_analysis(self):
+        G, tmp = _build_from_sources(
+            {
+                "a.py": "from b import B\ndef main():\n    B().go()\n",
+                "b.py": "class B:\n    def go(self):\n        self.step()\n    def step(self):\n        pass\n",
+                "c.py": "def broken(:\n",
+            }
+        )
+        files = find_project_python_files(tmp)
+        analyzers, calls = analyze_project(files, tmp, jobs=2)
+        assert sorted(analyzers) == ["a", "b"]  # the unparseable file is skipped
+        sig = TestAnalysisCache._sig
+        assert sig(build_call_graph(analyzers, calls)) == sig(G)
+
+
+class TestSymbolIndex:
+    @staticmethod
+    def _index(sources: dict) -> SymbolIndex:
+        _, tmp = _build_from_sources(sources)
+        analyzers, _ = analyze_project(find_project_python_files(tmp), tmp)
+        return SymbolIndex(SymbolTable.from_analyzers(analyzers))
+
+    def test_module_suffix_lookup_prefers_project_order(self):
+        index = self._index(
+            {
+                "a/__init__.py": "",
+                "a/util.py": "def helper():\n    pass\n",
+                "b/__init__.py": "",
+                "b/util.py": "def helper():\n    pass\ndef other():\n    pass\n",
+            }
+        )
+        assert index.module_function("util", "helper") == "a.util.helper"
+        assert index.module_function("util", "other") == "b.util.other"
+        assert index.module_function("b.util", "helper") == "b.util.helper"
+        assert index.module_function("til", "helper") is None  # whole components only
+
+    def test_suffix_trie_matches_whole_trailing_components(self):
+        trie = SuffixTrie()
+        for name in ("a.b.c", "c", "x.bc", "b.c"):
+            trie.insert(name, name)
+        assert trie.get("c") == ["a.b.c", "c", "b.c"]
+        assert trie.get("b.c") == ["a.b.c", "b.c"]
+        assert trie.get("a.b.c") == ["a.b.c"]
+        assert trie.get("z.a.b.c") == []
+
+    def test_class_lookups_match_first_definition(self):
+        index = self._index(
+            {
+                "a.py": "class Base:\n    pass\nclass Node:\n    pass\n",
+                "b.py": "class Node:\n    pass\n",
+            }
+        )
+        assert index.imported_class("b.Node") == "a.Node"  # first module with the name
+        assert index.imported_class("a.Node") == "a.Node"
+        assert index.imported_class("pkg.Missing") is None
+        assert index.class_by_short_name("Node") == "a.Node"
+        assert index.classes["b.Node"].name == "Node"
+
+    def test_method_lookups_are_memoized(self):
+        index = self._index(
+            {"m.py": "class Base:\n    def go(self):\n        pass\nclass Child(Base):\n    pass\n"}
+        )
+        assert index.mro("m.Child") == ("m.Child", "m.Base")
+        assert index.find_method("m.Child", "go") == "m.Base.go"
+        assert index.find_method("m.Child", "go") == "m.Base.go"
+        assert (index.method_hits, index.method_misses) == (1, 1)
+
+
+class TestLowMemory:
+    def test_low_memory_keeps_no_ast_and_same_graph(self):
+        G, tmp = _build_from_sources(
+            {
+                "a.py": "from b import B\ndef main():\n    B().go()\n",
+                "b.py": "class B:\n    def go(self):\n        self.step()\n    def step(self):\n        pass\n",
+            }
+        )
+        analyzers, calls = analyze_project(find_project_python_files(tmp), tmp, low_memory=True)
+        assert all(analyzer.tree is None for analyzer in analyzers.values())
+        assert analyzers["b"].functions["b.B.go"].lineno == 2
+        sig = TestAnalysisCache._sig
+        assert sig(build_call_graph(analyzers, calls)) == sig(G)
+
+
+class TestCycles:
+    @staticmethod
+    def _random_graph(seed, n=9, m=22):
+        rng = random.Random(seed)
+        G = nx.DiGraph()
+        G.add_nodes_from(f"n{i}" for i in range(n))
+        for _ in range(m):
+            G.add_edge(f"n{rng.randrange(n)}", f"n{rng.randrange(n)}")
+        return G
+
+    @staticmethod
+    def _all_cycles(G):
+        cycles = []
+        for cycle in nx.simple_cycles(G):
+            if len(cycle) >= 2:
+                i = cycle.index(min(cycle))
+                cycles.append(cycle[i:] + cycle[:i])
+        return sorted(cycles, key=lambda c: (len(c), c))
+
+    def test_edges_marked_exactly_when_on_some_cycle(self):
+        for seed in range(20):
+            G = self._random_graph(seed)
+            on_cycle = set()
+            for cycle in nx.simple_cycles(G):
+                on_cycle.update(zip(cycle, cycle[1:] + cycle[:1]))
+            _mark_cycles(G)
+            marked = {(s, t) for s, t, d in G.edges(data=True) if d.get("is_cycle")}
+            assert marked == on_cycle
+
+    def test_unbounded_enumeration_matches_simple_cycles(self):
+        for seed in range(20):
+            G = self._random_graph(seed)
+            assert find_simple_cycles(G, max_length=None, max_cycles=None) == self._all_cycles(G)
+
+    def test_bounds_are_deterministic(self):
+        G = self._random_graph(3, n=12, m=40)
+        shuffled = nx.DiGraph()
+        edges = list(G.edges())
+        random.Random(0).shuffle(edges)
+        shuffled.add_edges_from(edges)
+        bounded = find_simple_cycles(G, max_length=4, max_cycles=5)
+        assert len(bounded) == 5
+        assert all(len(c) <= 4 for c in bounded)
+        assert find_simple_cycles(shuffled, max_length=4, max_cycles=5) == bounded
+
+    def test_long_cycle_still_reported(self):
+        G = nx.DiGraph()
+        nx.add_cycle(G, [f"n{i}" for i in range(6)])
+        assert find_simple_cycles(G, max_length=3) == [[f"n{i}" for i in range(6)]]
+
+    def test_dense_cluster_stays_bounded(self):
+        G = nx.complete_graph(40, create_using=nx.DiGraph)
+        assert len(find_simple_cycles(G, max_cycles=50)) == 50
+        _mark_cycles(G)
+        assert all(d["is_cycle"] for _, _, d in G.edges(data=True))
+
+    def test_every_component_keeps_a_slot(self):
+        G = nx.complete_graph(["a0", "a1", "a2", "a3", "a4", "a5"], create_using=nx.DiGraph)
+        G.add_edges_from([("b0", "b1"), ("b1", "b0"), ("c0", "c1"), ("c1", "c0")])
+        cycles = find_simple_cycles(G, max_cycles=10)
+        assert len(cycles) == 10
+        assert ["b0", "b1"] in cycles and ["c0", "c1"] in cycles
+
+    def test_cycle_rank(self):
+        G = nx.DiGraph([("a", "b"), ("b", "a"), ("b", "c"), ("c", "b"), ("c", "c"), ("c", "d")])
+        assert cycle_rank(G) == 2
+        assert cycle_rank(nx.complete_graph(3, create_using=nx.DiGraph)) == 4
+        assert cycle_rank(nx.DiGraph([("a", "b")])) == 0
+
+
+class TestGraphAnalysis:
+    def test_answers_are_shared_and_memoized(self):
+        G = nx.DiGraph([("m.a", "m.b"), ("m.b", "m.a"), ("m.b", "m.main")])
+        analysis = graph_analysis(G)
+        assert graph_analysis(G) is analysis
+        assert analysis.cycles() is analysis.cycles()
+        assert analysis.cyclic_components == [["m.a", "m.b"]]
+        assert analysis.out_degree == {"m.a": 1, "m.b": 2, "m.main": 0}
+        assert analysis.entry_points == ["m.main"]
+        assert analysis.condensation.number_of_nodes() == 2
+
+    def test_registry_does_not_keep_graphs_alive(self):
+        edges = [("m.a", "m.b"), ("m.b", "m.a")]
+        for make in (nx.DiGraph, lambda e: CSRGraph.from_networkx(nx.DiGraph(e))):
+            G = make(edges)
+            ref = weakref.ref(G)
+            analysis = graph_analysis(G)
+            analysis.node_index.resolve("a")
+            analysis.cycles()
+            del G
+            gc.collect()
+            assert ref() is None
+            with pytest.raises(ReferenceError):
+                analysis.graph
+
+    def test_mutation_invalidates(self):
+        G = nx.DiGraph([("m.a", "m.b")])
+        analysis = graph_analysis(G)
+        assert analysis.cyclic_components == []
+        G.add_edge("m.b", "m.a")
+        invalidate(G)
+        assert analysis.cyclic_components == [["m.a", "m.b"]]
+        G.remove_edge("m.b", "m.a")
+        G.add_edge("m.b", "m.c")
+        invalidate(G)
+        assert analysis.cyclic_components == []
+
+    def test_edits_are_noticed_without_invalidate(self):
+        from pyvisualizer.gates import find_cycles
+        from pyvisualizer.metrics import compute_health
+
+        for counted in (False, True):
+            G = nx.DiGraph([("m.a", "m.b"), ("m.b", "m.a")])
+            if counted:
+                del G.__networkx_cache__  # as on networkx < 3.3
+            assert compute_health(G).num_cycles == 1
+            assert find_cycles(G) == [["m.a", "m.b"]]
+            G.remove_edge("m.b", "m.a")
+            assert compute_health(G).num_cycles == 0
+            assert find_cycles(G) == []
+            G.add_node("m.c")
+            assert compute_health(G).num_cycles == 0
+            assert graph_analysis(G).in_degree["m.c"] == 0
+
+    def test_find_cycles_returns_copies(self):
+        from pyvisualizer.gates import find_cycles
+
+        G = nx.DiGraph([("m.a", "m.b"), ("m.b", "m.a")])
+        find_cycles(G)[0].append("m.z")
+        assert find_cycles(G) == [["m.a", "m.b"]]
+
+    def test_filtered_build_is_invalidated(self, tmp_path):
+        from pyvisualizer.api import build_graph
+
+        (tmp_path / "a.py").write_text(
+            "def f():\n    g()\n\ndef g():\n    f()\n\ndef h():\n    f()\n"
+        )
+        result = build_graph(str(tmp_path), max_nodes=2)
+        assert sorted(result.graph) == ["a.f", "a.g"]
+        assert [sorted(c) for c in result.analysis.sccs] == [["a.f", "a.g"]]
+
+
+class TestReachability:
+    def test_matches_networkx(self):
+        for seed in range(40):
+            G = TestCycles._random_graph(seed, n=30, m=45)
+            for frozen in (G, CSRGraph.from_networkx(G)):
+                index = ReachabilityIndex.build(frozen)
+                for node in G:
+                    assert index.ancestors(node) == nx.ancestors(G, node)
+                    assert index.descendants(node) == nx.descendants(G, node)
+                    assert index.count_ancestors(node) == len(nx.ancestors(G, node))
+                    assert index.count_descendants(node) == len(nx.descendants(G, node))
+
+    def test_sparse_sets_are_stored_compactly(self):
+        G = TestCycles._random_graph(7, n=3000, m=3000)
+        index = ReachabilityIndex.build(G)
+        forms = {type(found).__name__ for found in index._down[2] + index._up[2] if found}
+        assert forms == {"int", "array"}
+        for node in random.Random(0).sample(sorted(G), 200):
+            assert index.ancestors(node) == nx.ancestors(G, node)
+            assert index.descendants(node) == nx.descendants(G, node)
+            assert index.count_ancestors(node) == len(nx.ancestors(G, node))
+
+    def test_over_the_ceiling_falls_back_to_search(self):
+        G = nx.DiGraph([("m.a", "m.b"), ("m.b", "m.c")])
+        assert ReachabilityIndex.build(G, max_bytes=0) is None
+        analysis = graph_analysis(G)
+        analysis.reach_max_bytes = 0
+        assert analysis.ancestors("m.c") == {"m.a", "m.b"}
+        assert analysis.ancestors("m.c") == {"m.a", "m.b"}
+        assert analysis.reachability is None
+
+    def test_index_built_after_a_few_queries_and_invalidated(self):
+        G = nx.DiGraph([("m.a", "m.b"), ("m.b", "m.c")])
+        analysis = graph_analysis(G)
+        assert analysis.descendants("m.a") == {"m.b", "m.c"}
+        assert analysis.ancestors("m.a") == set()
+        assert "reachability" not in analysis._memo
+        assert analysis.blast_radius("m.c") == 2
+        assert analysis._memo["reachability"] is not None
+        G.add_edge("m.d", "m.a")
+        invalidate(G)
+        assert analysis.ancestors("m.c") == {"m.a", "m.b", "m.d"}
+        assert analysis.blast_radius("m.c") == 3
+
+
+class TestNodeIndex:
+    WORDS = ["a", "b", "ab", "ba", "", "core", "s.py", "ss.py"]
+
+    def _graph(self, seed):
+        rng = random.Random(seed)
+        G = nx.DiGraph()
+        for _ in range(15):
+            name = ".".join(rng.choice(self.WORDS[:6]) for _ in range(rng.randint(1, 4)))
+            path = "/".join(rng.choice(self.WORDS) for _ in range(rng.randint(0, 4)))
+            G.add_node(name, path=path)
+        return G, rng
+
+    def test_resolve_matches_a_scan(self):
+        for seed in range(100):
+            G, rng = self._graph(seed)
+            index = NodeIndex(G)
+            for _ in range(10):
+                target = ".".join(rng.choice(self.WORDS[:6]) for _ in range(rng.randint(1, 3)))
+                suffix = [n for n in G if n == target or n.endswith("." + target)]
+                short = [n for n in G if n.split(".")[-1] == target]
+                expected = (
+                    target
+                    if target in G
+                    else suffix[0] if len(suffix) == 1 else short[0] if len(short) == 1 else None
+                )
+                assert index.resolve(target) == expected
+                assert index.suffix_matches(target) == suffix
+
+    def test_path_fragments_match_str_endswith(self):
+        for seed in range(100):
+            G, rng = self._graph(seed)
+            index = NodeIndex(CSRGraph.from_networkx(G))
+            for _ in range(10):
+                frag = "/".join(
+                    rng.choice(self.WORDS + ["py", "s.p"]) for _ in range(rng.randint(1, 3))
+                )
+                expected = {n for n, d in G.nodes(data=True) if d["path"].endswith(frag)}
+                assert index.path_matches(frag) == expected
+            assert index.path_matches("") == set(G)
+
+    def test_shared_through_the_analysis(self):
+        G = nx.DiGraph([("pkg.m.f", "pkg.m.g")])
+        assert graph_analysis(G).node_index is graph_analysis(G).node_index
+        assert graph_analysis(G).node_index.resolve("m.g") == "pkg.m.g"
+        G.add_node("pkg.n.g")
+        invalidate(G)
+        assert graph_analysis(G).node_index.resolve("g") is None
+
+
+class TestCSRGraph:
+    SOURCES = {
+        "app/__init__.py": "",
+        "app/core.py": (
+            "from app.util import helper\n"
+            "class Engine:\n"
+            "    def start(self):\n        self.step()\n        helper()\n"
+            "    def step(self):\n        self.start()\n"
+            "def main():\n    Engine().start()\n"
+        ),
+        "app/util.py": "def helper():\n    pass\ndef run():\n    helper()\n",
+        "app/other.py": "class X:\n    def run(self):\n        pass\ndef go(x):\n    x.run()\n",
+    }
+
+    @staticmethod
+    def _dump(G):
+        return (
+            [(n, dict(d)) for n, d in G.nodes(data=True)],
+            [(s, t, dict(d)) for s, t, d in G.edges(data=True)],
+            [(n, list(G.pred[n])) for n in G],
+        )
+
+    def _graphs(self):
+        from pyvisualizer.api import build_graph
+
+        _, tmp = _build_from_sources(self.SOURCES)
+        return build_graph(tmp), build_graph(tmp, frozen=True)
+
+    def test_frozen_build_matches_networkx(self):
+        plain, frozen = self._graphs()
+        assert isinstance(frozen.graph, CSRGraph)
+        assert self._dump(frozen.graph) == self._dump(plain.graph)
+        assert self._dump(frozen.graph.to_networkx()) == self._dump(plain.graph)
+        assert self._dump(CSRGraph.from_networkx(plain.graph)) == self._dump(plain.graph)
+        assert _edge(frozen.graph, "Engine.start", "Engine.step")["is_cycle"] is True
+
+    def test_analyses_agree(self):
+        from pyvisualizer.gates import find_cycles
+        from pyvisualizer.impact import analyze_impact
+        from pyvisualizer.metrics import compute_health, find_dead_code
+
+        plain, frozen = self._graphs()
+        G, C = plain.graph, frozen.graph
+        assert compute_health(C).to_dict() == compute_health(G).to_dict()
+        assert find_dead_code(C) == find_dead_code(G)
+        assert find_cycles(C) == find_cycles(G)
+        for node in G:
+            assert analyze_impact(C, node) == analyze_impact(G, node)
+
+    def test_context_pack_agrees(self):
+        from pyvisualizer.context import build_context_pack, render_pack_markdown
+
+        plain, frozen = self._graphs()
+        for kwargs in ({}, {"task": "start the engine"}):
+            assert render_pack_markdown(build_context_pack(frozen, **kwargs)) == (
+                render_pack_markdown(build_context_pack(plain, **kwargs))
+            )
+
+    def test_is_read_only(self):
+        _, frozen = self._graphs()
+        node = next(iter(frozen.graph))
+        with pytest.raises(TypeError):
+            frozen.graph.nodes[node]["churn"] = 1
+        copy = frozen.graph.copy()
+        copy.nodes[node]["churn"] = 1
+        assert "churn" not in frozen.graph.nodes[node]
+
+
+class TestIncrementalBuild:
+    SOURCES = {
+        "pkg/__init__.py": "",
+        "pkg/a.py": (
+            "from pkg.b import B, helper\n"
+            "def main():\n    B().go()\n    helper()\n"
+            "def loop():\n    main()\n"
+        ),
+        "pkg/b.py": (
+            "class Base:\n    def step(self):\n        pass\n"
+            "class B(Base):\n    def go(self):\n        self.step()\n"
+            "def helper():\n    pass\n"
+        ),
+        "pkg/c.py": "def run(x):\n    x.step()\n",
+    }
+
+    @staticmethod
+    def _dump(G):
+        """Everything a consumer can observe, insertion order included."""
+        return (
+            [(n, list(d.items())) for n, d in G.nodes(data=True)],
+            [(s, t, list(d.items())) for s, t, d in G.edges(data=True)],
+            [(n, list(G.pred[n])) for n in G],
+        )
+
+    def _edit(self, tmp, name, code):
+        path = os.path.join(tmp, name)
+        if code is None:
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(code)
+        return path
+
+    def _check(self, edits):
+        from pyvisualizer.api import build_graph
+        from pyvisualizer.utils.file_discovery import parse_python_file
+
+        _, tmp = _build_from_sources(self.SOURCES)
+        previous = build_graph(tmp, incremental=True)
+        changed = [self._edit(tmp, name, code) for name, code in edits.items()]
+        parse_python_file.cache_clear()
+        updated = build_graph(tmp, previous=previous, changed=changed)
+        fresh = build_graph(tmp)
+        assert self._dump(updated.graph) == self._dump(fresh.graph)
+        assert updated.files == fresh.files
+        return previous, updated
+
+    def test_body_edit_patches_the_graph_in_place(self):
+        previous, updated = self._check(
+            {"pkg/a.py": "from pkg.b import B, helper\n\ndef main():\n    helper()\n"}
+        )
+        assert updated.graph is previous.graph
+        assert _edge(updated.graph, "a.main", "B.go") is None
+
+    def test_update_invalidates_the_graph_analysis(self):
+        from pyvisualizer.api import build_graph
+        from pyvisualizer.utils.file_discovery import parse_python_file
+
+        _, tmp = _build_from_sources(self.SOURCES)
+        previous = build_graph(tmp, incremental=True)
+        assert previous.analysis.cyclic_components == []
+        # Same node and edge counts: main now calls loop instead of helper.
+        code = self.SOURCES["pkg/a.py"].replace("    helper()\n", "    loop()\n")
+        changed = [self._edit(tmp, "pkg/a.py", code)]
+        parse_python_file.cache_clear()
+        updated = build_graph(tmp, previous=previous, changed=changed)
+        assert updated.analysis.cyclic_components == [["pkg.a.loop", "pkg.a.main"]]
+
+    def test_added_function_and_new_cycle(self):
+        code = self.SOURCES["pkg/b.py"] + "def extra():\n    extra()\n    helper()\n"
+        _, updated = self._check({"pkg/b.py": code})
+        assert updated.graph.edges["pkg.b.extra", "pkg.b.extra"]["is_cycle"] is True
+
+    def test_removed_function_reroutes_dependents(self):
+        code = self.SOURCES["pkg/a.py"].replace("def loop():\n    main()\n", "")
+        self._check({"pkg/a.py": code, "pkg/c.py": "def main():\n    pass\n"})
+
+    def test_added_and_deleted_files(self):
+        self._check(
+            {"pkg/c.py": None, "pkg/d.py": "from pkg.a import main\ndef go():\n    main()\n"}
+        )
+
+    def test_hierarchy_change_reresolves_inherited_calls(self):
+        code = self.SOURCES["pkg/b.py"].replace("class B(Base):", "class B:")
+        _, updated = self._check({"pkg/b.py": code})
+        # No longer inherited: only the unique-name fallback finds it now.
+        assert _edge(updated.graph, "B.go", "Base.step")["via"] == "self-fallback-unique"
+
+    def test_unparseable_edit_drops_the_module(self):
+        _, updated = self._check({"pkg/c.py": "def run(:\n"})
+        assert "pkg.c.run" not in updated.graph
+
+    def test_new_package_falls_back_to_a_full_build(self):
+        previous, updated = self._check(
+            {"pkg/sub/__init__.py": "", "pkg/sub/m.py": "def f():\n    pass\n"}
+        )
+        assert updated.graph is not previous.graph
+        assert "pkg.sub.m.f" in updated.graph
+
+    def test_filters_do_not_touch_the_retained_graph(self):
+        from pyvisualizer.api import build_graph
+
+        _, tmp = _build_from_sources(self.SOURCES)
+        result = build_graph(tmp, incremental=True, strict=True, exclude=["pkg.c"])
+        assert "pkg.c.run" not in result.graph
+        assert "pkg.c.run" in result.state.graph.graph
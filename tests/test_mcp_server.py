@@ -34,6 +34,61 @@ class TestProjectSession:
         assert g1 is not g2
         assert "core.newly_added" in g2.graph
 
+    def test_file_change_updates_the_graph_in_place(self, repo_before_after):
+        session = ProjectSession(repo_before_after)
+        g1, _ = session.get()
+        os.remove(os.path.join(repo_before_after, "service.py"))
+        g2, _ = session.get()
+        assert g2.graph is g1.graph
+        assert not any(n.startswith("service.") for n in g2.graph)
+
+    def test_file_change_reindexes_only_its_functions(self, repo_before_after, monkeypatch):
+        from pyvisualizer import retrieval
+
+        session = ProjectSession(repo_before_after)
+        session.get()
+        reindexed = []
+        document = retrieval._document
+        monkeypatch.setattr(
+            retrieval, "_document", lambda node, *a: reindexed.append(node) or document(node, *a)
+        )
+        with open(os.path.join(repo_before_after, "core.py"), "a", encoding="utf-8") as f:
+            f.write("\n\ndef quarantine_ledger():\n    return 42\n")
+        result, bm25 = session.get()
+        assert reindexed and all(n.startswith("core.") for n in reindexed)
+        assert bm25.search("quarantine ledger")[0][0] == "core.quarantine_ledger"
+        fresh = retrieval.build_bm25(result.graph)
+        assert bm25.rank(["persist", "record"]) == fresh.rank(["persist", "record"])
+
+    def test_pagerank_vectors_are_cached_per_fingerprint(self, repo_before_after):
+        session = ProjectSession(repo_before_after)
+        session.get()
+        first = session.pagerank(["core.persist"])
+        assert session.pagerank(["core.persist"]) is first
+        with open(os.path.join(repo_before_after, "core.py"), "a", encoding="utf-8") as f:
+            f.write("\n\ndef newly_added():\n    return 42\n")
+        session.get()
+        assert session.pagerank(["core.persist"]) is not first
+
+    def test_ranking_matches_the_cli_by_default(self, repo_before_after):
+        from pyvisualizer.context import personalized_pagerank
+
+        session = ProjectSession(repo_before_after)
+        result, _ = session.get()
+        seeds = sorted(result.graph)[:3]
+        assert session.pagerank(seeds) == personalized_pagerank(result.graph, seeds)
+
+    def test_composition_is_skipped_when_mass_dangles(self, repo_before_after):
+        from pyvisualizer.context import personalized_pagerank
+
+        session = ProjectSession(repo_before_after, compose_pagerank=True)
+        result, _ = session.get()
+        G = result.graph
+        leaves = [n for n in G if G.out_degree(n) == 0]
+        seeds = sorted(leaves[:1] + [n for n in G if G.out_degree(n)][:1])
+        joint = personalized_pagerank(G, seeds, bidirectional=False)
+        assert leaves and session.pagerank(seeds, bidirectional=False) == joint
+
 
 class TestTools:
     def test_search_code_finds_functions(self, repo_before_after):
@@ -52,6 +107,19 @@ class TestTools:
         assert out.startswith("# Context Pack")
         assert "core.persist" in out
 
+    def test_context_pack_matches_the_cli_pack(self, repo_before_after):
+        from pyvisualizer.api import build_graph
+        from pyvisualizer.context import build_context_pack, render_pack_markdown
+
+        result = build_graph(repo_before_after)
+        assert any(result.graph.out_degree(n) == 0 for n in result.graph)  # leaves
+        session = ProjectSession(repo_before_after)
+        for focus, task in (("persist,place_order", ""), ("", "fix `persist` audit ordering")):
+            cli = build_context_pack(
+                result, focus=focus.split(",") if focus else None, task=task or None
+            )
+            assert tool_context_pack(session, task=task, focus=focus) == render_pack_markdown(cli)
+
     def test_context_pack_bad_strategy_is_readable(self, repo_before_after):
         session = ProjectSession(repo_before_after)
         out = tool_context_pack(session, strategy="text")  # text needs a task
@@ -4,6 +4,7 @@ import json
 import os
 import tempfile
 
+import networkx as nx
 import pytest
 
 from pyvisualizer.api import build_graph
@@ -63,6 +64,13 @@ class TestHealth:
         assert _grade(85) == "B"
         assert _grade(59) == "F"
 
+    def test_dense_cycles_do_not_hang(self):
+        G = nx.complete_graph([f"m.f{i}" for i in range(30)], create_using=nx.DiGraph)
+        nx.set_node_attributes(G, "m", "module")
+        r = compute_health(G)
+        assert r.num_cycles == 30 * 29 - 30 + 1
+        assert r.components["cycles"] == -30
+
 
 class TestDeadCode:
     def test_finds_uncalled_function(self):
@@ -2,6 +2,7 @@
 
 import json
 import os
+import random
 import tempfile
 
 import networkx as nx
@@ -11,7 +12,7 @@ from pyvisualizer.api import build_graph
 from pyvisualizer.config import Rules
 from pyvisualizer.diff import diff_graphs
 from pyvisualizer.gates import check_layer_rules, find_cycles
-from pyvisualizer.impact import analyze_impact
+from pyvisualizer.impact import analyze_impact, analyze_impact_many
 from pyvisualizer.inject import END_MARKER, START_MARKER, inject
 from pyvisualizer.serializers.json_graph import SCHEMA_ID, graph_to_dict, graph_to_json
 
@@ -106,6 +107,25 @@ class TestDiff:
         assert not d.has_changes
         assert d.new_cycles == []
 
+    def test_capped_enumeration_does_not_invent_resolved_cycles(self):
+        def snapshot(G):
+            return {
+                "nodes": [{"id": n} for n in G.nodes()],
+                "edges": [{"caller": s, "callee": t} for s, t in G.edges()],
+            }
+
+        head = nx.relabel_nodes(nx.complete_graph(7, create_using=nx.DiGraph), lambda i: f"f{i}")
+        base = head.copy()
+        base.remove_edge("f5", "f6")
+        d = diff_graphs(snapshot(base), snapshot(head))
+        assert d.resolved_cycles == []
+        assert d.new_cycles
+        for cycle in d.new_cycles:
+            assert ("f5", "f6") in zip(cycle, cycle[1:] + cycle[:1])
+        assert d.cycles_truncated
+        assert d.head_stats["cycle_rank"] - d.base_stats["cycle_rank"] == 1
+        assert d.entered_cycles == [] and d.left_cycles == []
+
 
 class TestGates:
     def test_layer_rule_violation_detected(self):
@@ -161,3 +181,22 @@ class TestImpact:
         tmp = _project(SAMPLE)
         G = build_graph(tmp).graph
         assert not analyze_impact(G, "does_not_exist").found
+
+    def test_many_targets_match_one_at_a_time(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            G = nx.DiGraph()
+            G.add_nodes_from((f"m{i % 3}.f{i}", {"module": f"m{i % 3}"}) for i in range(25))
+            nodes = list(G)
+            for _ in range(40):
+                G.add_edge(rng.choice(nodes), rng.choice(nodes))
+            targets = rng.sample(nodes, 5) + ["does_not_exist"]
+            batch = analyze_impact_many(G, targets)
+            assert batch.results == [analyze_impact(G, t) for t in targets]
+            found = set(targets[:5])
+            callers = set().union(*(nx.ancestors(G, t) for t in found)) - found
+            assert batch.transitive_callers == sorted(callers)
+            union = analyze_impact_many(G, targets, per_target=False)
+            assert union.transitive_callers == batch.transitive_callers
+            assert union.transitive_callees == batch.transitive_callees
+            assert [r.found for r in union.results] == [True] * 5 + [False]
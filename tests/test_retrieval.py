@@ -28,6 +28,28 @@ class TestTokenizer:
     def test_plain_words_are_lowercased_once(self):
         assert tokenize("Persist THE record") == ["persist", "the", "record"]
 
+    def test_single_pass_split_matches_splitting_each_part(self):
+        import random
+        import re
+
+        from pyvisualizer.retrieval import _split_identifier
+
+        def per_part(tok):
+            words = []
+            for part in re.split(r"_+", tok):
+                words.extend(re.findall(r"[A-Z]+(?![a-z])|[A-Z][a-z]*|[a-z]+|\d+", part) or [part])
+            return [w.lower() for w in words if w]
+
+        rng = random.Random(0)
+        for _ in range(2000):
+            tok = rng.choice("_aZ") + "".join(rng.choices("_aBcDEf09", k=rng.randint(0, 12)))
+            assert _split_identifier(tok) == per_part(tok), tok
+
+    def test_repeated_identifiers_share_one_string(self):
+        first, second = tokenize("parse_http_header"), tokenize("x = parse_http_header")
+        assert first == second[1:]
+        assert all(a is b for a, b in zip(first, second[1:]))
+
 
 class TestBM25:
     def test_deterministic_and_tiebreak_by_id(self):
@@ -43,6 +65,86 @@ class TestBM25:
         docs = {f"d{i}": ["term"] for i in range(10)}
         assert len(BM25Index(docs).search("term", k=3)) == 3
 
+    def test_postings_scores_match_document_at_a_time_bm25(self):
+        import math
+        import random
+        from collections import Counter
+
+        rng = random.Random(7)
+        vocab = [f"w{i}" for i in range(30)]
+        docs = {f"d{i:03d}": rng.choices(vocab, k=rng.randint(0, 40)) for i in range(120)}
+        idx = BM25Index(docs)
+        n = len(docs)
+        avg = sum(map(len, docs.values())) / n
+        df = Counter(t for d in docs.values() for t in set(d))
+        for _ in range(30):
+            query = rng.choices(vocab + ["absent"], k=rng.randint(1, 8))
+            scores = {}
+            for doc, terms in docs.items():
+                tf, s = Counter(terms), 0.0
+                for term in query:
+                    f = tf.get(term)
+                    if f:
+                        idf = math.log(1.0 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                        s += idf * f * 2.5 / (f + 1.5 * (0.25 + 0.75 * len(terms) / avg))
+                if s > 0:
+                    scores[doc] = s
+            expected = sorted(scores.items(), key=lambda kv: (-round(kv[1], 12), kv[0]))
+            assert idx.rank(query) == expected
+
+    def test_top_k_is_identical_to_exhaustive_ranking(self):
+        import random
+
+        for seed in range(60):
+            rng = random.Random(seed)
+            # Small vocabularies and short documents make score ties common.
+            vocab = [f"w{i}" for i in range(rng.randint(2, 12))]
+            docs = {
+                f"d{i:03d}": rng.choices(vocab, k=rng.randint(0, 6))
+                for i in range(rng.randint(1, 80))
+            }
+            idx = BM25Index(docs)
+            for _ in range(5):
+                query = rng.choices(vocab + ["absent"], k=rng.randint(1, 10))
+                for k in (1, 3, 10, 100):
+                    assert idx.top(query, k) == idx.rank(query)[:k]
+
+    def test_edits_rank_like_a_fresh_index(self, tmp_path):
+        import random
+
+        rng = random.Random(3)
+        vocab = [f"w{i}" for i in range(15)]
+        docs = {f"d{i:02d}": rng.choices(vocab, k=rng.randint(1, 8)) for i in range(40)}
+        BM25Index(docs).save(str(tmp_path / "idx.bin"))
+        # Edit both an in-memory index and one mapped from disk.
+        for idx in (BM25Index(docs), BM25Index.load(str(tmp_path / "idx.bin"))):
+            current = dict(docs)
+            for step in range(120):
+                doc = f"d{rng.randrange(60):02d}"
+                if rng.random() < 0.3:
+                    assert idx.remove(doc) == (current.pop(doc, None) is not None)
+                else:
+                    current[doc] = rng.choices(vocab, k=rng.randint(1, 8))
+                    idx.add(doc, current[doc])
+                fresh = BM25Index(current)
+                query = rng.choices(vocab, k=3)
+                assert len(idx) == len(current)
+                assert idx.rank(query) == fresh.rank(query)
+                assert idx.top(query, 4) == fresh.top(query, 4)
+            # An edited index saves and maps back to the same rankings.
+            idx.save(str(tmp_path / "edited.bin"))
+            reloaded = BM25Index.load(str(tmp_path / "edited.bin"))
+            assert reloaded.rank(vocab) == BM25Index(current).rank(vocab)
+
+    def test_empty_documents_can_be_edited(self, tmp_path):
+        docs = {"a": ["x"], "b": [], "c": []}
+        BM25Index(docs).save(str(tmp_path / "idx.bin"))
+        for idx in (BM25Index(docs), BM25Index.load(str(tmp_path / "idx.bin"))):
+            assert idx.remove("b")
+            idx.add("c", ["x", "y"])
+            assert "b" not in idx and len(idx) == 2
+            assert idx.rank(["x", "y"]) == BM25Index({"a": ["x"], "c": ["x", "y"]}).rank(["x", "y"])
+
     def test_no_match_is_empty_not_error(self):
         assert BM25Index({"a": ["x"]}).search("zzz") == []
 
@@ -54,6 +156,56 @@ class TestBM25:
         assert hits and hits[0][0] == "core._write"
 
 
+class TestPersistedIndex:
+    def test_stored_index_maps_back_identically(self, repo_before_after, tmp_path):
+        G = build_graph(repo_before_after).graph
+        sources = {
+            p: open(p, "rb").read() for p in {d.get("path") for _, d in G.nodes(data=True)} if p
+        }
+        built = build_bm25(G, cache_dir=str(tmp_path))
+        stored = os.listdir(tmp_path / "bm25")
+        assert len(stored) == 1
+        loaded = build_bm25(G, cache_dir=str(tmp_path))
+        assert loaded is not built and loaded.ids == built.ids
+        for query in (["persist"], ["record", "audit", "write"], ["zzz"]):
+            assert loaded.rank(query) == built.rank(query)
+            assert loaded.top(query, 2) == built.top(query, 2)
+        # Only the cache directory is ever written.
+        assert all(open(p, "rb").read() == data for p, data in sources.items())
+
+    def test_source_change_or_corrupt_file_rebuilds(self, repo_before_after, tmp_path):
+        from pyvisualizer.retrieval import bm25_fingerprint
+
+        G = build_graph(repo_before_after).graph
+        before = bm25_fingerprint(G)
+        stored = tmp_path / "bm25" / f"{before}.bin"
+        build_bm25(G, cache_dir=str(tmp_path))
+        stored.write_bytes(stored.read_bytes()[:100])
+        assert BM25Index.load(str(stored)) is None
+        assert build_bm25(G, cache_dir=str(tmp_path)).search("stored")[0][0] == "core._write"
+
+        with open(os.path.join(repo_before_after, "core.py"), "a", encoding="utf-8") as f:
+            f.write("\n# touched\n")
+        assert bm25_fingerprint(G) != before
+
+    def test_writing_prunes_older_stored_indexes(self, repo_before_after, tmp_path):
+        from pyvisualizer.retrieval import bm25_fingerprint
+
+        G = build_graph(repo_before_after).graph
+        directory = tmp_path / "bm25"
+        directory.mkdir()
+        for i in range(5):
+            old = directory / f"old{i}.bin"
+            old.write_bytes(b"")
+            os.utime(old, ns=(i, i))
+        build_bm25(G, cache_dir=str(tmp_path))
+        assert sorted(os.listdir(directory)) == sorted(
+            [f"{bm25_fingerprint(G)}.bin", "old3.bin", "old4.bin"]
+        )
+        build_bm25(G, cache_dir=str(tmp_path))  # loaded, not written: nothing pruned
+        assert len(os.listdir(directory)) == 3
+
+
 class TestFunctionSource:
     def test_missing_file_degrades_to_empty(self):
         assert function_source("/no/such/file.py", 1, 5) == ""
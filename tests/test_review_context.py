@@ -167,6 +167,180 @@ class TestPageRankIsSelfContained:
         without_numpy = render_pack_markdown(build_context_pack(result, focus=["persist"]))
         assert with_numpy == without_numpy
 
+    @staticmethod
+    def _reference_pagerank(G, focus, alpha=0.85, max_iter=100, tol=1.0e-10):
+        """The original dict-based power iteration, kept as the oracle."""
+        nodes = sorted(G)
+        teleport = [n for n in focus if n in G]
+        personalization = {n: 0.0 for n in nodes}
+        for n in teleport:
+            personalization[n] = 1.0 / len(teleport)
+        succ = {n: sorted(set(G.successors(n)) | set(G.predecessors(n))) for n in nodes}
+        dangling = [n for n in nodes if not succ[n]]
+        rank = dict(personalization)
+        for _ in range(max_iter):
+            nxt = {n: 0.0 for n in nodes}
+            leaked = alpha * sum(rank[n] for n in dangling)
+            for n in nodes:
+                for m in succ[n]:
+                    nxt[m] += alpha * rank[n] / len(succ[n])
+            for n in nodes:
+                nxt[n] += (1.0 - alpha + leaked) * personalization[n]
+            delta = sum(abs(nxt[n] - rank[n]) for n in nodes)
+            rank = nxt
+            if delta < tol:
+                break
+        return rank
+
+    def test_array_pagerank_matches_the_dict_iteration(self):
+        import random
+
+        import networkx as nx
+
+        from pyvisualizer.context import personalized_pagerank
+
+        for seed in range(40):
+            rng = random.Random(seed)
+            G = nx.DiGraph()
+            G.add_nodes_from(f"n{i}" for i in range(40))
+            for _ in range(rng.randint(0, 120)):
+                G.add_edge(f"n{rng.randrange(40)}", f"n{rng.randrange(40)}")
+            focus = rng.sample(sorted(G), 3)
+            got = personalized_pagerank(G, focus)
+            want = self._reference_pagerank(G, focus)
+            assert list(got) == sorted(G)
+            assert {n: round(v, 12) for n, v in got.items()} == {
+                n: round(v, 12) for n, v in want.items()
+            }
+
+    def test_missing_and_repeated_focus_names_do_not_change_the_weights(self):
+        import math
+
+        import networkx as nx
+
+        from pyvisualizer.context import personalized_pagerank
+
+        # "d" is dangling: its mass teleports back, so the weights matter.
+        G = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")])
+        for epsilon in (None, 1e-9):
+            pair = personalized_pagerank(G, ["a", "c"], epsilon=epsilon)
+            assert personalized_pagerank(G, ["a", "missing", "c"], epsilon=epsilon) == pair
+            assert personalized_pagerank(G, ["c", "a", "a"], epsilon=epsilon) == pair
+            assert math.isclose(sum(pair.values()), 1.0, abs_tol=1e-6)
+
+    def test_numpy_backend_is_bit_identical(self):
+        import random
+
+        import networkx as nx
+
+        pytest.importorskip("numpy")
+        from pyvisualizer.core.pagerank import PageRankGraph, personalized_pagerank
+
+        for seed in range(40):
+            rng = random.Random(seed)
+            G = nx.DiGraph()
+            G.add_nodes_from(f"n{i}" for i in range(60))
+            for _ in range(rng.randint(0, 240)):
+                G.add_edge(f"n{rng.randrange(60)}", f"n{rng.randrange(60)}")
+            graph = PageRankGraph(G, bidirectional=bool(seed % 2))
+            focus = rng.sample(sorted(G), 4)
+            assert personalized_pagerank(graph, focus, backend="array") == (
+                personalized_pagerank(graph, focus, backend="numpy")
+            )
+
+    def test_push_pagerank_is_local_and_close(self):
+        import random
+
+        import networkx as nx
+
+        from pyvisualizer.context import personalized_pagerank
+
+        # A long chain: the push never walks far past where the residual runs out.
+        chain = nx.DiGraph((f"c{i:05d}", f"c{i + 1:05d}") for i in range(20000))
+        approx = personalized_pagerank(chain, ["c00000"], epsilon=1e-4)
+        assert 0 < len(approx) < 200
+        assert approx == personalized_pagerank(chain, ["c00000"], epsilon=1e-4)
+
+        for seed in range(20):
+            rng = random.Random(seed)
+            G = nx.DiGraph()
+            G.add_nodes_from(f"n{i}" for i in range(40))
+            for _ in range(80):
+                G.add_edge(f"n{rng.randrange(40)}", f"n{rng.randrange(40)}")
+            focus = rng.sample(sorted(G), 2)
+            exact = personalized_pagerank(G, focus)
+            approx = personalized_pagerank(G, focus, epsilon=1e-7)
+            for n, score in exact.items():
+                bound = 1e-7 * max(1, len(set(G.successors(n)) | set(G.predecessors(n))))
+                assert abs(approx.get(n, 0.0) - score) <= bound + 1e-12
+
+    def test_push_ranked_pack_matches_exact_pack(self, repo_before_after):
+        result = build_graph(repo_before_after)
+        exact = build_context_pack(result, focus=["persist"])
+        approx = build_context_pack(result, focus=["persist"], ppr_epsilon=1e-6)
+        assert approx.included == exact.included
+
+    def test_cache_composes_multi_node_focus_from_single_nodes(self):
+        import math
+
+        import networkx as nx
+
+        from pyvisualizer.context import personalized_pagerank
+        from pyvisualizer.core.pagerank import PageRankCache
+
+        # A cycle has no dangling mass, so the walk is linear in its focus set.
+        G = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "d"), ("d", "a"), ("b", "d")])
+        walks = []
+
+        def compute(seeds):
+            walks.append(seeds)
+            return personalized_pagerank(G, seeds, bidirectional=False)
+
+        cache = PageRankCache(maxsize=8)
+        composed = cache.scores("v1", ["c", "a"], compute, compose=True)
+        assert walks == [["a"], ["c"]]
+        joint = personalized_pagerank(G, ["a", "c"], bidirectional=False)
+        assert all(math.isclose(composed[n], joint[n], abs_tol=1e-9) for n in G)
+
+        # Seen combinations and new mixes of seen seeds need no further walk.
+        assert cache.scores("v1", ["a", "c"], compute, compose=True) is composed
+        cache.scores("v1", ["a"], compute, compose=True)
+        assert len(walks) == 2 and cache.hits == 2
+        # Another graph version never shares vectors.
+        cache.scores("v2", ["a"], compute, compose=True)
+        assert len(walks) == 3
+
+    def test_cache_walks_focus_sets_jointly_by_default(self):
+        import networkx as nx
+
+        from pyvisualizer.context import personalized_pagerank
+        from pyvisualizer.core.pagerank import PageRankCache
+
+        # "d" is dangling, so averaging single-seed vectors would be wrong.
+        G = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")])
+        walks = []
+
+        def compute(seeds):
+            walks.append(seeds)
+            return personalized_pagerank(G, seeds, bidirectional=False)
+
+        cache = PageRankCache()
+        scores = cache.scores("v", ["c", "a"], compute)
+        assert walks == [["a", "c"]]
+        assert scores == personalized_pagerank(G, ["a", "c"], bidirectional=False)
+
+    def test_cache_evicts_least_recently_used(self):
+        from pyvisualizer.core.pagerank import PageRankCache
+
+        cache = PageRankCache(maxsize=2)
+        cache.scores("v", ["a"], lambda seeds: {"a": 1.0})
+        cache.scores("v", ["b"], lambda seeds: {"b": 1.0})
+        cache.scores("v", ["a"], lambda seeds: {})
+        cache.scores("v", ["c"], lambda seeds: {"c": 1.0})
+        assert len(cache) == 2
+        assert cache.scores("v", ["a"], lambda seeds: {}) == {"a": 1.0}
+        assert cache.scores("v", ["b"], lambda seeds: {}) == {}
+
 
 class TestBudgetIsRespected:
     """`--budget-tokens N` is a promise, and it used to be broken both ways.
@@ -226,6 +400,21 @@ class TestBudgetIsRespected:
         assert "mod.minnow_one" in pack.included and "mod.minnow_two" in pack.included
         assert "mod.whale" not in pack.included
 
+    def test_fill_counts_edges_to_the_selection_so_far(self, tmp_path):
+        """Edge costs are kept incrementally; they must equal a fresh recount."""
+        from pyvisualizer.context import _TOKENS_PER_EDGE, _Fill, _SignatureLines
+
+        result = build_graph(self._wide_graph(tmp_path))
+        G = result.graph
+        fill = _Fill(G, _SignatureLines(G, result.project_root, ""))
+        for n in sorted(G)[::3]:
+            for m in G:
+                neighbours = set(G.predecessors(m)) | set(G.successors(m))
+                expected = fill.lines.cost(m) + _TOKENS_PER_EDGE * len(neighbours & fill.chosen)
+                assert fill.cost(m) == expected
+            if n not in fill.chosen:
+                fill.add(n, fill.cost(n))
+
 
 class TestTaskContext:
     """--task: a prose description seeds the pack (symbols first, lexical next)."""